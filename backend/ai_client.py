@@ -3,60 +3,170 @@ LM Studio AI Client - Local AI Provider Only
 Replaces cloud APIs (Gemini/Groq) with local LM Studio
 """
 
-from openai import OpenAI
+import asyncio
+import time
+import httpx
+from collections import deque
+from contextlib import asynccontextmanager
+from openai import AsyncOpenAI
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple, Callable, Awaitable, AsyncIterator
+
+from config import Config
+from llm_scheduler import LLMScheduler, Priority, SchedulerDropped
+from llm_cache import LLMResponseCache, SingleFlight, make_cache_key
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+from generation_profiles import DEFAULT_PROFILE, GenerationProfile, load_generation_profiles
 
 logger = logging.getLogger(__name__)
 
+SYSTEM_PROMPT = "You are an AI assistant helping supervisors track intern progress. Generate clear, specific follow-up questions."
+
 class LMStudioClient:
     """
-    Simple client for LM Studio - No API keys, No rate limits
+    Async client for LM Studio - No API keys, No rate limits
+    
+    Uses a pooled keep-alive HTTP transport so concurrent generations
+    don't block the event loop or each other.
     """
     
-    def __init__(self, base_url: str = "http://localhost:1234/v1"):
+    def __init__(
+        self, 
+        base_url: str = "http://localhost:1234/v1",
+        timeout: float = None,
+        max_connections: int = None,
+        max_keepalive: int = None,
+        name: str = "LMStudio_Local"
+    ):
         """
         Initialize LM Studio client
         
         Args:
             base_url: LM Studio server URL (default: localhost:1234)
+            name: Display name (distinguishes servers in a pool)
+            timeout: Default per-call deadline in seconds
+            max_connections: Max pooled connections to the server
+            max_keepalive: Max idle keep-alive connections kept open
         """
         self.base_url = base_url
-        self.client = OpenAI(
+        self.timeout = timeout if timeout is not None else Config.LMSTUDIO_TIMEOUT
+        
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections or Config.LMSTUDIO_MAX_CONNECTIONS,
+                max_keepalive_connections=max_keepalive or Config.LMSTUDIO_MAX_KEEPALIVE
+            ),
+            timeout=httpx.Timeout(self.timeout, connect=Config.LMSTUDIO_CONNECT_TIMEOUT)
+        )
+        self.client = AsyncOpenAI(
             base_url=base_url,
-            api_key="not-needed"  # LM Studio doesn't need API key
+            api_key="not-needed",  # LM Studio doesn't need API key
+            http_client=self.http_client,
+            max_retries=0
         )
-        self.name = "LMStudio_Local"
+        self.name = name
         self.provider = "lmstudio"
         
+        # Generation parameters (also part of the response cache key)
+        self.model = "local-model"  # LM Studio uses this placeholder
+        self.temperature = 0.7
+        self.max_tokens = 500
+        
+        # Recent streaming call timings (TTFT, tokens/sec)
+        self.stream_stats: deque = deque(maxlen=200)
+        
         logger.info(f"LM Studio client initialized: {base_url}")
     
-    async def generate_content(self, prompt: str) -> Optional[str]:
+    def generation_params(
+        self, 
+        max_tokens: int = None, 
+        response_format: Dict[str, Any] = None,
+        model: str = None,
+        temperature: float = None
+    ) -> Dict[str, Any]:
+        """Parameters that determine the generated output for a given prompt"""
+        return {
+            "system_prompt": SYSTEM_PROMPT,
+            "model": model or self.model,
+            "temperature": temperature if temperature is not None else self.temperature,
+            "max_tokens": max_tokens or self.max_tokens,
+            "response_format": response_format
+        }
+    
+    def _request_args(
+        self, 
+        prompt: str, 
+        timeout: float = None, 
+        max_tokens: int = None, 
+        response_format: Dict[str, Any] = None,
+        model: str = None,
+        temperature: float = None
+    ) -> Dict[str, Any]:
+        """Build chat completion arguments"""
+        args = {
+            "model": model or self.model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": SYSTEM_PROMPT
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "temperature": temperature if temperature is not None else self.temperature,
+            "max_tokens": max_tokens or self.max_tokens,
+            "timeout": timeout if timeout is not None else self.timeout
+        }
+        if response_format:
+            args["response_format"] = response_format
+        return args
+    
+    async def generate_content(
+        self, 
+        prompt: str, 
+        timeout: float = None,
+        max_tokens: int = None,
+        response_format: Dict[str, Any] = None,
+        stop_when: Callable[[str], bool] = None,
+        model: str = None,
+        temperature: float = None
+    ) -> Optional[str]:
         """
         Generate content using LM Studio
         
         Args:
             prompt: The input prompt
+            timeout: Per-call deadline in seconds (defaults to client timeout)
+            max_tokens: Output token cap (defaults to client max_tokens)
+            response_format: Optional structured output spec, e.g. a JSON schema
+            model: Model identifier (defaults to client model)
+            temperature: Sampling temperature (defaults to client temperature)
+            stop_when: If given, the completion is streamed and this is called
+                with each text chunk; returning True closes the stream early
             
         Returns:
             Generated text or None if failed
+            
+        Raises:
+            asyncio.CancelledError: if the caller is cancelled; the
+                underlying HTTP request is aborted as well
         """
+        request_options = {
+            "timeout": timeout,
+            "max_tokens": max_tokens,
+            "response_format": response_format,
+            "model": model,
+            "temperature": temperature
+        }
+        
+        if stop_when is not None:
+            return await self._generate_streaming(prompt, request_options, stop_when)
+        
         try:
-            response = self.client.chat.completions.create(
-                model="local-model",  # LM Studio uses this placeholder
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an AI assistant helping supervisors track intern progress. Generate clear, specific follow-up questions."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.7,
-                max_tokens=500,
-                timeout=120
+            response = await self.client.chat.completions.create(
+                **self._request_args(prompt, **request_options)
             )
             
             if response.choices and response.choices[0].message.content:
@@ -66,11 +176,164 @@ class LMStudioClient:
             else:
                 logger.warning("LM Studio returned empty response")
                 return None
-                
+        
+        except asyncio.CancelledError:
+            logger.info("LM Studio generation cancelled by caller")
+            raise
         except Exception as e:
             logger.error(f"LM Studio generation failed: {e}")
             return None
     
+    async def _generate_streaming(
+        self,
+        prompt: str,
+        request_options: Dict[str, Any],
+        stop_when: Callable[[str], bool]
+    ) -> Optional[str]:
+        """Stream a completion, stopping as soon as stop_when is satisfied"""
+        chunks = []
+        stream = self.stream_content(prompt, **request_options)
+        try:
+            async for delta in stream:
+                chunks.append(delta)
+                if stop_when(delta):
+                    break
+        except asyncio.CancelledError:
+            logger.info("LM Studio generation cancelled by caller")
+            raise
+        except Exception as e:
+            logger.error(f"LM Studio generation failed: {e}")
+            return None
+        finally:
+            # Closing the stream drops the HTTP response so LM Studio frees the slot
+            await stream.aclose()
+        
+        content = "".join(chunks).strip()
+        if not content:
+            logger.warning("LM Studio returned empty response")
+            return None
+        
+        logger.info(f"LM Studio generated response: {len(content)} chars (streamed)")
+        return content
+    
+    async def stream_content(
+        self,
+        prompt: str,
+        timeout: float = None,
+        max_tokens: int = None,
+        response_format: Dict[str, Any] = None,
+        model: str = None,
+        temperature: float = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream completion text chunks from LM Studio
+        
+        Records time-to-first-token and tokens/sec (one streamed chunk is
+        counted as one token) for every call. Errors are raised to the caller.
+        """
+        started = time.perf_counter()
+        first_token_at = None
+        token_count = 0
+        early_stop = False
+        
+        stream = await self.client.chat.completions.create(
+            stream=True,
+            **self._request_args(prompt, timeout, max_tokens, response_format, model, temperature)
+        )
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+                token_count += 1
+                yield delta
+        except GeneratorExit:
+            early_stop = True
+            raise
+        finally:
+            await stream.close()
+            self._record_stream_stats(started, first_token_at, token_count, early_stop)
+    
+    def _record_stream_stats(
+        self, 
+        started: float, 
+        first_token_at: Optional[float], 
+        token_count: int, 
+        early_stop: bool
+    ) -> None:
+        finished = time.perf_counter()
+        ttft = (first_token_at - started) if first_token_at else None
+        generation_time = (finished - first_token_at) if first_token_at else 0.0
+        tokens_per_sec = token_count / generation_time if generation_time > 0 else None
+        
+        stats = {
+            "ttft_ms": round(ttft * 1000, 1) if ttft is not None else None,
+            "tokens": token_count,
+            "tokens_per_sec": round(tokens_per_sec, 1) if tokens_per_sec else None,
+            "duration_ms": round((finished - started) * 1000, 1),
+            "early_stop": early_stop
+        }
+        self.stream_stats.append(stats)
+        logger.info(
+            f"LM Studio stream: TTFT {stats['ttft_ms']} ms, {token_count} tokens, "
+            f"{stats['tokens_per_sec']} tok/s{' (stopped early)' if early_stop else ''}"
+        )
+    
+    def get_stream_metrics(self) -> Dict[str, Any]:
+        """Averages over recent streaming calls"""
+        calls = list(self.stream_stats)
+        ttfts = [c["ttft_ms"] for c in calls if c["ttft_ms"] is not None]
+        rates = [c["tokens_per_sec"] for c in calls if c["tokens_per_sec"]]
+        return {
+            "recent_calls": len(calls),
+            "avg_ttft_ms": round(sum(ttfts) / len(ttfts), 1) if ttfts else None,
+            "avg_tokens_per_sec": round(sum(rates) / len(rates), 1) if rates else None,
+            "early_stops": sum(1 for c in calls if c["early_stop"]),
+            "last_call": calls[-1] if calls else None
+        }
+    
+    async def check_liveness(self, timeout: float = None) -> Dict[str, Any]:
+        """
+        Cheap liveness check - lists loaded models instead of running a generation
+        
+        Returns:
+            Dict with status, loaded models and probe latency
+        """
+        started = time.perf_counter()
+        try:
+            models = await self.client.models.list(
+                timeout=timeout if timeout is not None else Config.LMSTUDIO_HEALTH_TIMEOUT
+            )
+            model_ids = [model.id for model in models.data]
+            return {
+                "status": "online" if model_ids else "no_model_loaded",
+                "name": self.name,
+                "models": model_ids,
+                "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+                "server_url": self.base_url
+            }
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            return {
+                "status": "offline",
+                "name": self.name,
+                "error": str(e),
+                "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+                "server_url": self.base_url
+            }
+    
+    async def aclose(self) -> None:
+        """Close pooled HTTP connections"""
+        await self.client.close()
+        await self.http_client.aclose()
+        logger.info(f"LM Studio client closed: {self.base_url}")
+    
     async def test_connection(self) -> Dict[str, Any]:
         """
         Test the connection to LM Studio
@@ -112,25 +375,378 @@ class LMStudioClient:
             }
 
 
+class LMStudioBackend:
+    """One LM Studio server in the pool with its load and health state"""
+    
+    def __init__(self, client: LMStudioClient, weight: float = 1.0):
+        self.client = client
+        self.weight = weight if weight > 0 else 1.0
+        self.in_flight = 0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        
+        self.requests = 0
+        self.failures = 0
+        self.ejections = 0
+        self.latency_ewma: Optional[float] = None
+        self.latencies: deque = deque(maxlen=200)
+    
+    @property
+    def name(self) -> str:
+        return self.client.name
+    
+    def is_ejected(self, now: float) -> bool:
+        return now < self.ejected_until
+    
+    def load(self) -> float:
+        """Outstanding requests relative to capacity (counting the next one)"""
+        return (self.in_flight + 1) / self.weight
+    
+    def get_stats(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+        now = time.monotonic()
+        return {
+            "server_url": self.client.base_url,
+            "weight": self.weight,
+            "in_flight": self.in_flight,
+            "ejected": self.is_ejected(now),
+            "ejected_for_s": round(self.ejected_until - now, 1) if self.is_ejected(now) else 0,
+            "requests": self.requests,
+            "failures": self.failures,
+            "ejections": self.ejections,
+            "latency_ewma_ms": round(self.latency_ewma * 1000, 1) if self.latency_ewma is not None else None,
+            "latency_p50_ms": round(latencies[len(latencies) // 2] * 1000, 1) if latencies else None,
+            "latency_p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 1) if latencies else None,
+            "streaming": self.client.get_stream_metrics()
+        }
+
+class LMStudioPool:
+    """
+    Least-outstanding-requests load balancer over several LM Studio servers
+    
+    Backends that fail repeatedly are passively ejected for a while; if every
+    backend is ejected the one due back soonest is used anyway.
+    """
+    
+    def __init__(self, backends: List[Tuple[str, float]]):
+        single = len(backends) == 1
+        self.backends = [
+            LMStudioBackend(
+                LMStudioClient(url, name="LMStudio_Local" if single else f"LMStudio_{i}"),
+                weight
+            )
+            for i, (url, weight) in enumerate(backends, 1)
+        ]
+        logger.info(f"LM Studio pool initialized with {len(self.backends)} backend(s)")
+    
+    def get(self, name: str) -> Optional[LMStudioBackend]:
+        for backend in self.backends:
+            if backend.name == name:
+                return backend
+        return None
+    
+    def pick(self) -> LMStudioBackend:
+        """Healthy backend with the fewest requests in flight per unit of weight"""
+        now = time.monotonic()
+        healthy = [b for b in self.backends if not b.is_ejected(now)]
+        if not healthy:
+            return min(self.backends, key=lambda b: b.ejected_until)
+        
+        return min(
+            healthy,
+            key=lambda b: (b.load(), b.latency_ewma if b.latency_ewma is not None else 0.0)
+        )
+    
+    @asynccontextmanager
+    async def lease(self, backend: LMStudioBackend = None):
+        """Pick a backend and count the request as outstanding on it"""
+        backend = backend or self.pick()
+        backend.in_flight += 1
+        backend.requests += 1
+        try:
+            yield backend
+        finally:
+            backend.in_flight -= 1
+    
+    def record_success(self, backend: LMStudioBackend, latency: float) -> None:
+        backend.consecutive_failures = 0
+        backend.latencies.append(latency)
+        backend.latency_ewma = latency if backend.latency_ewma is None else 0.8 * backend.latency_ewma + 0.2 * latency
+    
+    def record_failure(self, backend: LMStudioBackend) -> None:
+        backend.failures += 1
+        backend.consecutive_failures += 1
+        if len(self.backends) > 1 and backend.consecutive_failures >= Config.LMSTUDIO_EJECT_FAILURES:
+            backend.ejected_until = time.monotonic() + Config.LMSTUDIO_EJECT_SECONDS
+            backend.ejections += 1
+            backend.consecutive_failures = 0
+            logger.warning(f"Ejected {backend.name} ({backend.client.base_url}) for {Config.LMSTUDIO_EJECT_SECONDS}s")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {backend.name: backend.get_stats() for backend in self.backends}
+    
+    async def close(self) -> None:
+        for backend in self.backends:
+            await backend.client.aclose()
+
 class AIProviderManager:
     """
-    Simplified manager for LM Studio only
+    Manager for LM Studio servers (one or a load-balanced pool)
     """
     
-    def __init__(self, lmstudio_url: str = "http://localhost:1234/v1"):
+    def __init__(
+        self, 
+        lmstudio_url: str = "http://localhost:1234/v1", 
+        cache_collection=None,
+        backends: List[Tuple[str, float]] = None
+    ):
         """
-        Initialize manager with LM Studio client
+        Initialize manager with LM Studio pool, admission scheduler and response cache
+        
+        Args:
+            lmstudio_url: LM Studio server URL (used when backends is not given)
+            cache_collection: Optional MongoDB collection for the persistent cache tier
+            backends: (url, weight) list of LM Studio servers to balance across
         """
-        self.client = LMStudioClient(lmstudio_url)
-        logger.info("AI Provider Manager initialized with LM Studio only")
+        self.pool = LMStudioPool(backends or [(lmstudio_url, 1.0)])
+        # Primary client - defines generation parameters and the breaker name
+        self.client = self.pool.backends[0].client
+        self.profiles = load_generation_profiles()
+        self.scheduler = LLMScheduler(profile_limits={
+            name: profile.max_concurrency for name, profile in self.profiles.items()
+        })
+        self.cache = LLMResponseCache(collection=cache_collection) if Config.LLM_CACHE_ENABLED else None
+        self.inflight = SingleFlight()
+        self.breaker = CircuitBreaker(name="lmstudio")
+        logger.info(f"AI Provider Manager initialized with {len(self.pool.backends)} LM Studio server(s)")
     
     def get_client(self, provider_name: str = None) -> LMStudioClient:
-        """Get LM Studio client (provider_name ignored for compatibility)"""
-        return self.client
+        """Get an LM Studio client by name, or the least loaded one"""
+        if provider_name:
+            backend = self.pool.get(provider_name)
+            if backend:
+                return backend.client
+        return self.pool.pick().client
+    
+    def _get_profile(self, profile: str) -> GenerationProfile:
+        generation_profile = self.profiles.get(profile)
+        if generation_profile is None:
+            logger.warning(f"Unknown generation profile '{profile}' - using defaults")
+            generation_profile = self.profiles[DEFAULT_PROFILE]
+        return generation_profile
+    
+    def _profile_options(self, profile: str, max_tokens: Optional[int]) -> Dict[str, Any]:
+        """Client options for a profile; an explicit max_tokens wins over the profile's"""
+        options = self._get_profile(profile).request_options()
+        if max_tokens is not None:
+            options["max_tokens"] = max_tokens
+        return options
+    
+    async def generate_content(
+        self,
+        prompt: str,
+        priority: Priority = Priority.INTERACTIVE,
+        intern_id: str = "",
+        queue_timeout: float = None,
+        is_disconnected: Callable[[], Awaitable[bool]] = None,
+        use_cache: bool = True,
+        max_tokens: int = None,
+        response_format: Dict[str, Any] = None,
+        stop_when: Callable[[str], bool] = None,
+        profile: str = DEFAULT_PROFILE
+    ) -> Optional[str]:
+        """
+        Generate content through the response cache and admission scheduler
+        
+        profile selects the model, sampling settings, token budget, deadline
+        and concurrency limit (see generation_profiles). max_tokens overrides
+        the profile's budget. Model, temperature, max_tokens and
+        response_format are part of the cache key. stop_when enables
+        streaming with early termination (see LMStudioClient.generate_content).
+        
+        Returns:
+            Generated text or None if generation failed, the request was
+            dropped from the queue, or the circuit breaker is open
+        """
+        options = self._profile_options(profile, max_tokens)
+        options.update({"response_format": response_format, "stop_when": stop_when})
+        
+        if not use_cache:
+            return await self._generate_scheduled(
+                prompt, options, priority, intern_id, queue_timeout, is_disconnected, profile
+            )
+        
+        cache_key = make_cache_key(
+            prompt, 
+            self.client.generation_params(
+                max_tokens=options["max_tokens"], 
+                response_format=response_format,
+                model=options["model"],
+                temperature=options["temperature"]
+            )
+        )
+        if self.cache is not None:
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"LLM cache hit for intern {intern_id or 'unknown'} ({priority.name})")
+                return cached
+        
+        if not self.breaker.allow_request():
+            logger.warning(f"Circuit breaker open - skipping LM Studio for intern {intern_id or 'unknown'}")
+            return None
+        
+        async def generate_and_store(all_disconnected: Callable[[], Awaitable[bool]]) -> Optional[str]:
+            response = await self._generate_scheduled(
+                prompt, options, priority, intern_id, queue_timeout, all_disconnected, profile
+            )
+            if response and self.cache is not None:
+                await self.cache.set(cache_key, response)
+            return response
+        
+        # Identical concurrent requests share one generation
+        return await self.inflight.do(cache_key, generate_and_store, is_disconnected=is_disconnected)
+    
+    async def _generate_scheduled(
+        self,
+        prompt: str,
+        options: Dict[str, Any],
+        priority: Priority,
+        intern_id: str,
+        queue_timeout: Optional[float],
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]],
+        profile: str = DEFAULT_PROFILE
+    ) -> Optional[str]:
+        """Run one generation once the scheduler grants a slot"""
+        if not self.breaker.allow_request():
+            return None
+        
+        try:
+            return await self.scheduler.run(
+                lambda: self._generate_guarded(prompt, options, self._get_profile(profile).latency_budget),
+                priority=priority,
+                intern_id=intern_id,
+                queue_timeout=queue_timeout,
+                is_disconnected=is_disconnected,
+                profile=profile
+            )
+        except SchedulerDropped as e:
+            logger.warning(f"{priority.name} generation for intern {intern_id or 'unknown'} not run: {e.reason}")
+            return None
+    
+    async def stream_content(
+        self,
+        prompt: str,
+        priority: Priority = Priority.REPORT,
+        intern_id: str = "",
+        queue_timeout: float = None,
+        is_disconnected: Callable[[], Awaitable[bool]] = None,
+        max_tokens: int = None,
+        profile: str = DEFAULT_PROFILE
+    ) -> AsyncIterator[str]:
+        """
+        Stream generated text chunks, holding a scheduler slot for the whole stream
+        
+        Raises:
+            CircuitOpenError: if the circuit breaker rejects the call
+            SchedulerDropped: if the request is dropped from the queue
+        """
+        if not self.breaker.allow_request():
+            raise CircuitOpenError("LM Studio circuit breaker is open")
+        
+        options = self._profile_options(profile, max_tokens)
+        
+        async with self.scheduler.slot(priority, intern_id, queue_timeout, is_disconnected, profile):
+            if not self.breaker.try_acquire():
+                raise CircuitOpenError("LM Studio circuit breaker is open")
+            
+            async with self.pool.lease() as backend:
+                started = time.perf_counter()
+                ttft = None
+                try:
+                    async for delta in backend.client.stream_content(prompt, **options):
+                        if ttft is None:
+                            ttft = time.perf_counter() - started
+                        yield delta
+                except GeneratorExit:
+                    # Consumer stopped reading (e.g. client went away) - no verdict on the server
+                    self.breaker.release()
+                    raise
+                except asyncio.CancelledError:
+                    self.breaker.release()
+                    raise
+                except Exception as e:
+                    self.pool.record_failure(backend)
+                    self.breaker.record_failure(f"stream error on {backend.name}: {e}")
+                    raise
+                
+                if ttft is not None:
+                    # A long report is a long stream - only a slow first token means a slow server
+                    self.pool.record_success(backend, time.perf_counter() - started)
+                    self.breaker.record_success(ttft, Config.LLM_BREAKER_TTFT_BUDGET)
+                else:
+                    self.pool.record_failure(backend)
+                    self.breaker.record_failure(f"empty streamed response from {backend.name}")
+    
+    async def _generate_guarded(
+        self,
+        prompt: str,
+        options: Dict[str, Any],
+        latency_budget: Optional[float] = None
+    ) -> Optional[str]:
+        """Call LM Studio under the circuit breaker, judged against the profile's latency budget"""
+        if not self.breaker.try_acquire():
+            logger.warning("Circuit breaker rejected LM Studio call")
+            return None
+        
+        async with self.pool.lease() as backend:
+            started = time.perf_counter()
+            try:
+                response = await backend.client.generate_content(prompt, **options)
+            except BaseException:
+                # Cancelled - not the server's fault
+                self.breaker.release()
+                raise
+            
+            latency = time.perf_counter() - started
+            if response:
+                self.pool.record_success(backend, latency)
+                self.breaker.record_success(latency, latency_budget)
+            else:
+                self.pool.record_failure(backend)
+                self.breaker.record_failure(f"empty response or request error from {backend.name}")
+            return response
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Scheduler, cache, request coalescing and circuit breaker metrics"""
+        return {
+            "circuit_breaker": self.breaker.snapshot(),
+            "profiles": {name: profile.to_dict() for name, profile in self.profiles.items()},
+            "scheduler": self.scheduler.get_metrics(),
+            "cache": self.cache.get_metrics() if self.cache is not None else {"enabled": False},
+            "coalescing": self.inflight.get_metrics(),
+            "backends": self.pool.get_stats()
+        }
+    
+    async def close(self) -> None:
+        """Release every LM Studio client's pooled connections"""
+        await self.pool.close()
+    
+    async def check_all_liveness(self) -> Dict[str, Any]:
+        """Cheap liveness check for every LM Studio server"""
+        results = await asyncio.gather(
+            *(backend.client.check_liveness() for backend in self.pool.backends)
+        )
+        return {
+            backend.name: result
+            for backend, result in zip(self.pool.backends, results)
+        }
     
     async def test_all_connections(self) -> Dict[str, Any]:
-        """Test LM Studio connection"""
-        result = await self.client.test_connection()
+        """Test every LM Studio server with a real generation"""
+        results = await asyncio.gather(
+            *(backend.client.test_connection() for backend in self.pool.backends)
+        )
         return {
-            "LMStudio_Local": result
+            backend.name: result
+            for backend, result in zip(self.pool.backends, results)
         }
\ No newline at end of file
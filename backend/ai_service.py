@@ -7,22 +7,65 @@ Key changes:
 4. All AI calls go to LM Studio
 """
 
+import asyncio
+import json
 from datetime import datetime, timedelta
 import uuid
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Awaitable, AsyncIterator, Tuple
 import logging
 import re
 from dateutil import parser
 from pymongo import DESCENDING
 
 from config import Config
-from database import get_database
+from database import get_database, get_temp_work_update, update_temp_work_update
 from models import SessionStatus
 from quality_score import get_quality_scorer
 from ai_client import LMStudioClient, AIProviderManager
+from llm_scheduler import Priority
+from question_parser import QuestionStreamParser
+from generation_profiles import FOLLOWUP_PROFILE, REPORT_PROFILE
+from prompt_budget import PromptBudget, dedupe_repeats, estimate_tokens
+from prompt_templates import WEEKLY_REDUCE_TEMPLATE, WEEKLY_REPORT_TEMPLATE, build_followup_template
+from report_summaries import DaySummarizer, format_followup_session, format_work_update
+from report_hierarchy import HierarchicalReportEngine
 
 logger = logging.getLogger(__name__)
 
+# Structured output: exactly three question strings
+FOLLOWUP_QUESTIONS_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "followup_questions",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "questions": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "minItems": 3,
+                    "maxItems": 3
+                }
+            },
+            "required": ["questions"],
+            "additionalProperties": False
+        }
+    }
+}
+
+def whole_day_range(start_date: datetime, end_date: datetime) -> Tuple[datetime, datetime]:
+    """
+    Widen a report range to whole days (00:00:00 to 23:59:59.999)
+
+    Stored reports are keyed by date, so every query behind one must cover the
+    same days regardless of the time of day the range was resolved at.
+    """
+    return (
+        start_date.replace(hour=0, minute=0, second=0, microsecond=0),
+        end_date.replace(hour=23, minute=59, second=59, microsecond=999000)
+    )
+
 class AIFollowupService:
     def __init__(self):
         """Initialize AI service with LM Studio only"""
@@ -33,19 +76,56 @@ class AIFollowupService:
         self.quality_scorer = get_quality_scorer()
         
         # Initialize LM Studio provider manager
-        self.provider_manager = AIProviderManager(self.config.LMSTUDIO_URL)
+        cache_collection = self.db[Config.LLM_CACHE_COLLECTION] if Config.LLM_CACHE_PERSIST else None
+        self.provider_manager = AIProviderManager(
+            self.config.LMSTUDIO_URL, 
+            cache_collection=cache_collection,
+            backends=Config.get_lmstudio_backends()
+        )
         self.lmstudio_client = self.provider_manager.get_client()
         
+        # In-flight background question generations keyed by temp update ID
+        self._pending_generations: Dict[str, asyncio.Task] = {}
+        
+        # Token usage of the most recently built prompt of each kind
+        self.prompt_usage: Dict[str, Dict[str, Any]] = {}
+        
+        # Outcome of the most recent nightly report batch
+        self.last_report_batch: Optional[Dict[str, Any]] = None
+        
+        # Map stage of map-reduce weekly reports
+        self.day_summarizer = DaySummarizer(self.db, self.provider_manager)
+        # Week / month roll-ups for long report ranges
+        self.report_engine = HierarchicalReportEngine(
+            self.db, self.provider_manager, self.day_summarizer, self._fetch_weekly_data
+        )
+        
+        # Output format rules are fixed per process, so they belong to the shared prefix
+        self.followup_template = build_followup_template(self._followup_format_instructions())
+        
         logger.info("AI Followup Service initialized with LM Studio (local)")
+    
+    async def close(self) -> None:
+        """Shut down the LM Studio client and its connection pool"""
+        for task in list(self._pending_generations.values()):
+            task.cancel()
+        self._pending_generations.clear()
+        
+        await self.provider_manager.close()
+        logger.info("AI Followup Service closed")
         
     async def process_work_update_with_quality_check(
         self, 
         work_description: str, 
         intern_id: str, 
-        update_date: str = None
+        update_date: str = None,
+        generate_questions: bool = True
     ) -> Dict[str, Any]:
         """
         Main method: Check work quality and decide if follow-up is needed
+        
+        With generate_questions=False only the quality check runs; question
+        generation is left to start_question_generation().
         """
         try:
             # Step 1: Calculate quality score
@@ -65,6 +145,10 @@ class AIFollowupService:
                 logger.info(f"High quality work update (score: {result['quality_score']}) - no follow-up needed")
                 return result
             
+            if not generate_questions:
+                logger.info(f"Low quality work update (score: {result['quality_score']}) - follow-up generation deferred")
+                return result
+            
             # Step 2: Generate AI follow-up questions using LM Studio
             logger.info(f"Low quality work update (score: {result['quality_score']}) - generating follow-up")
             
@@ -111,10 +195,127 @@ class AIFollowupService:
                 "fallback_used": True
             }
     
+    def start_question_generation(
+        self,
+        temp_id: str,
+        intern_id: str,
+        work_description: str,
+        generation_id: str = None
+    ) -> asyncio.Task:
+        """
+        Start follow-up question generation for a temp work update in the background
+        
+        Progress is tracked on the temp record via questionStatus
+        (queued -> generating -> ready | fallback). generation_id must match
+        the record's questionGenerationId for the task's writes to land, so a
+        superseded generation can't store its questions on a newer submission.
+        """
+        previous = self._pending_generations.pop(temp_id, None)
+        if previous and not previous.done():
+            # Temp record was replaced by a newer submission for the same day
+            previous.cancel()
+        
+        task = asyncio.create_task(
+            self._run_question_generation(temp_id, intern_id, work_description, generation_id)
+        )
+        self._pending_generations[temp_id] = task
+        
+        def _forget(finished: asyncio.Task) -> None:
+            if self._pending_generations.get(temp_id) is finished:
+                del self._pending_generations[temp_id]
+        
+        task.add_done_callback(_forget)
+        return task
+    
+    async def _run_question_generation(
+        self,
+        temp_id: str,
+        intern_id: str,
+        work_description: str,
+        generation_id: str = None
+    ) -> List[str]:
+        """Generate questions and store them on the temp record"""
+        await update_temp_work_update(temp_id, {
+            "followupQuestions": None,
+            "questionStatus": "generating",
+            "questionGenerationStartedAt": datetime.now()
+        }, generation_id)
+        
+        try:
+            questions = await self._generate_lmstudio_followup_questions(intern_id, work_description)
+            question_status = "ready"
+            question_source = "lmstudio_generated"
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Background question generation failed for {temp_id}: {e}")
+            questions = self._get_default_questions()
+            question_status = "fallback"
+            question_source = "default_fallback"
+        
+        await update_temp_work_update(temp_id, {
+            "followupQuestions": questions,
+            "questionSource": question_source,
+            "questionStatus": question_status,
+            "questionsGeneratedAt": datetime.now()
+        }, generation_id)
+        logger.info(f"Background question generation finished for {temp_id} ({question_status})")
+        return questions
+    
+    async def get_followup_questions_for_temp_update(
+        self, 
+        temp_update: Dict[str, Any],
+        is_disconnected: Callable[[], Awaitable[bool]] = None
+    ) -> List[str]:
+        """
+        Return the follow-up questions for a pending temp work update
+        
+        Questions generated at submit time are stored on the temp record and
+        served directly. If background generation is still running in this
+        process it is awaited; otherwise the questions are regenerated
+        (without re-scoring the update).
+        """
+        temp_id = str(temp_update.get("_id"))
+        
+        stored_questions = temp_update.get("followupQuestions")
+        if stored_questions:
+            logger.info(f"Serving stored follow-up questions for temp update {temp_id}")
+            return stored_questions
+        
+        pending = self._pending_generations.get(temp_id)
+        if pending:
+            logger.info(f"Awaiting in-progress question generation for temp update {temp_id}")
+            try:
+                # Shield so a dropped client doesn't cancel the shared generation
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # Usually a same-day resubmission replaced the record - serve the new task's questions
+                logger.warning(f"Question generation for {temp_id} was cancelled, re-reading temp update")
+                latest = await get_temp_work_update(temp_id)
+                if latest:
+                    return await self.get_followup_questions_for_temp_update(latest, is_disconnected)
+            except Exception as e:
+                logger.error(f"Background question generation failed: {e}")
+                return self._get_default_questions()
+        
+        try:
+            return await self._generate_lmstudio_followup_questions(
+                temp_update.get("internId", ""),
+                temp_update.get("task", ""),
+                is_disconnected=is_disconnected
+            )
+        except Exception as e:
+            logger.error(f"AI question generation failed: {e}")
+            return self._get_default_questions()
+    
     async def _generate_lmstudio_followup_questions(
         self, 
         intern_id: str, 
-        work_description: str
+        work_description: str,
+        priority: Priority = Priority.INTERACTIVE,
+        is_disconnected: Callable[[], Awaitable[bool]] = None
     ) -> List[str]:
         """
         Generate AI follow-up questions using LM Studio
@@ -128,14 +329,37 @@ class AIFollowupService:
         # Get context and generate questions
         recent_docs = await self._get_recent_work_history(intern_id)
         current_context = self._build_current_work_context(work_update_data)
-        history_context = self._build_work_history_context(recent_docs) if recent_docs else ""
         
-        prompt = self._build_ai_prompt(current_context, history_context, recent_docs)
+        prompt = self._build_ai_prompt(current_context, recent_docs)
+        
+        structured = self.config.FOLLOWUP_STRUCTURED_OUTPUT
+        # Streamed generation stops as soon as three questions have arrived
+        stream_parser = QuestionStreamParser() if self.config.FOLLOWUP_STREAMING else None
         
         logger.info("Sending request to LM Studio")
-        response_text = await self.lmstudio_client.generate_content(prompt)
+        response_text = await self.provider_manager.generate_content(
+            prompt,
+            priority=priority,
+            intern_id=intern_id,
+            is_disconnected=is_disconnected,
+            profile=FOLLOWUP_PROFILE,
+            response_format=FOLLOWUP_QUESTIONS_RESPONSE_FORMAT if structured else None,
+            stop_when=stream_parser.feed if stream_parser else None
+        )
         
         if response_text and response_text.strip():
+            questions = self._parse_structured_questions(response_text) if structured else None
+            if questions:
+                logger.info("Parsed 3 AI questions from structured LM Studio output")
+                return questions
+            
+            # Handles output cut off after the third question as well as full text
+            questions = QuestionStreamParser.parse(response_text)
+            if len(questions) == 3:
+                logger.info("Parsed 3 AI questions from streamed LM Studio output")
+                return questions
+            
+            logger.warning("Incremental parse incomplete, falling back to text parsing")
             questions = self._parse_questions_from_response(response_text)
             if len(questions) >= 3:
                 logger.info(f"Successfully generated {len(questions)} AI questions using LM Studio")
@@ -151,12 +375,31 @@ class AIFollowupService:
         self, 
         intern_id: str, 
         start_date: datetime, 
-        end_date: datetime
+        end_date: datetime,
+        priority: Priority = Priority.REPORT,
+        is_disconnected: Callable[[], Awaitable[bool]] = None,
+        on_progress: Callable[[str, float], Awaitable[None]] = None
     ) -> Dict[str, Any]:
         """
         Generate AI-powered weekly report using LM Studio
+        
+        Ranges of REPORT_HIERARCHY_MIN_DAYS or more are delegated to
+        generate_period_report. on_progress(stage, fraction) is awaited as
+        the work advances (used by background report jobs).
         """
+        start_date, end_date = whole_day_range(start_date, end_date)
+        if self._use_report_hierarchy(start_date, end_date):
+            return await self.generate_period_report(
+                intern_id, start_date, end_date, priority, is_disconnected, on_progress
+            )
+        
         try:
+            # Fingerprint before generating: data arriving mid-generation makes the stored copy stale
+            fingerprint = await self._report_data_fingerprint(intern_id, start_date, end_date)
+            stored = await self._get_stored_weekly_report(intern_id, start_date, end_date, fingerprint)
+            if stored:
+                return stored
+            
             # Fetch weekly data
             weekly_data = await self._fetch_weekly_data(intern_id, start_date, end_date)
             
@@ -167,22 +410,33 @@ class AIFollowupService:
                     "report": None
                 }
             
-            # Build weekly report prompt
-            prompt = self._build_weekly_report_prompt(weekly_data, start_date, end_date)
+            data_summary = self._build_weekly_data_summary(weekly_data, start_date, end_date)
+            
+            # Build weekly report prompt (summarizing each day first in map_reduce mode)
+            if on_progress:
+                await on_progress("summarizing", 0.1)
+            prompt = await self._build_weekly_report_input(
+                weekly_data, start_date, end_date, priority, is_disconnected
+            )
             
+            if on_progress:
+                await on_progress("generating_report", 0.6)
             logger.info(f"Generating weekly report for intern {intern_id} using LM Studio")
-            response_text = await self.lmstudio_client.generate_content(prompt)
+            response_text = await self.provider_manager.generate_content(
+                prompt,
+                priority=priority,
+                intern_id=intern_id,
+                is_disconnected=is_disconnected,
+                profile=REPORT_PROFILE
+            )
             
             if response_text and response_text.strip():
+                report = response_text.strip()
+                await self._store_weekly_report(intern_id, start_date, end_date, report, data_summary, fingerprint)
                 return {
                     "success": True,
-                    "report": response_text.strip(),
-                    "data_summary": {
-                        "work_updates_count": len(weekly_data["work_updates"]),
-                        "followup_sessions_count": len(weekly_data["followup_sessions"]),
-                        "date_range": f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}",
-                        "provider_used": "LMStudio_Local"
-                    }
+                    "report": report,
+                    "data_summary": data_summary
                 }
             else:
                 return {
@@ -199,23 +453,393 @@ class AIFollowupService:
                 "report": None
             }
     
+    async def generate_cohort_weekly_reports(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        concurrency: int = None
+    ) -> Dict[str, Any]:
+        """
+        Generate and store the weekly report of every intern with records in
+        the range, at background priority and at most `concurrency` at a time
+        """
+        started_at = datetime.now()
+        start_date, end_date = whole_day_range(start_date, end_date)
+        intern_ids = await self._find_interns_with_records(start_date, end_date)
+        semaphore = asyncio.Semaphore(concurrency or self.config.REPORT_BATCH_CONCURRENCY)
+        counts = {"generated": 0, "reused": 0, "failed": 0}
+        
+        logger.info(f"Report batch: {len(intern_ids)} intern(s) with records from {start_date.date()} to {end_date.date()}")
+        
+        async def run(intern_id: str) -> None:
+            async with semaphore:
+                result = await self.generate_weekly_report(
+                    intern_id, start_date, end_date, priority=Priority.BACKGROUND
+                )
+            
+            if not result.get("success"):
+                counts["failed"] += 1
+                logger.warning(f"Report batch: intern {intern_id} failed: {result.get('message')}")
+            elif result.get("data_summary", {}).get("cached"):
+                counts["reused"] += 1
+            else:
+                counts["generated"] += 1
+        
+        await asyncio.gather(*(run(intern_id) for intern_id in intern_ids))
+        
+        finished_at = datetime.now()
+        self.last_report_batch = {
+            "date_range": f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}",
+            "interns": len(intern_ids),
+            **counts,
+            "started_at": started_at.isoformat(),
+            "finished_at": finished_at.isoformat(),
+            "duration_s": round((finished_at - started_at).total_seconds(), 1)
+        }
+        logger.info(f"Report batch finished: {self.last_report_batch}")
+        return self.last_report_batch
+    
+    async def _find_interns_with_records(self, start_date: datetime, end_date: datetime) -> List[str]:
+        """Distinct intern IDs with daily records in the range"""
+        daily_records_collection = self.db[Config.DAILY_RECORDS_COLLECTION]
+        intern_ids = await daily_records_collection.distinct("internId", {
+            "date": {"$gte": start_date.strftime('%Y-%m-%d'), "$lte": end_date.strftime('%Y-%m-%d')}
+        })
+        return sorted(str(intern_id) for intern_id in intern_ids if intern_id)
+    
+    def _use_report_hierarchy(self, start_date: datetime, end_date: datetime) -> bool:
+        return (end_date.date() - start_date.date()).days + 1 >= self.config.REPORT_HIERARCHY_MIN_DAYS
+    
+    async def _build_period_report_input(
+        self,
+        intern_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        priority: Priority,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]],
+        on_progress: Optional[Callable[[str, float], Awaitable[None]]] = None
+    ) -> Tuple[Optional[str], Dict[str, Any]]:
+        prompt, data_summary = await self.report_engine.build_report_prompt(
+            intern_id, start_date, end_date, priority, is_disconnected, on_progress
+        )
+        self.prompt_usage["period_report"] = self.report_engine.last_prompt_usage
+        return prompt, data_summary
+    
+    async def generate_period_report(
+        self,
+        intern_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        priority: Priority = Priority.REPORT,
+        is_disconnected: Callable[[], Awaitable[bool]] = None,
+        on_progress: Callable[[str, float], Awaitable[None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate a monthly / quarterly (or any long-range) report from
+        rolled-up week and month summaries
+        """
+        start_date, end_date = whole_day_range(start_date, end_date)
+        try:
+            fingerprint = await self._report_data_fingerprint(intern_id, start_date, end_date)
+            stored = await self._get_stored_weekly_report(intern_id, start_date, end_date, fingerprint)
+            if stored:
+                return stored
+            
+            prompt, data_summary = await self._build_period_report_input(
+                intern_id, start_date, end_date, priority, is_disconnected, on_progress
+            )
+            
+            if prompt is None:
+                return {
+                    "success": False,
+                    "message": "No work updates found for the specified date range",
+                    "report": None
+                }
+            
+            if on_progress:
+                await on_progress("generating_report", 0.85)
+            logger.info(f"Generating period report for intern {intern_id} from {data_summary['weeks']} week summaries")
+            response_text = await self.provider_manager.generate_content(
+                prompt,
+                priority=priority,
+                intern_id=intern_id,
+                is_disconnected=is_disconnected,
+                profile=REPORT_PROFILE
+            )
+            
+            if response_text and response_text.strip():
+                report = response_text.strip()
+                await self._store_weekly_report(intern_id, start_date, end_date, report, data_summary, fingerprint)
+                return {
+                    "success": True,
+                    "report": report,
+                    "data_summary": data_summary
+                }
+            else:
+                return {
+                    "success": False,
+                    "message": "LM Studio failed to generate report",
+                    "report": None
+                }
+                
+        except Exception as e:
+            logger.error(f"Error generating period report: {e}")
+            return {
+                "success": False,
+                "message": f"Failed to generate report: {str(e)}",
+                "report": None
+            }
+    
+    async def stream_weekly_report(
+        self,
+        intern_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        priority: Priority = Priority.REPORT,
+        is_disconnected: Callable[[], Awaitable[bool]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Generate a weekly report as a stream of events
+        
+        Yields {"event": "metadata"} first, then {"event": "token"} chunks and
+        finally {"event": "done"} (or {"event": "error"}). The assembled
+        report is persisted so repeat views are served from storage.
+        """
+        start_date, end_date = whole_day_range(start_date, end_date)
+        try:
+            prompt = None
+            fingerprint = await self._report_data_fingerprint(intern_id, start_date, end_date)
+            stored = await self._get_stored_weekly_report(intern_id, start_date, end_date, fingerprint)
+            
+            if stored:
+                data_summary = stored["data_summary"]
+            elif self._use_report_hierarchy(start_date, end_date):
+                prompt, data_summary = await self._build_period_report_input(
+                    intern_id, start_date, end_date, priority, is_disconnected
+                )
+                if prompt is None:
+                    yield {"event": "error", "message": "No work updates found for the specified date range"}
+                    return
+            else:
+                weekly_data = await self._fetch_weekly_data(intern_id, start_date, end_date)
+                
+                if not weekly_data["work_updates"]:
+                    yield {"event": "error", "message": "No work updates found for the specified date range"}
+                    return
+                
+                data_summary = self._build_weekly_data_summary(weekly_data, start_date, end_date)
+            
+            yield {
+                "event": "metadata",
+                "user_id": intern_id,
+                "date_range": {
+                    "start": start_date.strftime('%Y-%m-%d'),
+                    "end": end_date.strftime('%Y-%m-%d')
+                },
+                "data_summary": data_summary,
+                "cached": stored is not None
+            }
+            
+            if stored:
+                yield {"event": "token", "text": stored["report"]}
+                yield {"event": "done", "report_length": len(stored["report"]), "cached": True}
+                return
+            
+            if prompt is None:
+                prompt = await self._build_weekly_report_input(
+                    weekly_data, start_date, end_date, priority, is_disconnected
+                )
+            
+            logger.info(f"Streaming weekly report for intern {intern_id} using LM Studio")
+            chunks = []
+            async for delta in self.provider_manager.stream_content(
+                prompt,
+                priority=priority,
+                intern_id=intern_id,
+                is_disconnected=is_disconnected,
+                profile=REPORT_PROFILE
+            ):
+                chunks.append(delta)
+                yield {"event": "token", "text": delta}
+            
+            report = "".join(chunks).strip()
+            if not report:
+                yield {"event": "error", "message": "LM Studio failed to generate report"}
+                return
+            
+            await self._store_weekly_report(intern_id, start_date, end_date, report, data_summary, fingerprint)
+            yield {"event": "done", "report_length": len(report), "cached": False}
+            
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error streaming weekly report: {e}")
+            yield {"event": "error", "message": f"Failed to generate weekly report: {str(e)}"}
+    
+    def _build_weekly_data_summary(
+        self, 
+        weekly_data: Dict[str, Any], 
+        start_date: datetime, 
+        end_date: datetime
+    ) -> Dict[str, Any]:
+        """Summary of the data a weekly report was generated from"""
+        return {
+            "work_updates_count": len(weekly_data["work_updates"]),
+            "followup_sessions_count": len(weekly_data["followup_sessions"]),
+            "date_range": f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}",
+            "provider_used": "LMStudio_Local",
+            "mode": self.config.WEEKLY_REPORT_MODE
+        }
+    
+    def _weekly_report_id(self, intern_id: str, start_date: datetime, end_date: datetime) -> str:
+        return f"{intern_id}_{start_date.strftime('%Y-%m-%d')}_{end_date.strftime('%Y-%m-%d')}"
+    
+    async def _report_data_fingerprint(
+        self,
+        intern_id: str,
+        start_date: datetime,
+        end_date: datetime
+    ) -> Optional[str]:
+        """
+        Count and latest updatedAt of the records a report over the range is
+        built from; changes whenever a record is added or rewritten
+        
+        Computed with two grouped aggregations so a stored report can be
+        validated without loading the records. None if the lookup fails.
+        """
+        queries = {
+            Config.DAILY_RECORDS_COLLECTION: {
+                "internId": intern_id,
+                "date": {"$gte": start_date.strftime('%Y-%m-%d'), "$lte": end_date.strftime('%Y-%m-%d')}
+            },
+            Config.FOLLOWUP_SESSIONS_COLLECTION: {
+                "$or": [{"userId": intern_id}, {"internId": intern_id}],
+                "createdAt": {"$gte": start_date, "$lte": end_date}
+            }
+        }
+        
+        parts = []
+        try:
+            for collection_name, query in queries.items():
+                groups = await self.db[collection_name].aggregate([
+                    {"$match": query},
+                    {"$group": {"_id": None, "count": {"$sum": 1}, "updatedAt": {"$max": "$updatedAt"}}}
+                ]).to_list(length=1)
+                group = groups[0] if groups else {"count": 0, "updatedAt": None}
+                updated_at = group["updatedAt"].isoformat() if group["updatedAt"] else "-"
+                parts.append(f"{collection_name}:{group['count']}:{updated_at}")
+        except Exception as e:
+            logger.warning(f"Report data fingerprint failed for intern {intern_id}: {e}")
+            return None
+        
+        return "|".join(parts)
+    
+    async def _get_stored_weekly_report(
+        self,
+        intern_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        fingerprint: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Return a persisted report if its data fingerprint still matches"""
+        if fingerprint is None:
+            return None
+        
+        try:
+            reports_collection = self.db[Config.WEEKLY_REPORTS_COLLECTION]
+            doc = await reports_collection.find_one({
+                "_id": self._weekly_report_id(intern_id, start_date, end_date)
+            })
+        except Exception as e:
+            logger.warning(f"Stored weekly report lookup failed: {e}")
+            return None
+        
+        if not doc or doc.get("fingerprint") != fingerprint:
+            return None
+        
+        logger.info(f"Serving stored weekly report for intern {intern_id}")
+        stored_summary = doc.get("dataSummary", {})
+        return {
+            "success": True,
+            "report": doc["report"],
+            "data_summary": {**stored_summary, "generated_at": doc["generatedAt"].isoformat(), "cached": True}
+        }
+    
+    async def _store_weekly_report(
+        self,
+        intern_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        report: str,
+        data_summary: Dict[str, Any],
+        fingerprint: Optional[str]
+    ) -> None:
+        """Persist a generated weekly report with the fingerprint of its data"""
+        report_id = self._weekly_report_id(intern_id, start_date, end_date)
+        try:
+            reports_collection = self.db[Config.WEEKLY_REPORTS_COLLECTION]
+            await reports_collection.replace_one(
+                {"_id": report_id},
+                {
+                    "_id": report_id,
+                    "internId": intern_id,
+                    "startDate": start_date.strftime('%Y-%m-%d'),
+                    "endDate": end_date.strftime('%Y-%m-%d'),
+                    "report": report,
+                    "dataSummary": data_summary,
+                    "fingerprint": fingerprint,
+                    "generatedAt": datetime.now()
+                },
+                upsert=True
+            )
+            logger.info(f"Weekly report stored: {report_id}")
+        except Exception as e:
+            logger.warning(f"Failed to store weekly report {report_id}: {e}")
+    
+    async def invalidate_stored_reports(self, intern_id: str, dates: List[str]) -> int:
+        """Drop an intern's stored reports whose range covers any of the given YYYY-MM-DD dates"""
+        dates = sorted({date for date in dates if date})
+        if not dates:
+            return 0
+        
+        try:
+            reports_collection = self.db[Config.WEEKLY_REPORTS_COLLECTION]
+            result = await reports_collection.delete_many({
+                "internId": intern_id,
+                "$or": [{"startDate": {"$lte": date}, "endDate": {"$gte": date}} for date in dates]
+            })
+        except Exception as e:
+            logger.warning(f"Failed to invalidate stored reports for intern {intern_id}: {e}")
+            return 0
+        
+        if result.deleted_count:
+            logger.info(f"Invalidated {result.deleted_count} stored report(s) for intern {intern_id} ({', '.join(dates)})")
+        return result.deleted_count
+    
     async def test_ai_connection(self) -> Dict[str, Any]:
         """Test LM Studio connection"""
         results = {
             "lmstudio_provider": {},
+            "lmstudio_backends": {},
             "summary": {}
         }
         
         try:
-            # Test LM Studio
-            test_result = await self.lmstudio_client.test_connection()
-            results["lmstudio_provider"] = test_result
+            # Test every LM Studio server in the pool
+            backend_results = await self.provider_manager.test_all_connections()
+            results["lmstudio_backends"] = backend_results
+            results["lmstudio_provider"] = next(iter(backend_results.values()), {})
             
-            lmstudio_working = test_result.get("status") == "working"
+            working_backends = [
+                name for name, result in backend_results.items()
+                if result.get("status") == "working"
+            ]
+            lmstudio_working = bool(working_backends)
             
             # Summary
             results["summary"] = {
                 "lmstudio_working": lmstudio_working,
+                "working_backends": f"{len(working_backends)}/{len(backend_results)}",
                 "overall_status": "healthy" if lmstudio_working else "offline",
                 "fallback_available": True,
                 "provider_type": "local",
@@ -273,67 +897,107 @@ class AIFollowupService:
         }
     
     def _build_weekly_report_prompt(self, weekly_data: Dict[str, Any], start_date: datetime, end_date: datetime) -> str:
-        """Build weekly report prompt - UNCHANGED"""
+        """Build weekly report prompt: shared instructions first, then the intern's week"""
         work_updates = weekly_data["work_updates"]
         followup_sessions = weekly_data["followup_sessions"]
-        intern_id = weekly_data["intern_id"]
-        
-        work_summary = []
-        for i, update in enumerate(work_updates, 1):
-            date = update.get("date") or update.get("update_date", "Unknown")
-            task = update.get("task") or update.get("description", "No description")
-            progress = update.get("progress", "")
-            blockers = update.get("blockers", "")
-            status = update.get("status", "unknown")
-            
-            work_summary.append(f"""
-Day {i} ({date}):
-- Status: {status}
-- Tasks: {task}
-- Progress: {progress if progress else 'Not specified'}
-- Challenges: {blockers if blockers else 'None mentioned'}
-""")
-        
-        followup_summary = []
-        for i, session in enumerate(followup_sessions, 1):
-            questions = session.get("questions", [])
-            answers = session.get("answers", [])
-            status = session.get("status", "unknown")
-            created_date = session.get("createdAt", datetime.now()).strftime('%Y-%m-%d')
-            
-            qa_pairs = []
-            for q, a in zip(questions, answers):
-                qa_pairs.append(f"Q: {q}\nA: {a if a else 'Not answered'}")
-            
-            followup_summary.append(f"""
-Follow-up Session {i} ({created_date}) - Status: {status}
-{chr(10).join(qa_pairs)}
-""")
-        
-        prompt = f"""You are generating a comprehensive weekly report for an intern's progress and performance.
-
-**Intern ID:** {intern_id}
-**Week Period:** {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}
-
-**WORK UPDATES THIS WEEK:**
-{''.join(work_summary)}
-
-**FOLLOW-UP SESSIONS THIS WEEK:**
-{''.join(followup_summary) if followup_summary else "No follow-up sessions this week."}
-
-Generate a professional weekly report that includes:
-
-1. **Executive Summary** - Overall performance and progress
-2. **Daily Work Breakdown** - What was accomplished each day
-3. **Key Achievements** - Major completions and successes
-4. **Challenges & Blockers** - Issues faced and how they were addressed
-5. **Areas for Improvement** - Constructive feedback
-6. **Plans for Next Week** - Recommendations
-7. **Manager Notes** - Concerns or praise
-
-Make the report professional, specific with examples, constructive, and actionable."""
+        period = (
+            f"Intern ID: {weekly_data['intern_id']}\n"
+            f"Week Period: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}"
+        )
+        
+        # Tasks copied from day to day are only spelled out once
+        day_labels = [f"Day {i}" for i in range(1, len(work_updates) + 1)]
+        tasks = dedupe_repeats(
+            [update.get("task") or update.get("description", "No description") for update in work_updates],
+            day_labels
+        )
+        
+        work_summary = [
+            format_work_update(update, label, task)
+            for update, label, task in zip(work_updates, day_labels, tasks)
+        ]
+        followup_summary = [
+            format_followup_session(session, f"Follow-up Session {i}")
+            for i, session in enumerate(followup_sessions, 1)
+        ]
+        
+        budget = PromptBudget(
+            "weekly_report",
+            self.config.PROMPT_BUDGET_WEEKLY_REPORT,
+            template_tokens=estimate_tokens(WEEKLY_REPORT_TEMPLATE.render({"period": period}))
+        )
+        # Daily work first; Q&A detail gets what is left
+        budget.add_section(
+            "work_updates", work_summary, priority=0, separator="", drop_from="start",
+            omitted_note="\n({count} earlier days omitted)\n"
+        )
+        budget.add_section(
+            "followup_sessions", followup_summary, priority=1, separator="", drop_from="start",
+            omitted_note="\n({count} earlier sessions omitted)\n"
+        )
+        sections = budget.allocate()
+        self.prompt_usage["weekly_report"] = budget.report()
+        
+        return WEEKLY_REPORT_TEMPLATE.render({
+            "period": period,
+            "work_updates": sections["work_updates"].strip(),
+            "followup_sessions": sections["followup_sessions"].strip() or "No follow-up sessions this week."
+        })
+    
+    async def _build_weekly_report_input(
+        self,
+        weekly_data: Dict[str, Any],
+        start_date: datetime,
+        end_date: datetime,
+        priority: Priority,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]]
+    ) -> str:
+        """
+        Prompt for the final report generation
         
-        return prompt
+        In map_reduce mode each day is summarized first (concurrently, reusing
+        stored summaries) and the report is written from the short summaries.
+        """
+        if self.config.WEEKLY_REPORT_MODE != "map_reduce":
+            return self._build_weekly_report_prompt(weekly_data, start_date, end_date)
+        
+        day_summaries = await self.day_summarizer.summarize_days(
+            weekly_data["intern_id"],
+            weekly_data["work_updates"],
+            weekly_data["followup_sessions"],
+            priority=priority,
+            is_disconnected=is_disconnected
+        )
+        return self._build_weekly_reduce_prompt(weekly_data["intern_id"], day_summaries, start_date, end_date)
+    
+    def _build_weekly_reduce_prompt(
+        self,
+        intern_id: str,
+        day_summaries: List[Dict[str, Any]],
+        start_date: datetime,
+        end_date: datetime
+    ) -> str:
+        """Reduce prompt combining per-day summaries into the weekly report"""
+        period = (
+            f"Intern ID: {intern_id}\n"
+            f"Week Period: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}"
+        )
+        
+        budget = PromptBudget(
+            "weekly_report_reduce",
+            self.config.PROMPT_BUDGET_WEEKLY_REPORT,
+            template_tokens=estimate_tokens(WEEKLY_REDUCE_TEMPLATE.render({"period": period}))
+        )
+        budget.add_section(
+            "daily_summaries",
+            [f"Day {i} ({day['date']}):\n{day['summary']}" for i, day in enumerate(day_summaries, 1)],
+            priority=0, separator="\n\n", drop_from="start",
+            omitted_note="({count} earlier days omitted)"
+        )
+        sections = budget.allocate()
+        self.prompt_usage["weekly_report_reduce"] = budget.report()
+        
+        return WEEKLY_REDUCE_TEMPLATE.render({"period": period, "daily_summaries": sections["daily_summaries"]})
     
     async def _get_recent_work_history(self, user_id: str) -> List[Dict[str, Any]]:
         """Get recent work history - UNCHANGED"""
@@ -423,62 +1087,81 @@ Make the report professional, specific with examples, constructive, and actionab
         context_lines.append("---")
         return '\n'.join(context_lines)
     
-    def _build_work_history_context(self, docs: List[Dict[str, Any]]) -> str:
-        """Build history context - UNCHANGED"""
-        context_lines = ["RECENT WORK HISTORY:"]
-        
+    def _build_work_history_entries(self, docs: List[Dict[str, Any]]) -> List[str]:
+        """
+        One history entry per document, oldest first
+
+        Chronological order keeps yesterday's history a prefix of today's,
+        so the inference server can reuse it for the same intern.
+        """
+        docs = list(reversed(docs))
+        dates = []
         for doc in docs:
             date_time = self._extract_timestamp(doc)
-            description = doc.get('description', '').strip() or doc.get('task', '').strip()
+            dates.append(date_time.strftime('%Y-%m-%d') if date_time else 'Unknown')
+        
+        # First occurrence keeps the full text; later repeats point back to it
+        descriptions = dedupe_repeats(
+            [doc.get('description', '').strip() or doc.get('task', '').strip() for doc in docs],
+            dates
+        )
+        
+        entries = []
+        for doc, date_str, description in zip(docs, dates, descriptions):
             challenges = doc.get('challenges', '').strip() or doc.get('progress', '').strip()
             plans = doc.get('plans', '').strip() or doc.get('blockers', '').strip()
             
-            date_str = date_time.strftime('%Y-%m-%d') if date_time else 'Unknown'
-            
-            context_lines.append(f"Date: {date_str}")
+            entry_lines = [f"Date: {date_str}"]
             if description:
-                context_lines.append(f"Work: {description}")
+                entry_lines.append(f"Work: {description}")
             if challenges:
-                context_lines.append(f"Challenges: {challenges}")
+                entry_lines.append(f"Challenges: {challenges}")
             if plans:
-                context_lines.append(f"Plans: {plans}")
-            context_lines.append("---")
+                entry_lines.append(f"Plans: {plans}")
+            entry_lines.append("---")
+            entries.append('\n'.join(entry_lines))
         
-        return '\n'.join(context_lines)
+        return entries
     
-    def _build_ai_prompt(self, current_context: str, history_context: str, recent_docs: List[Dict[str, Any]]) -> str:
-        """YOUR EXISTING PROMPT - COMPLETELY UNCHANGED"""
+    def _build_ai_prompt(self, current_context: str, recent_docs: List[Dict[str, Any]]) -> str:
+        """Build the follow-up prompt: shared instructions first, today's data last"""
+        history_entries = self._build_work_history_entries(recent_docs) if recent_docs else []
         
-        today_work_update = current_context
-        yesterday_plans = self._extract_yesterday_plans_from_recent_docs(recent_docs)
-        current_challenges = self._extract_current_challenges(current_context)
-        seven_day_history = history_context
-
-        prompt = f"""You're helping a supervisor create simple, easy-to-answer follow-up questions for an intern's daily work update.
-
-**Today's Work:** {today_work_update}
-**What They Planned (from yesterday):** {yesterday_plans}
-**Current Challenges:** {current_challenges}
-**Recent Work History:** {seven_day_history}
-
-Generate exactly 3 simple questions that:
-1. Are easy to answer with 1-2 sentences
-2. Sound friendly and conversational to understand progress without being demanding
-3. Focus on today's work specifically 
-4. When says they completed a task,ask them to describe the steps they followed in a general but specific-enough way, so we can understand how the work was approached and verify it was actually done
-7. If {yesterday_plans} exists verify {today_work_update} matches {yesterday_plans} naturally .
-
-Avoid questions about:
-- Feelings or emotions
-- Complex technical details
-- Long explanations
-
-Format your response as:
+        budget = PromptBudget(
+            "followup",
+            self.config.PROMPT_BUDGET_FOLLOWUP,
+            template_tokens=estimate_tokens(self.followup_template.render({}))
+        )
+        budget.add_section("today_work", [current_context], priority=0, max_tokens=600)
+        budget.add_section(
+            "yesterday_plans", [self._extract_yesterday_plans_from_recent_docs(recent_docs)], 
+            priority=1, max_tokens=200
+        )
+        budget.add_section(
+            "current_challenges", [self._extract_current_challenges(current_context)], 
+            priority=1, max_tokens=150
+        )
+        budget.add_section(
+            "history", history_entries, priority=2, drop_from="start",
+            omitted_note="({count} older entries omitted)"
+        )
+        sections = budget.allocate()
+        self.prompt_usage["followup"] = budget.report()
+        
+        if not sections["history"]:
+            sections["history"] = "No recent work history"
+        return self.followup_template.render(sections)
+    
+    def _followup_format_instructions(self) -> str:
+        """Output format section of the follow-up prompt"""
+        if self.config.FOLLOWUP_STRUCTURED_OUTPUT:
+            return """Respond with JSON only, exactly in this shape:
+{"questions": ["First simple question", "Second simple question", "Third simple question"]}"""
+        
+        return """Format your response as:
 1. [First simple question] 
 2. [Second simple question]
 3. [Third simple question]"""
-
-        return prompt
     
     def _extract_yesterday_plans_from_recent_docs(self, recent_docs: List[Dict[str, Any]]) -> str:
         """Extract yesterday's plans - UNCHANGED"""
@@ -519,6 +1202,35 @@ Format your response as:
         
         return challenges
     
+    def _parse_structured_questions(self, response: str) -> Optional[List[str]]:
+        """
+        Parse {"questions": [q1, q2, q3]} output
+        
+        Returns None unless there are exactly three non-trivial strings.
+        """
+        text = response.strip()
+        if text.startswith("```"):
+            # Some models wrap JSON in a code fence despite the schema
+            text = text.strip("`")
+            if text.lower().startswith("json"):
+                text = text[4:]
+        
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return None
+        
+        questions = data.get("questions") if isinstance(data, dict) else data
+        if not isinstance(questions, list) or len(questions) != 3:
+            return None
+        
+        cleaned = []
+        for question in questions:
+            if not isinstance(question, str) or len(question.strip()) <= 10:
+                return None
+            cleaned.append(question.strip())
+        return cleaned
+    
     def _parse_questions_from_response(self, response: str) -> List[str]:
         """Parse questions - UNCHANGED"""
         questions = []
@@ -581,7 +1293,8 @@ Format your response as:
                 "answers": [""] * len(questions),
                 "status": SessionStatus.PENDING,
                 "createdAt": datetime.now(),
-                "completedAt": None
+                "completedAt": None,
+                "updatedAt": datetime.now()
             }
             
             await followup_collection.replace_one(
@@ -605,7 +1318,8 @@ Format your response as:
             update_doc = {
                 "answers": answers,
                 "status": SessionStatus.COMPLETED,
-                "completedAt": datetime.now()
+                "completedAt": datetime.now(),
+                "updatedAt": datetime.now()
             }
             
             result = await followup_collection.update_one(
@@ -649,4 +1363,31 @@ Format your response as:
             
         except Exception as e:
             logger.error(f"Error getting pending follow-up session: {e}")
-            return None
\ No newline at end of file
+            return None
+
+# Global AI followup service instance
+followup_service: Optional[AIFollowupService] = None
+
+def initialize_ai_service() -> AIFollowupService:
+    """Initialize the global AI followup service (once per process)"""
+    global followup_service
+    
+    if followup_service is None:
+        followup_service = AIFollowupService()
+        logger.info("Global AI followup service initialized")
+    return followup_service
+
+def get_followup_service() -> AIFollowupService:
+    """Get the global AI followup service instance"""
+    if followup_service is None:
+        raise RuntimeError("AI service not initialized. Call initialize_ai_service() first")
+    
+    return followup_service
+
+async def close_ai_service() -> None:
+    """Close the global AI followup service and release its connections"""
+    global followup_service
+    
+    if followup_service is not None:
+        await followup_service.close()
+        followup_service = None
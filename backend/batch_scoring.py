@@ -0,0 +1,295 @@
+"""
+Batch Scoring - Quality scores for thousands of work updates at once
+Word counts, line breaks, bullets, keyword hits and structure words are
+computed for the whole batch with NumPy over one concatenated buffer,
+sentiment runs in the scoring executor in chunks, and repetition data for
+every intern comes from one grouped query per collection
+"""
+
+import asyncio
+import logging
+import re
+import time
+from typing import Any, Dict, List, Set, Tuple
+
+import numpy as np
+
+from config import Config
+from scoring_executor import ScoringExecutor
+from text_scoring import STRUCTURE_KEYWORDS, STRUCTURE_PATTERN, TextScorer
+
+logger = logging.getLogger(__name__)
+
+# Non-ASCII characters str.split() treats as whitespace, mapped to a plain space
+# so whitespace can be detected byte-wise in the UTF-8 buffer
+_UNICODE_WHITESPACE = {
+    code: " " for code in range(0x80, 0x3001) if chr(code).isspace()
+}
+
+# Bytes matching the bullet class [•\-\*\d+\.] (• itself is matched as E2 80 A2)
+_BULLET_BYTES = np.frombuffer(b"-*+.0123456789", dtype=np.uint8)
+
+# Separator between documents in the joined text; never part of a keyword
+_DOC_SEPARATOR = "\x00"
+
+# Final score for every clipped raw score 0-9, same rounding as the single scorer
+_SCORE_TABLE = np.array([round((raw * 10) / 9, 1) for raw in range(10)])
+
+def _segment_sums(values: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """Sum of values[offsets[i]:offsets[i+1]] for every i (empty segments give 0)"""
+    cumulative = np.concatenate(([0], np.cumsum(values, dtype=np.int64)))
+    return cumulative[offsets[1:]] - cumulative[offsets[:-1]]
+
+def _match_docs(pattern: re.Pattern, joined: str, starts: np.ndarray) -> Tuple[np.ndarray, List[str]]:
+    """Document index and matched text of every match of pattern in the joined text"""
+    positions, matched = [], []
+    for match in pattern.finditer(joined):
+        positions.append(match.start())
+        matched.append(match.group(match.lastindex or 0))
+    docs = np.searchsorted(starts, np.asarray(positions, dtype=np.int64), side="right") - 1
+    return docs, matched
+
+class BatchQualityScorer:
+    """
+    Scores many (intern_id, description) pairs with the same rules as
+    QualityScorer.calculate_quality_score, without the per-update overhead
+    """
+
+    def __init__(self, db, text_scorer: TextScorer, executor: ScoringExecutor):
+        self.db = db
+        self.text_scorer = text_scorer
+        self.executor = executor
+        self.config = text_scorer.config
+        self._structure_index = {keyword: i for i, keyword in enumerate(STRUCTURE_KEYWORDS)}
+
+    async def score(self, items: List[Tuple[str, str]]) -> Dict[str, Any]:
+        """
+        Score (intern_id, description) pairs; descriptions must be non-empty
+
+        Returns:
+            {"results": [...], "throughput": {...}} with results in input order
+        """
+        started = time.perf_counter()
+        timings: Dict[str, float] = {}
+        intern_ids = [intern_id for intern_id, _ in items]
+        texts = [description.strip() for _, description in items]
+
+        # Sentiment (pool) and repetition (MongoDB) run while features are computed
+        sentiment_task = asyncio.create_task(self._timed(timings, "sentiment", self._polarities(texts)))
+        repetition_task = asyncio.create_task(
+            self._timed(timings, "repetition", self._fetch_recent_descriptions(sorted(set(intern_ids))))
+        )
+
+        # Tokenizing and stemming thousands of texts would block the event loop
+        stage = time.perf_counter()
+        lowers, word_counts, line_breaks, has_bullets, keyword_found, structure_words = (
+            await asyncio.to_thread(self._text_features, texts)
+        )
+        timings["features"] = time.perf_counter() - stage
+
+        polarities, recent = await asyncio.gather(sentiment_task, repetition_task)
+        is_repetition = np.fromiter(
+            (lower in recent.get(intern_id, ()) for intern_id, lower in zip(intern_ids, lowers)),
+            dtype=bool, count=len(items)
+        )
+
+        results = self._combine(
+            intern_ids, word_counts, line_breaks, has_bullets, keyword_found,
+            structure_words, polarities, is_repetition
+        )
+
+        elapsed = time.perf_counter() - started
+        throughput = {
+            "updates": len(items),
+            "interns": len(set(intern_ids)),
+            "elapsed_ms": round(elapsed * 1000, 1),
+            "updates_per_sec": round(len(items) / elapsed, 1) if elapsed else None,
+            "stages_ms": {name: round(seconds * 1000, 1) for name, seconds in timings.items()}
+        }
+        logger.info(f"Batch quality scoring: {len(items)} updates in {throughput['elapsed_ms']}ms ({throughput['updates_per_sec']}/s)")
+        return {"results": results, "throughput": throughput}
+
+    def _text_features(self, texts: List[str]) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Lowercased texts plus every text-derived feature (blocking; run it in a thread)"""
+        lowers = [text.lower() for text in texts]
+        word_counts, line_breaks, has_bullets = self._byte_features(texts)
+        keyword_found = self._keyword_hits(lowers)
+        structure_words = self._structure_word_counts(lowers)
+        return lowers, word_counts, line_breaks, has_bullets, keyword_found, structure_words
+
+    async def _timed(self, timings: Dict[str, float], name: str, awaitable) -> Any:
+        stage = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            timings[name] = time.perf_counter() - stage
+
+    def _byte_features(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Word counts (str.split semantics), newline counts and bullet presence"""
+        encoded = [text.translate(_UNICODE_WHITESPACE).encode() for text in texts]
+        offsets = np.concatenate(([0], np.cumsum([len(chunk) for chunk in encoded], dtype=np.int64)))
+        buffer = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+        # ASCII whitespace per str.isspace(): \t \n \v \f \r, \x1c-\x1f and space
+        is_space = ((buffer >= 9) & (buffer <= 13)) | ((buffer >= 28) & (buffer <= 32))
+
+        # A word starts at a non-space byte preceded by a space or a document start
+        preceded_by_space = np.empty_like(is_space)
+        preceded_by_space[:1] = True
+        preceded_by_space[1:] = is_space[:-1]
+        doc_starts = offsets[:-1][offsets[:-1] < len(buffer)]
+        preceded_by_space[doc_starts] = True
+        word_counts = _segment_sums(~is_space & preceded_by_space, offsets)
+
+        line_breaks = _segment_sums(buffer == 10, offsets)
+
+        bullets = np.isin(buffer, _BULLET_BYTES)
+        if len(buffer) >= 3:
+            bullets[:-2] |= (buffer[:-2] == 0xE2) & (buffer[1:-1] == 0x80) & (buffer[2:] == 0xA2)
+        has_bullets = _segment_sums(bullets, offsets) > 0
+
+        return word_counts, line_breaks, has_bullets
+
+    def _joined(self, lowers: List[str]) -> Tuple[str, np.ndarray]:
+        """Lowercased texts joined by a separator, plus each one's start offset"""
+        lengths = np.fromiter((len(lower) + 1 for lower in lowers), dtype=np.int64, count=len(lowers))
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        return _DOC_SEPARATOR.join(lowers), starts
+
+    def _keyword_hits(self, lowers: List[str]) -> np.ndarray:
+        """Whether each text contains a quality keyword (stemmed when NLTK is available)"""
+        n = len(lowers)
+        if not self.text_scorer.keyword_stems:
+            joined, starts = self._joined(lowers)
+            docs, _ = _match_docs(self.text_scorer.keyword_pattern, joined, starts)
+            return np.bincount(docs, minlength=n)[:n] > 0
+
+        # Token ids over a batch vocabulary; each distinct token is stemmed once
+        vocabulary: Dict[str, int] = {}
+        token_ids: List[int] = []
+        offsets = [0]
+        for lower in lowers:
+            token_ids.extend(
+                vocabulary.setdefault(token, len(vocabulary))
+                for token in self.text_scorer.nlp.tokenize(lower) if token.isalnum()
+            )
+            offsets.append(len(token_ids))
+
+        keyword_stems = self.text_scorer.keyword_stems
+        vocabulary_hit = np.fromiter(
+            (self.text_scorer.stem(token) in keyword_stems for token in vocabulary),
+            dtype=bool, count=len(vocabulary)
+        )
+        token_hit = vocabulary_hit[np.asarray(token_ids, dtype=np.int64)]
+        return _segment_sums(token_hit, np.asarray(offsets, dtype=np.int64)) > 0
+
+    def _structure_word_counts(self, lowers: List[str]) -> np.ndarray:
+        """Number of distinct structure keywords in each text"""
+        n = len(lowers)
+        joined, starts = self._joined(lowers)
+        docs, matched = _match_docs(STRUCTURE_PATTERN, joined, starts)
+        if not len(docs):
+            return np.zeros(n, dtype=np.int64)
+
+        keyword_ids = np.fromiter((self._structure_index[word] for word in matched), dtype=np.int64, count=len(matched))
+        pairs = np.unique(docs * len(STRUCTURE_KEYWORDS) + keyword_ids)
+        return np.bincount(pairs // len(STRUCTURE_KEYWORDS), minlength=n)[:n]
+
+    async def _polarities(self, texts: List[str]) -> np.ndarray:
+        if not self.text_scorer.has_sentiment:
+            return np.zeros(len(texts))
+        return np.asarray(await self.executor.polarities(texts), dtype=float)
+
+    async def _fetch_recent_descriptions(self, intern_ids: List[str]) -> Dict[str, Set[str]]:
+        """
+        Lowercased descriptions of each intern's last 5 updates in both work
+        update collections, one grouped aggregation per collection
+
+        $topN keeps only 5 descriptions per group while grouping, so an
+        intern's full history is never accumulated (needs MongoDB 5.2+).
+        """
+        # Same filter field as QualityScorer._check_repetition
+        pipeline = [
+            {"$match": {"userId": {"$in": intern_ids}}},
+            {"$group": {
+                "_id": "$userId",
+                "descriptions": {"$topN": {
+                    "n": 5,
+                    "sortBy": {"submittedAt": -1},
+                    # description, or task when description is missing or empty
+                    "output": {"$cond": [
+                        {"$gt": [{"$ifNull": ["$description", ""]}, ""]}, "$description", "$task"
+                    ]}
+                }}
+            }}
+        ]
+
+        recent: Dict[str, Set[str]] = {}
+        for collection_name in (Config.WORK_UPDATES_COLLECTION, Config.TEMP_WORK_UPDATES_COLLECTION):
+            try:
+                groups = await self.db[collection_name].aggregate(pipeline).to_list(length=None)
+            except Exception as e:
+                logger.warning(f"Batch repetition lookup on {collection_name} failed: {e}")
+                continue
+            for group in groups:
+                recent.setdefault(str(group["_id"]), set()).update(
+                    description.lower() for description in group["descriptions"] if description
+                )
+        return recent
+
+    def _combine(
+        self,
+        intern_ids: List[str],
+        word_counts: np.ndarray,
+        line_breaks: np.ndarray,
+        has_bullets: np.ndarray,
+        keyword_found: np.ndarray,
+        structure_words: np.ndarray,
+        polarities: np.ndarray,
+        is_repetition: np.ndarray
+    ) -> List[Dict[str, Any]]:
+        """Component scores, final score and flags for the whole batch"""
+        config = self.config
+
+        word_count_scores = np.where(
+            word_counts >= config.WORD_COUNT_OK_THRESHOLD, 4,
+            np.where(word_counts >= config.WORD_COUNT_WEAK_THRESHOLD, 2, 0)
+        )
+        keyword_scores = np.where(keyword_found, 2, 0)
+        very_negative = polarities < config.NEGATIVE_SENTIMENT_THRESHOLD
+        positive = polarities >= config.POSITIVE_SENTIMENT_THRESHOLD
+        sentiment_scores = np.where(very_negative, 0, np.where(positive, 2, 1))
+        has_structure = (structure_words >= 2) | has_bullets | (line_breaks >= 2)
+        repetition_penalties = np.where(is_repetition, -2, 0)
+
+        raw_scores = word_count_scores + keyword_scores + sentiment_scores + has_structure + repetition_penalties
+        final_scores = _SCORE_TABLE[np.clip(raw_scores, 0, 9)]
+
+        low_quality = final_scores < config.QUALITY_SCORE_THRESHOLD
+        too_short = word_counts < config.WORD_COUNT_WEAK_THRESHOLD
+        flagged = low_quality | is_repetition | too_short | very_negative
+
+        results = []
+        for i, intern_id in enumerate(intern_ids):
+            flag_reasons = [
+                reason for reason, hit in (
+                    ("low_quality_score", low_quality[i]),
+                    ("repetitive_content", is_repetition[i]),
+                    ("too_short", too_short[i]),
+                    ("very_negative_sentiment", very_negative[i])
+                ) if hit
+            ]
+            results.append({
+                "user_id": intern_id,
+                "quality_score": float(final_scores[i]),
+                "needs_followup": bool(flagged[i]),
+                "word_count": int(word_counts[i]),
+                "keyword_found": bool(keyword_found[i]),
+                "sentiment_label": "very_negative" if very_negative[i] else "positive" if positive[i] else "neutral",
+                "sentiment_polarity": float(polarities[i]),
+                "is_repetition": bool(is_repetition[i]),
+                "has_structure": bool(has_structure[i]),
+                "flagged": bool(flagged[i]),
+                "flag_reasons": flag_reasons
+            })
+        return results
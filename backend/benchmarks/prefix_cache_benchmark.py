@@ -0,0 +1,240 @@
+"""
+Prefix-cache benchmark - time-to-first-token of the old vs. the stable-prefix
+follow-up prompt layout
+
+Starts a local stand-in for LM Studio's OpenAI-compatible streaming endpoint
+that models prompt prefill: every prompt token not covered by a cached prefix
+costs --prefill-ms, and the server keeps the KV cache of the last prompt in
+each of its --slots slots (like llama.cpp's slot cache). The same synthetic
+workload (several interns submitting daily updates) is replayed with both
+layouts against a fresh server and TTFT is measured on the client.
+
+Usage (from backend/):
+    python benchmarks/prefix_cache_benchmark.py --interns 4 --days 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prompt_templates import build_followup_template  # noqa: E402
+
+SYSTEM_PROMPT = "You are an AI assistant helping supervisors track intern progress. Generate clear, specific follow-up questions."
+
+FORMAT_INSTRUCTIONS = """Respond with JSON only, exactly in this shape:
+{"questions": ["First simple question", "Second simple question", "Third simple question"]}"""
+
+TASKS = [
+    "Implemented the login form validation and wired it to the auth API",
+    "Wrote unit tests for the report export service and fixed two failing cases",
+    "Refactored the dashboard charts to use the shared data hooks",
+    "Investigated slow MongoDB queries on the daily records collection",
+    "Reviewed pull requests and updated the onboarding documentation",
+    "Built the CSV import page with progress feedback and error handling"
+]
+
+# --- Stand-in inference server ------------------------------------------------
+
+class PrefixCachingServer:
+    """Minimal streaming chat-completions server with simulated prefix caching"""
+
+    def __init__(self, slots: int, prefill_ms: float, decode_ms: float, output_tokens: int):
+        self.slots: List[List[str]] = [[] for _ in range(slots)]
+        self.prefill_ms = prefill_ms
+        self.decode_ms = decode_ms
+        self.output_tokens = output_tokens
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+
+    def _claim_slot(self, tokens: List[str]) -> int:
+        """Slot sharing the longest prefix (least recently refreshed wins ties); returns cached length"""
+        best_slot, best_len = 0, -1
+        for i, cached in enumerate(self.slots):
+            common = 0
+            for a, b in zip(cached, tokens):
+                if a != b:
+                    break
+                common += 1
+            if common > best_len:
+                best_slot, best_len = i, common
+
+        self.slots.append(tokens)
+        del self.slots[best_slot]
+        return best_len
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        headers = await reader.readuntil(b"\r\n\r\n")
+        length = 0
+        for line in headers.decode().split("\r\n"):
+            if line.lower().startswith("content-length:"):
+                length = int(line.split(":", 1)[1])
+        body = json.loads(await reader.readexactly(length))
+
+        prompt = "\n".join(message["content"] for message in body["messages"])
+        tokens = prompt.split()
+        cached = self._claim_slot(tokens)
+        self.prompt_tokens += len(tokens)
+        self.cached_tokens += cached
+
+        # Prefill only what the KV cache does not already hold
+        await asyncio.sleep((len(tokens) - cached) * self.prefill_ms / 1000)
+
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nConnection: close\r\n\r\n")
+        for i in range(self.output_tokens):
+            chunk = {"choices": [{"delta": {"content": f"tok{i} "}}]}
+            writer.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            await writer.drain()
+            await asyncio.sleep(self.decode_ms / 1000)
+        writer.write(b"data: [DONE]\n\n")
+        await writer.drain()
+        writer.close()
+
+# --- Client --------------------------------------------------------------------
+
+async def measure_ttft(port: int, prompt: str) -> float:
+    """Send one streaming request and return seconds until the first content chunk"""
+    body = json.dumps({
+        "model": "local-model",
+        "stream": True,
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+    }).encode()
+
+    started = time.perf_counter()
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        b"POST /v1/chat/completions HTTP/1.1\r\nHost: localhost\r\n"
+        b"Content-Type: application/json\r\n"
+        + f"Content-Length: {len(body)}\r\n\r\n".encode()
+        + body
+    )
+    await writer.drain()
+
+    ttft = None
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        if line.startswith(b"data: ") and ttft is None and b"[DONE]" not in line:
+            ttft = time.perf_counter() - started
+    writer.close()
+    return ttft
+
+# --- Prompt layouts ------------------------------------------------------------
+
+def legacy_followup_prompt(values: Dict[str, str]) -> str:
+    """The follow-up prompt as laid out before the template layer (volatile data first)"""
+    return f"""You're helping a supervisor create simple, easy-to-answer follow-up questions for an intern's daily work update.
+
+**Today's Work:** {values['today_work']}
+**What They Planned (from yesterday):** {values['yesterday_plans']}
+**Current Challenges:** {values['current_challenges']}
+**Recent Work History:** RECENT WORK HISTORY:
+{values['history_newest_first']}
+
+Generate exactly 3 simple questions that:
+1. Are easy to answer with 1-2 sentences
+2. Sound friendly and conversational to understand progress without being demanding
+3. Focus on today's work specifically
+4. When says they completed a task,ask them to describe the steps they followed in a general but specific-enough way, so we can understand how the work was approached and verify it was actually done
+7. If {values['yesterday_plans']} exists verify {values['today_work']} matches {values['yesterday_plans']} naturally .
+
+Avoid questions about:
+- Feelings or emotions
+- Complex technical details
+- Long explanations
+
+{FORMAT_INSTRUCTIONS}"""
+
+def build_workload(interns: int, days: int, seed: int) -> List[Dict[str, str]]:
+    """Daily follow-up prompt inputs, interleaved across interns like real traffic"""
+    rng = random.Random(seed)
+    histories: Dict[int, List[Tuple[str, str]]] = {i: [] for i in range(interns)}
+    workload = []
+
+    for day in range(days):
+        order = list(range(interns))
+        rng.shuffle(order)
+        for intern in order:
+            task = rng.choice(TASKS)
+            plans = f"Continue with {rng.choice(TASKS).lower()}"
+            history = histories[intern]
+            entries = [
+                f"Date: 2026-10-{d + 1:02d}\nWork: {t}\nPlans: {p}\n---"
+                for d, (t, p) in enumerate(history)
+            ]
+            workload.append({
+                # Legacy layout lists history newest first, the template oldest first
+                "history_newest_first": "\n".join(reversed(entries)) or "No recent work history",
+                "history": "\n".join(entries) or "No recent work history",
+                "yesterday_plans": history[-1][1] if history else "No previous plans found",
+                "today_work": f"CURRENT WORK UPDATE:\nWork Description: {task} (intern {intern}, day {day + 1})\n---",
+                "current_challenges": "No challenges mentioned"
+            })
+            history.append((task, plans))
+
+    return workload
+
+async def run_layout(name: str, prompts: List[str], args: argparse.Namespace) -> Dict[str, float]:
+    server = PrefixCachingServer(args.slots, args.prefill_ms, args.decode_ms, args.output_tokens)
+    listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+    port = listener.sockets[0].getsockname()[1]
+
+    try:
+        ttfts = [await measure_ttft(port, prompt) for prompt in prompts]
+    finally:
+        listener.close()
+        await listener.wait_closed()
+
+    ttfts_ms = sorted(t * 1000 for t in ttfts)
+    return {
+        "layout": name,
+        "requests": len(ttfts_ms),
+        "mean_ttft_ms": statistics.mean(ttfts_ms),
+        "p50_ttft_ms": ttfts_ms[len(ttfts_ms) // 2],
+        "p95_ttft_ms": ttfts_ms[min(len(ttfts_ms) - 1, int(len(ttfts_ms) * 0.95))],
+        "prefix_cache_hit": server.cached_tokens / server.prompt_tokens
+    }
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--interns", type=int, default=4)
+    parser.add_argument("--days", type=int, default=5)
+    parser.add_argument("--slots", type=int, default=4, help="KV cache slots on the stand-in server")
+    parser.add_argument("--prefill-ms", type=float, default=2.0, help="Simulated prefill cost per uncached token")
+    parser.add_argument("--decode-ms", type=float, default=1.0, help="Simulated time per generated token")
+    parser.add_argument("--output-tokens", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    workload = build_workload(args.interns, args.days, args.seed)
+    template = build_followup_template(FORMAT_INSTRUCTIONS)
+
+    results = [
+        await run_layout("legacy (data first)", [legacy_followup_prompt(v) for v in workload], args),
+        await run_layout("stable prefix", [template.render(v) for v in workload], args)
+    ]
+
+    print(f"{len(workload)} follow-up prompts, {args.slots} KV slot(s), {args.prefill_ms} ms/token prefill\n")
+    print(f"{'layout':<22}{'mean TTFT':>12}{'p50':>10}{'p95':>10}{'prefix hit':>12}")
+    for r in results:
+        print(
+            f"{r['layout']:<22}{r['mean_ttft_ms']:>10.1f}ms{r['p50_ttft_ms']:>8.1f}ms"
+            f"{r['p95_ttft_ms']:>8.1f}ms{r['prefix_cache_hit']:>11.0%}"
+        )
+
+    speedup = results[0]["mean_ttft_ms"] / results[1]["mean_ttft_ms"]
+    print(f"\nStable-prefix layout: {speedup:.2f}x faster mean TTFT")
+
+if __name__ == "__main__":
+    asyncio.run(main())
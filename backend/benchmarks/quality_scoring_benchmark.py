@@ -0,0 +1,176 @@
+"""
+Quality-scoring benchmark - per-update CPU time of the old per-component text
+processing vs. the single-pass TextFeatures pipeline
+
+Both scorers run the text-only components (word count, keywords, sentiment,
+structure) over the same synthetic updates, from one-liners to multi-paragraph
+reports, using the same NLP resources. Results are checked to be identical
+before timing. NLTK components that are not installed / provisioned fall back
+exactly as in the service, so run it where NLTK_DATA_DIR is provisioned for
+representative numbers.
+
+Usage (from backend/):
+    python benchmarks/quality_scoring_benchmark.py --updates 500 --rounds 5
+"""
+
+import argparse
+import os
+import random
+import re
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import text_scoring  # noqa: E402
+from nlp_resources import NLPResources  # noqa: E402
+from text_scoring import TextScorer  # noqa: E402
+
+SENTENCES = [
+    "Implemented the login form validation and wired it to the auth API.",
+    "Wrote unit tests for the report export service and fixed two failing cases.",
+    "Refactored the dashboard charts to use the shared data hooks.",
+    "Investigated slow MongoDB queries on the daily records collection.",
+    "Reviewed pull requests and updated the onboarding documentation.",
+    "Still blocked on the staging credentials, which is frustrating.",
+    "Had a great pairing session and learned a lot about async code.",
+    "Next I will finish the CSV import page and handle the error states.",
+    "worked on stuff",
+    "Meeting with the mentor about tomorrow's plans and current progress."
+]
+
+# --- Pre-pipeline implementation (each component re-processes the raw text) ---
+
+class LegacyTextScorer(TextScorer):
+    """The text components as they were before TextFeatures"""
+
+    def score(self, content: str) -> Dict[str, Any]:
+        word_count_score, word_count = self._legacy_word_count(content)
+        keyword_score, keyword_found = self._legacy_keywords(content)
+        sentiment_score, sentiment_polarity, sentiment_label = self._legacy_sentiment(content)
+        structure_score, has_structure = self._legacy_structure(content)
+        return {
+            "word_count": word_count,
+            "word_count_score": word_count_score,
+            "keyword_found": keyword_found,
+            "keyword_score": keyword_score,
+            "sentiment_polarity": sentiment_polarity,
+            "sentiment_label": sentiment_label,
+            "sentiment_score": sentiment_score,
+            "has_structure": has_structure,
+            "structure_score": structure_score
+        }
+
+    def _legacy_word_count(self, content: str) -> Tuple[int, int]:
+        word_count = len(content.split())
+        if word_count >= self.config.WORD_COUNT_OK_THRESHOLD:
+            return 4, word_count
+        elif word_count >= self.config.WORD_COUNT_WEAK_THRESHOLD:
+            return 2, word_count
+        return 0, word_count
+
+    def _legacy_keywords(self, content: str) -> Tuple[int, bool]:
+        if not self.keyword_stems:
+            content_lower = content.lower()
+            for keyword in self.config.QUALITY_KEYWORDS:
+                if keyword.lower() in content_lower:
+                    return 2, True
+            return 0, False
+
+        stemmer = self.nlp.get_stemmer()
+        tokens = self.nlp.tokenize(content.lower())
+        content_stems = {stemmer.stem(token) for token in tokens if token.isalnum()}
+        return (2, True) if content_stems & self.keyword_stems else (0, False)
+
+    def _legacy_sentiment(self, content: str) -> Tuple[int, float, str]:
+        polarity = 0.0
+        sentiment_analyzer = self.nlp.get_sentiment_analyzer()
+        if sentiment_analyzer:
+            polarity = sentiment_analyzer.polarity_scores(content)['compound']
+        elif text_scoring.TEXTBLOB_AVAILABLE:
+            polarity = text_scoring.TextBlob(content).sentiment.polarity
+        return self.sentiment_result(polarity)
+
+    def _legacy_structure(self, content: str) -> Tuple[int, bool]:
+        structure_keywords = [
+            "what i did", "what i worked on", "completed", "tasks",
+            "next", "tomorrow", "plans", "planning",
+            "blockers", "challenges", "issues", "problems",
+            "progress", "status", "update"
+        ]
+        content_lower = content.lower()
+        found_structure_words = 0
+        for keyword in structure_keywords:
+            if keyword in content_lower:
+                found_structure_words += 1
+        has_bullets = bool(re.search(r'[•\-\*\d+\.]', content))
+        has_line_breaks = content.count('\n') >= 2
+        if found_structure_words >= 2 or has_bullets or has_line_breaks:
+            return 1, True
+        return 0, False
+
+# --- Workload ------------------------------------------------------------------
+
+def build_workload(updates: int, seed: int) -> List[str]:
+    """Updates from one sentence to several paragraphs, some with bullets"""
+    rng = random.Random(seed)
+    workload = []
+    for _ in range(updates):
+        paragraphs = []
+        for _ in range(rng.choice([1, 1, 2, 3, 5])):
+            sentences = rng.choices(SENTENCES, k=rng.randint(1, 6))
+            if rng.random() < 0.3:
+                paragraphs.append("\n".join(f"- {sentence}" for sentence in sentences))
+            else:
+                paragraphs.append(" ".join(sentences))
+        workload.append("\n\n".join(paragraphs))
+    return workload
+
+def time_scorer(scorer: TextScorer, workload: List[str], rounds: int) -> List[float]:
+    """CPU microseconds per update, one sample per round"""
+    samples = []
+    for _ in range(rounds):
+        started = time.process_time()
+        for content in workload:
+            scorer.score(content)
+        samples.append((time.process_time() - started) / len(workload) * 1e6)
+    return samples
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--updates", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    nlp = NLPResources(auto_download=False)
+    nlp.warm_up()
+    legacy, pipeline = LegacyTextScorer(nlp), TextScorer(nlp)
+    workload = build_workload(args.updates, args.seed)
+
+    mismatches = sum(legacy.score(content) != pipeline.score(content) for content in workload)
+    if mismatches:
+        sys.exit(f"{mismatches} update(s) scored differently - fix before comparing timings")
+
+    # Warm both (stem cache, regex compilation) before timing
+    time_scorer(legacy, workload, 1)
+    time_scorer(pipeline, workload, 1)
+
+    results = {
+        "legacy": time_scorer(legacy, workload, args.rounds),
+        "single-pass": time_scorer(pipeline, workload, args.rounds)
+    }
+
+    words = statistics.mean(len(content.split()) for content in workload)
+    print(f"{args.updates} updates (mean {words:.0f} words), {args.rounds} rounds")
+    print(f"NLP components: {nlp.get_metrics()['components']}")
+    print(f"{'pipeline':<12} {'median us/update':>17} {'min':>9}")
+    for name, samples in results.items():
+        print(f"{name:<12} {statistics.median(samples):>17.1f} {min(samples):>9.1f}")
+    speedup = statistics.median(results["legacy"]) / statistics.median(results["single-pass"])
+    print(f"speedup: {speedup:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Circuit Breaker - Fast fallback when LM Studio is down or slow
+Opens after consecutive failures or latency-budget breaches, then lets a
+limited number of trial requests through (half-open) before closing again
+"""
+
+import logging
+import time
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Optional
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the breaker is open"""
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"        # Normal operation
+    OPEN = "open"            # Failing - reject immediately
+    HALF_OPEN = "half_open"  # Probing with trial requests
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker with a latency budget
+
+    allow_request() is a cheap check callers use before queueing work;
+    try_acquire() must be called right before the actual call and be paired
+    with record_success() or record_failure().
+    """
+
+    def __init__(
+        self,
+        name: str = "lmstudio",
+        failure_threshold: int = None,
+        latency_budget: float = None,
+        recovery_timeout: float = None,
+        half_open_max_calls: int = None
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold or Config.LLM_BREAKER_FAILURE_THRESHOLD
+        self.latency_budget = latency_budget or Config.LLM_BREAKER_LATENCY_BUDGET
+        self.recovery_timeout = recovery_timeout or Config.LLM_BREAKER_RECOVERY_TIMEOUT
+        self.half_open_max_calls = half_open_max_calls or Config.LLM_BREAKER_HALF_OPEN_TRIALS
+
+        self.state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._half_open_in_flight = 0
+
+        self._last_failure_reason: Optional[str] = None
+        self._last_state_change = datetime.now()
+        self._stats = {
+            "successes": 0,
+            "failures": 0,
+            "latency_breaches": 0,
+            "rejected": 0,
+            "times_opened": 0
+        }
+
+    def _transition(self, new_state: CircuitState) -> None:
+        if new_state == self.state:
+            return
+        logger.warning(f"Circuit breaker '{self.name}': {self.state.value} -> {new_state.value}")
+        self.state = new_state
+        self._last_state_change = datetime.now()
+
+        if new_state == CircuitState.OPEN:
+            self._opened_at = time.monotonic()
+            self._stats["times_opened"] += 1
+        elif new_state == CircuitState.CLOSED:
+            self._consecutive_failures = 0
+            self._opened_at = None
+
+        self._half_open_in_flight = 0
+
+    def _refresh(self) -> None:
+        """Move OPEN -> HALF_OPEN once the recovery timeout has elapsed"""
+        if (
+            self.state == CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self.recovery_timeout
+        ):
+            self._transition(CircuitState.HALF_OPEN)
+
+    def allow_request(self) -> bool:
+        """Cheap pre-check: False while the breaker is open"""
+        self._refresh()
+        if self.state == CircuitState.OPEN:
+            self._stats["rejected"] += 1
+            return False
+        return True
+
+    def try_acquire(self) -> bool:
+        """Claim permission for one real call (limits half-open trials)"""
+        self._refresh()
+        if self.state == CircuitState.CLOSED:
+            return True
+        if self.state == CircuitState.HALF_OPEN and self._half_open_in_flight < self.half_open_max_calls:
+            self._half_open_in_flight += 1
+            return True
+
+        self._stats["rejected"] += 1
+        return False
+
+    def record_success(self, latency: float, latency_budget: float = None) -> None:
+        """
+        Record a completed call; slow calls count against the breaker
+
+        latency_budget overrides the breaker-wide budget for this call, so a
+        long report is not judged by the follow-up question deadline.
+        """
+        budget = latency_budget or self.latency_budget
+        if latency > budget:
+            self._stats["latency_breaches"] += 1
+            self.record_failure(f"latency {latency:.1f}s over budget {budget:.1f}s")
+            return
+
+        self._stats["successes"] += 1
+        self._consecutive_failures = 0
+        if self.state == CircuitState.HALF_OPEN:
+            self._transition(CircuitState.CLOSED)
+
+    def record_failure(self, reason: str = "error") -> None:
+        self._stats["failures"] += 1
+        self._consecutive_failures += 1
+        self._last_failure_reason = reason
+
+        if self.state == CircuitState.HALF_OPEN:
+            # Trial failed - back to open for another recovery period
+            self._transition(CircuitState.OPEN)
+        elif self.state == CircuitState.CLOSED and self._consecutive_failures >= self.failure_threshold:
+            self._transition(CircuitState.OPEN)
+
+    def release(self) -> None:
+        """Give back a half-open trial permit without recording an outcome"""
+        if self.state == CircuitState.HALF_OPEN and self._half_open_in_flight > 0:
+            self._half_open_in_flight -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Breaker state for /health and /stats"""
+        self._refresh()
+        retry_in = None
+        if self.state == CircuitState.OPEN:
+            retry_in = round(max(0.0, self.recovery_timeout - (time.monotonic() - self._opened_at)), 1)
+
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self._consecutive_failures,
+            "failure_threshold": self.failure_threshold,
+            "latency_budget_s": self.latency_budget,
+            "retry_in_s": retry_in,
+            "last_failure_reason": self._last_failure_reason,
+            "last_state_change": self._last_state_change.isoformat(),
+            **self._stats
+        }
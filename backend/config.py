@@ -1,6 +1,6 @@
 import os
 from dotenv import load_dotenv
-from typing import List, Dict
+from typing import List, Dict, Tuple
 
 load_dotenv()
 
@@ -12,6 +12,94 @@ class Config:
     # LM Studio Configuration (replaces all API keys)
     LMSTUDIO_URL = os.getenv("LMSTUDIO_URL", "http://localhost:1234/v1")
     
+    # Multiple LM Studio servers: comma-separated, optional "|weight" per URL
+    # e.g. LMSTUDIO_URLS=http://box1:1234/v1|2,http://box2:1234/v1
+    LMSTUDIO_URLS = os.getenv("LMSTUDIO_URLS", "")
+    LMSTUDIO_EJECT_FAILURES = int(os.getenv("LMSTUDIO_EJECT_FAILURES", "2"))
+    LMSTUDIO_EJECT_SECONDS = float(os.getenv("LMSTUDIO_EJECT_SECONDS", "30"))
+    
+    # LM Studio HTTP transport (pooled keep-alive connections, per-call deadline)
+    LMSTUDIO_TIMEOUT = float(os.getenv("LMSTUDIO_TIMEOUT", "120"))
+    LMSTUDIO_CONNECT_TIMEOUT = float(os.getenv("LMSTUDIO_CONNECT_TIMEOUT", "5"))
+    LMSTUDIO_MAX_CONNECTIONS = int(os.getenv("LMSTUDIO_MAX_CONNECTIONS", "20"))
+    LMSTUDIO_MAX_KEEPALIVE = int(os.getenv("LMSTUDIO_MAX_KEEPALIVE", "10"))
+    
+    # Background health probe (cheap model listing, cached for /health and /stats)
+    LMSTUDIO_HEALTH_INTERVAL = float(os.getenv("LMSTUDIO_HEALTH_INTERVAL", "15"))
+    LMSTUDIO_HEALTH_TIMEOUT = float(os.getenv("LMSTUDIO_HEALTH_TIMEOUT", "3"))
+    
+    # LLM admission scheduler (concurrency cap + max queue wait per priority class, seconds)
+    LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "2"))
+    LLM_QUEUE_TIMEOUT_INTERACTIVE = float(os.getenv("LLM_QUEUE_TIMEOUT_INTERACTIVE", "60"))
+    LLM_QUEUE_TIMEOUT_REPORT = float(os.getenv("LLM_QUEUE_TIMEOUT_REPORT", "600"))
+    LLM_QUEUE_TIMEOUT_BACKGROUND = float(os.getenv("LLM_QUEUE_TIMEOUT_BACKGROUND", "3600"))
+    
+    # LLM response cache (in-memory LRU + optional MongoDB tier)
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "True").lower() == "true"
+    LLM_CACHE_PERSIST = os.getenv("LLM_CACHE_PERSIST", "True").lower() == "true"
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1000"))
+    LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))
+    
+    # Circuit breaker around LM Studio (fast fallback while it is down or slow)
+    LLM_BREAKER_FAILURE_THRESHOLD = int(os.getenv("LLM_BREAKER_FAILURE_THRESHOLD", "3"))
+    LLM_BREAKER_LATENCY_BUDGET = float(os.getenv("LLM_BREAKER_LATENCY_BUDGET", "60"))
+    # Streams are judged on time-to-first-token, not on the length of the whole stream
+    LLM_BREAKER_TTFT_BUDGET = float(os.getenv("LLM_BREAKER_TTFT_BUDGET", "30"))
+    LLM_BREAKER_RECOVERY_TIMEOUT = float(os.getenv("LLM_BREAKER_RECOVERY_TIMEOUT", "30"))
+    LLM_BREAKER_HALF_OPEN_TRIALS = int(os.getenv("LLM_BREAKER_HALF_OPEN_TRIALS", "1"))
+    
+    # Follow-up question generation (JSON-schema output, tight token budget)
+    FOLLOWUP_STRUCTURED_OUTPUT = os.getenv("FOLLOWUP_STRUCTURED_OUTPUT", "True").lower() == "true"
+    FOLLOWUP_STREAMING = os.getenv("FOLLOWUP_STREAMING", "True").lower() == "true"
+    
+    # Generation profiles - model, sampling, budget, deadline and concurrency per task
+    FOLLOWUP_MODEL = os.getenv("FOLLOWUP_MODEL", "local-model")
+    FOLLOWUP_TEMPERATURE = float(os.getenv("FOLLOWUP_TEMPERATURE", "0.7"))
+    FOLLOWUP_MAX_TOKENS = int(os.getenv("FOLLOWUP_MAX_TOKENS", "200"))
+    FOLLOWUP_TIMEOUT = float(os.getenv("FOLLOWUP_TIMEOUT", "30"))
+    FOLLOWUP_LATENCY_BUDGET = float(os.getenv("FOLLOWUP_LATENCY_BUDGET", "20"))
+    FOLLOWUP_CONCURRENCY = int(os.getenv("FOLLOWUP_CONCURRENCY", "2"))
+    
+    REPORT_MODEL = os.getenv("REPORT_MODEL", "local-model")
+    REPORT_TEMPERATURE = float(os.getenv("REPORT_TEMPERATURE", "0.7"))
+    REPORT_MAX_TOKENS = int(os.getenv("REPORT_MAX_TOKENS", "1500"))
+    REPORT_TIMEOUT = float(os.getenv("REPORT_TIMEOUT", "300"))
+    REPORT_LATENCY_BUDGET = float(os.getenv("REPORT_LATENCY_BUDGET", "240"))
+    REPORT_CONCURRENCY = int(os.getenv("REPORT_CONCURRENCY", "1"))
+    
+    SUMMARY_MODEL = os.getenv("SUMMARY_MODEL", "local-model")
+    SUMMARY_TEMPERATURE = float(os.getenv("SUMMARY_TEMPERATURE", "0.3"))
+    SUMMARY_MAX_TOKENS = int(os.getenv("SUMMARY_MAX_TOKENS", "250"))
+    SUMMARY_TIMEOUT = float(os.getenv("SUMMARY_TIMEOUT", "90"))
+    SUMMARY_LATENCY_BUDGET = float(os.getenv("SUMMARY_LATENCY_BUDGET", "75"))
+    SUMMARY_CONCURRENCY = int(os.getenv("SUMMARY_CONCURRENCY", "2"))
+    
+    # Weekly reports: "map_reduce" summarizes each day then combines, "single" sends one prompt
+    WEEKLY_REPORT_MODE = os.getenv("WEEKLY_REPORT_MODE", "map_reduce").lower()
+    # Longer ranges roll day summaries up into week and month summaries
+    REPORT_HIERARCHY_MIN_DAYS = int(os.getenv("REPORT_HIERARCHY_MIN_DAYS", "15"))
+    
+    # Background report jobs (POST /api/reports/jobs)
+    REPORT_JOB_WORKERS = int(os.getenv("REPORT_JOB_WORKERS", "2"))
+    REPORT_JOB_POLL_INTERVAL = float(os.getenv("REPORT_JOB_POLL_INTERVAL", "5"))
+    REPORT_JOB_HEARTBEAT_SECONDS = float(os.getenv("REPORT_JOB_HEARTBEAT_SECONDS", "30"))
+    REPORT_JOB_STALE_SECONDS = float(os.getenv("REPORT_JOB_STALE_SECONDS", "120"))
+    REPORT_JOB_MAX_ATTEMPTS = int(os.getenv("REPORT_JOB_MAX_ATTEMPTS", "3"))
+    # Seconds before a failed attempt is retried, multiplied by the attempt number
+    REPORT_JOB_RETRY_DELAY = float(os.getenv("REPORT_JOB_RETRY_DELAY", "30"))
+    REPORT_JOB_RETENTION_DAYS = int(os.getenv("REPORT_JOB_RETENTION_DAYS", "7"))
+    
+    # Nightly cohort-wide weekly report batch (stored so morning views are reads)
+    REPORT_BATCH_ENABLED = os.getenv("REPORT_BATCH_ENABLED", "True").lower() == "true"
+    REPORT_BATCH_HOUR = int(os.getenv("REPORT_BATCH_HOUR", "2"))
+    REPORT_BATCH_DAYS = int(os.getenv("REPORT_BATCH_DAYS", "7"))
+    REPORT_BATCH_CONCURRENCY = int(os.getenv("REPORT_BATCH_CONCURRENCY", "2"))
+    
+    # Prompt budgets (approximate tokens) - bounds prefill time for verbose interns
+    PROMPT_BUDGET_FOLLOWUP = int(os.getenv("PROMPT_BUDGET_FOLLOWUP", "1500"))
+    PROMPT_BUDGET_WEEKLY_REPORT = int(os.getenv("PROMPT_BUDGET_WEEKLY_REPORT", "3000"))
+    PROMPT_MIN_ENTRY_TOKENS = int(os.getenv("PROMPT_MIN_ENTRY_TOKENS", "24"))
+    
     # Application Configuration
     SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")
     DEBUG = os.getenv("DEBUG", "False").lower() == "true"
@@ -21,6 +109,11 @@ class Config:
     TEMP_WORK_UPDATES_COLLECTION = "temp_work_updates"
     FOLLOWUP_SESSIONS_COLLECTION = "followup_sessions"
     DAILY_RECORDS_COLLECTION = "dailyrecords"
+    LLM_CACHE_COLLECTION = "llm_response_cache"
+    DAY_SUMMARIES_COLLECTION = "day_summaries"
+    PERIOD_SUMMARIES_COLLECTION = "period_summaries"
+    REPORT_JOBS_COLLECTION = "report_jobs"
+    WEEKLY_REPORTS_COLLECTION = "weekly_reports"
     
     # Quality Scoring Configuration
     QUALITY_SCORE_THRESHOLD = float(os.getenv("QUALITY_SCORE_THRESHOLD", "6.0"))
@@ -49,6 +142,35 @@ class Config:
     NEGATIVE_SENTIMENT_THRESHOLD = float(os.getenv("NEGATIVE_SENTIMENT_THRESHOLD", "-0.3"))
     POSITIVE_SENTIMENT_THRESHOLD = float(os.getenv("POSITIVE_SENTIMENT_THRESHOLD", "0.2"))
     
+    # NLTK data (tokenizer + VADER lexicon) is read from this directory, never
+    # downloaded at import; provision it with `python nlp_resources.py`
+    NLTK_DATA_DIR = os.getenv("NLTK_DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "nltk_data"))
+    NLTK_AUTO_DOWNLOAD = os.getenv("NLTK_AUTO_DOWNLOAD", "False").lower() == "true"
+    NLP_WARMUP_ON_STARTUP = os.getenv("NLP_WARMUP_ON_STARTUP", "True").lower() == "true"
+    
+    # Where CPU-bound text scoring runs: "thread", "process" (warm NLTK per worker) or "inline"
+    QUALITY_SCORING_EXECUTOR = os.getenv("QUALITY_SCORING_EXECUTOR", "thread")
+    QUALITY_SCORING_WORKERS = int(os.getenv("QUALITY_SCORING_WORKERS", "2"))
+    
+    # Batch quality scoring (/api/quality/analyze-batch)
+    QUALITY_BATCH_MAX_ITEMS = int(os.getenv("QUALITY_BATCH_MAX_ITEMS", "5000"))
+    QUALITY_BATCH_SENTIMENT_CHUNK = int(os.getenv("QUALITY_BATCH_SENTIMENT_CHUNK", "200"))
+    
+    @classmethod
+    def get_lmstudio_backends(cls) -> List[Tuple[str, float]]:
+        """(url, weight) for every configured LM Studio server"""
+        if not cls.LMSTUDIO_URLS.strip():
+            return [(cls.LMSTUDIO_URL, 1.0)]
+        
+        backends = []
+        for entry in cls.LMSTUDIO_URLS.split(","):
+            entry = entry.strip()
+            if not entry:
+                continue
+            url, _, weight = entry.partition("|")
+            backends.append((url.strip(), float(weight) if weight.strip() else 1.0))
+        return backends
+    
     @classmethod
     def validate_config_simplified(cls):
         """Validate required configuration"""
@@ -68,6 +190,7 @@ class Config:
             "cost_per_request": 0.0,
             "rate_limits": "Hardware limited only",
             "server_url": cls.LMSTUDIO_URL,
+            "server_urls": [url for url, _ in cls.get_lmstudio_backends()],
             "authentication_method": "user_id_in_request_field"
         }
 
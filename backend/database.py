@@ -97,6 +97,16 @@ async def create_clean_indexes():
         await work_updates.create_index([("internId", 1), ("followupCompleted", 1)], sparse=True, name="internId_followupCompleted_clean")
         await work_updates.create_index([("followupCompleted", 1), ("submittedAt", DESCENDING)], name="followupCompleted_submittedAt_clean")
         
+        # Daily records - covers the nightly report batch's distinct internId lookup by date range
+        daily_records = database.database[Config.DAILY_RECORDS_COLLECTION]
+        await daily_records.create_index([("date", 1), ("internId", 1)], sparse=True, name="dailyrecords_date_internId_clean")
+        try:
+            # Earlier builds created this index on work_updates, where nothing queries it
+            await work_updates.drop_index("date_internId_clean")
+            logger.info("Dropped unused index 'date_internId_clean' from work_updates")
+        except Exception:
+            pass
+        
         # Temporary work updates indexes
         temp_work_updates = database.database[TEMP_WORK_UPDATES_COLLECTION]
         await temp_work_updates.create_index("internId", sparse=True, name="temp_internId_1_clean")
@@ -122,6 +132,38 @@ async def create_clean_indexes():
             ("createdAt", DESCENDING)
         ], sparse=True, name="sessions_internId_status_createdAt_clean")
         
+        # LLM response cache - entries expire at their own expiresAt
+        llm_cache = database.database[Config.LLM_CACHE_COLLECTION]
+        await llm_cache.create_index("expiresAt", expireAfterSeconds=0, name="llm_cache_expiresAt_ttl")
+        
+        # Per-day report summaries (keyed by content hash, looked up by intern and date)
+        day_summaries = database.database[Config.DAY_SUMMARIES_COLLECTION]
+        await day_summaries.create_index([("internId", 1), ("date", 1)], name="day_summaries_internId_date_clean")
+        
+        # Week / month roll-up summaries for hierarchical reports
+        period_summaries = database.database[Config.PERIOD_SUMMARIES_COLLECTION]
+        await period_summaries.create_index(
+            [("internId", 1), ("level", 1), ("periodStart", 1)], 
+            name="period_summaries_internId_level_periodStart_clean"
+        )
+        
+        # Stored reports - invalidated by intern and covered date when records change
+        weekly_reports = database.database[Config.WEEKLY_REPORTS_COLLECTION]
+        await weekly_reports.create_index(
+            [("internId", 1), ("startDate", 1), ("endDate", 1)], 
+            name="weekly_reports_internId_range_clean"
+        )
+        
+        # Background report jobs - claim order, stale-claim recovery, expiry of finished jobs
+        report_jobs = database.database[Config.REPORT_JOBS_COLLECTION]
+        await report_jobs.create_index([("status", 1), ("createdAt", 1)], name="report_jobs_status_createdAt_clean")
+        await report_jobs.create_index([("status", 1), ("heartbeatAt", 1)], name="report_jobs_status_heartbeatAt_clean")
+        await report_jobs.create_index(
+            "finishedAt", 
+            expireAfterSeconds=Config.REPORT_JOB_RETENTION_DAYS * 86400, 
+            name="report_jobs_finishedAt_ttl"
+        )
+        
         logger.info("Clean database indexes created successfully")
         
     except Exception as e:
@@ -308,6 +350,24 @@ async def get_temp_work_update(temp_id: str) -> dict:
         logger.error(f"Failed to get temp work update: {e}")
         return None
 
+async def update_temp_work_update(temp_id: str, fields: dict, generation_id: str = None) -> bool:
+    """
+    Set fields on a temporary work update
+
+    With generation_id, only updates the record if it still belongs to that
+    question generation (a same-day resubmission replaces it with a new one)
+    """
+    try:
+        temp_collection = get_temp_collection()
+        query = {"_id": ObjectId(temp_id)}
+        if generation_id is not None:
+            query["questionGenerationId"] = generation_id
+        result = await temp_collection.update_one(query, {"$set": fields})
+        return result.matched_count > 0
+    except Exception as e:
+        logger.error(f"Failed to update temp work update: {e}")
+        return False
+
 async def delete_temp_work_update(temp_id: str) -> bool:
     """Delete temporary work update"""
     try:
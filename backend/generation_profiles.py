@@ -0,0 +1,95 @@
+"""
+Generation Profiles - Per-task model routing for LM Studio
+Short interactive work (follow-up questions), per-day report summaries and
+long reports each get their own model, sampling settings, token budget,
+deadline, concurrency limit and circuit-breaker latency budget
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class GenerationProfile:
+    """Named set of generation settings selected by task"""
+
+    def __init__(
+        self,
+        name: str,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        timeout: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+        latency_budget: Optional[float] = None
+    ):
+        self.name = name
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        # Calls slower than this count as breaker failures (None = breaker default)
+        self.latency_budget = latency_budget
+
+    def request_options(self) -> Dict[str, Any]:
+        """Client arguments for this profile (None means client default)"""
+        return {
+            "model": self.model,
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            "timeout": self.timeout
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            **self.request_options(),
+            "max_concurrency": self.max_concurrency,
+            "latency_budget": self.latency_budget
+        }
+
+# Profile names used by the services
+DEFAULT_PROFILE = "default"
+FOLLOWUP_PROFILE = "followup"
+REPORT_PROFILE = "report"
+SUMMARY_PROFILE = "summary"
+
+def load_generation_profiles() -> Dict[str, GenerationProfile]:
+    """Build the profiles from configuration"""
+    profiles = {
+        DEFAULT_PROFILE: GenerationProfile(DEFAULT_PROFILE),
+        FOLLOWUP_PROFILE: GenerationProfile(
+            FOLLOWUP_PROFILE,
+            model=Config.FOLLOWUP_MODEL,
+            temperature=Config.FOLLOWUP_TEMPERATURE,
+            max_tokens=Config.FOLLOWUP_MAX_TOKENS,
+            timeout=Config.FOLLOWUP_TIMEOUT,
+            max_concurrency=Config.FOLLOWUP_CONCURRENCY,
+            latency_budget=Config.FOLLOWUP_LATENCY_BUDGET
+        ),
+        REPORT_PROFILE: GenerationProfile(
+            REPORT_PROFILE,
+            model=Config.REPORT_MODEL,
+            temperature=Config.REPORT_TEMPERATURE,
+            max_tokens=Config.REPORT_MAX_TOKENS,
+            timeout=Config.REPORT_TIMEOUT,
+            max_concurrency=Config.REPORT_CONCURRENCY,
+            latency_budget=Config.REPORT_LATENCY_BUDGET
+        ),
+        SUMMARY_PROFILE: GenerationProfile(
+            SUMMARY_PROFILE,
+            model=Config.SUMMARY_MODEL,
+            temperature=Config.SUMMARY_TEMPERATURE,
+            max_tokens=Config.SUMMARY_MAX_TOKENS,
+            timeout=Config.SUMMARY_TIMEOUT,
+            max_concurrency=Config.SUMMARY_CONCURRENCY,
+            latency_budget=Config.SUMMARY_LATENCY_BUDGET
+        )
+    }
+
+    for profile in profiles.values():
+        logger.info(f"Generation profile loaded: {profile.to_dict()}")
+    return profiles
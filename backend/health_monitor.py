@@ -0,0 +1,119 @@
+"""
+Health Monitor - Cached LM Studio and MongoDB status
+Probes run in the background so /health and /stats answer from memory
+instead of running a model generation per request
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+from config import Config
+from database import get_database
+from ai_client import AIProviderManager
+
+logger = logging.getLogger(__name__)
+
+class HealthMonitor:
+    """
+    Periodically probes LM Studio (model listing) and MongoDB (ping)
+    and keeps the latest result in memory
+    """
+
+    def __init__(self, provider_manager: AIProviderManager, interval: float = None):
+        self.provider_manager = provider_manager
+        self.interval = interval or Config.LMSTUDIO_HEALTH_INTERVAL
+
+        self._status: Dict[str, Any] = {
+            "lm_studio": {"status": "unknown", "backends": {}, "checked_at": None},
+            "database": {"status": "unknown", "checked_at": None}
+        }
+
+    async def probe_once(self) -> Dict[str, Any]:
+        """Run one round of probes and update the cached status"""
+        lmstudio_result, database_result = await asyncio.gather(
+            self._probe_lmstudio(),
+            self._probe_database()
+        )
+
+        # Swap in new dicts so readers never see a half-updated status
+        self._status = {
+            "lm_studio": lmstudio_result,
+            "database": database_result
+        }
+        return self._status
+
+    async def _probe_lmstudio(self) -> Dict[str, Any]:
+        try:
+            backends = await self.provider_manager.check_all_liveness()
+            online = any(b.get("status") == "online" for b in backends.values())
+            return {
+                "status": "connected" if online else "offline",
+                "backends": backends,
+                "checked_at": datetime.now().isoformat()
+            }
+        except Exception as e:
+            logger.warning(f"LM Studio health probe failed: {e}")
+            return {
+                "status": "offline",
+                "error": str(e),
+                "backends": {},
+                "checked_at": datetime.now().isoformat()
+            }
+
+    async def _probe_database(self) -> Dict[str, Any]:
+        try:
+            await asyncio.wait_for(
+                get_database().command("ping"),
+                timeout=Config.LMSTUDIO_HEALTH_TIMEOUT
+            )
+            return {"status": "connected", "checked_at": datetime.now().isoformat()}
+        except Exception as e:
+            logger.warning(f"Database health probe failed: {e}")
+            return {
+                "status": "disconnected",
+                "error": str(e),
+                "checked_at": datetime.now().isoformat()
+            }
+
+    async def run(self) -> None:
+        """Background probe loop"""
+        while True:
+            try:
+                await self.probe_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Health probe error: {e}")
+            await asyncio.sleep(self.interval)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Latest cached status (no I/O)"""
+        return self._status
+
+    @property
+    def lmstudio_ok(self) -> bool:
+        return self._status["lm_studio"].get("status") == "connected"
+
+    @property
+    def database_ok(self) -> bool:
+        return self._status["database"].get("status") == "connected"
+
+# Global health monitor instance
+health_monitor: Optional[HealthMonitor] = None
+
+def initialize_health_monitor(provider_manager: AIProviderManager) -> HealthMonitor:
+    """Initialize the global health monitor"""
+    global health_monitor
+
+    health_monitor = HealthMonitor(provider_manager)
+    logger.info(f"Health monitor initialized (probe interval: {health_monitor.interval}s)")
+    return health_monitor
+
+def get_health_monitor() -> HealthMonitor:
+    """Get the global health monitor instance"""
+    if health_monitor is None:
+        raise RuntimeError("Health monitor not initialized. Call initialize_health_monitor() first")
+
+    return health_monitor
@@ -0,0 +1,230 @@
+"""
+LLM Response Cache - Content-addressed cache in front of LM Studio
+In-memory LRU tier with TTL expiry, plus an optional MongoDB tier that
+survives restarts (expired documents are removed by a TTL index).
+Also provides single-flight coalescing of identical in-flight generations.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse whitespace so formatting-only differences share a cache entry"""
+    return _WHITESPACE_RE.sub(" ", prompt).strip()
+
+def make_cache_key(prompt: str, params: Dict[str, Any]) -> str:
+    """SHA-256 of the normalized prompt and the generation parameters"""
+    payload = json.dumps(
+        {"prompt": normalize_prompt(prompt), "params": params},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class LLMResponseCache:
+    """
+    Two-tier response cache: in-memory LRU (microsecond hits) backed by an
+    optional MongoDB collection
+    """
+
+    def __init__(
+        self,
+        max_entries: int = None,
+        ttl_seconds: float = None,
+        collection=None
+    ):
+        self.max_entries = max_entries or Config.LLM_CACHE_MAX_ENTRIES
+        self.ttl_seconds = ttl_seconds or Config.LLM_CACHE_TTL_SECONDS
+        self.collection = collection
+
+        # key -> (expires_at monotonic, response)
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+        self._stats = {
+            "memory_hits": 0,
+            "persistent_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "expired": 0,
+            "persistent_errors": 0
+        }
+
+        logger.info(
+            f"LLM response cache initialized (max {self.max_entries} entries, "
+            f"TTL {self.ttl_seconds}s, persistent: {collection is not None})"
+        )
+
+    async def get(self, key: str) -> Optional[str]:
+        """Look up a response, memory first then MongoDB"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, response = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return response
+
+            del self._entries[key]
+            self._stats["expired"] += 1
+
+        if self.collection is not None:
+            try:
+                doc = await self.collection.find_one({
+                    "_id": key,
+                    "expiresAt": {"$gt": datetime.now()}
+                })
+                if doc:
+                    remaining = (doc["expiresAt"] - datetime.now()).total_seconds()
+                    self._store_in_memory(key, doc["response"], remaining)
+                    self._stats["persistent_hits"] += 1
+                    return doc["response"]
+            except Exception as e:
+                self._stats["persistent_errors"] += 1
+                logger.warning(f"LLM cache lookup failed: {e}")
+
+        self._stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, response: str) -> None:
+        """Store a response in both tiers"""
+        self._store_in_memory(key, response, self.ttl_seconds)
+        self._stats["stores"] += 1
+
+        if self.collection is not None:
+            try:
+                now = datetime.now()
+                await self.collection.replace_one(
+                    {"_id": key},
+                    {
+                        "_id": key,
+                        "response": response,
+                        "createdAt": now,
+                        "expiresAt": now + timedelta(seconds=self.ttl_seconds)
+                    },
+                    upsert=True
+                )
+            except Exception as e:
+                self._stats["persistent_errors"] += 1
+                logger.warning(f"LLM cache store failed: {e}")
+
+    def _store_in_memory(self, key: str, response: str, ttl_seconds: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl_seconds, response)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        hits = self._stats["memory_hits"] + self._stats["persistent_hits"]
+        lookups = hits + self._stats["misses"]
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "persistent": self.collection is not None,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            **self._stats
+        }
+
+
+class _InFlightCall:
+    """A shared generation and the callers waiting on it"""
+
+    __slots__ = ("task", "waiters", "disconnect_checks", "unchecked_waiters")
+
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.waiters = 0
+        self.disconnect_checks: List[Callable[[], Awaitable[bool]]] = []
+        self.unchecked_waiters = 0
+
+    async def all_disconnected(self) -> bool:
+        """True only when every waiting caller's client has gone away"""
+        if self.unchecked_waiters > 0 or not self.disconnect_checks:
+            return False
+        for check in list(self.disconnect_checks):
+            if not await check():
+                return False
+        return True
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key onto one shared task
+
+    The shared task is shielded from individual callers: a follower (or the
+    leader) being cancelled only detaches that caller. The task itself is
+    cancelled once no caller is left waiting on it.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _InFlightCall] = {}
+        self._stats = {"leaders": 0, "coalesced": 0, "abandoned": 0}
+
+    async def do(
+        self,
+        key: str,
+        func: Callable[[Callable[[], Awaitable[bool]]], Awaitable[Any]],
+        is_disconnected: Callable[[], Awaitable[bool]] = None
+    ) -> Any:
+        """
+        Run func once per key among concurrent callers
+
+        func receives a disconnect check that reports True only when all
+        callers sharing the call have disconnected.
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = _InFlightCall()
+            call.task = asyncio.create_task(func(call.all_disconnected))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            self._stats["leaders"] += 1
+        else:
+            self._stats["coalesced"] += 1
+
+        call.waiters += 1
+        if is_disconnected is not None:
+            call.disconnect_checks.append(is_disconnected)
+        else:
+            call.unchecked_waiters += 1
+
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if is_disconnected is not None:
+                call.disconnect_checks.remove(is_disconnected)
+            else:
+                call.unchecked_waiters -= 1
+
+            if call.waiters == 0 and not call.task.done():
+                # Nobody wants the result any more - free the model slot
+                self._forget(key, call)
+                call.task.cancel()
+                self._stats["abandoned"] += 1
+
+    def _forget(self, key: str, call: _InFlightCall) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._calls),
+            **self._stats
+        }
@@ -0,0 +1,297 @@
+"""
+LLM Scheduler - Priority-aware admission control in front of LM Studio
+Caps concurrent generations (overall and per generation profile), serves
+interactive follow-ups before weekly reports and background jobs, and
+round-robins between interns within a class
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class Priority(IntEnum):
+    """Priority classes - lower value is served first"""
+    INTERACTIVE = 0  # Follow-up questions an intern is waiting on
+    REPORT = 1       # Weekly reports requested by a supervisor
+    BACKGROUND = 2   # Batch / pre-generation work nobody is waiting on
+
+class SchedulerDropped(Exception):
+    """Queued work was dropped before it got a generation slot"""
+
+    def __init__(self, reason: str):
+        super().__init__(f"LLM request dropped from queue: {reason}")
+        self.reason = reason
+
+class _Ticket:
+    """A queued request waiting for a generation slot"""
+
+    __slots__ = ("priority", "intern_id", "profile", "enqueued_at", "deadline", "future")
+
+    def __init__(self, priority: Priority, intern_id: str, profile: str, deadline: Optional[float]):
+        self.priority = priority
+        self.intern_id = intern_id
+        self.profile = profile
+        self.enqueued_at = time.monotonic()
+        self.deadline = deadline
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+class LLMScheduler:
+    """
+    Admission scheduler with a concurrency cap, optional per-profile caps,
+    strict priority between classes and per-intern round-robin fairness
+    inside a class
+    """
+
+    def __init__(
+        self, 
+        max_concurrency: int = None, 
+        poll_interval: float = 0.5,
+        profile_limits: Dict[str, int] = None
+    ):
+        self.max_concurrency = max_concurrency or Config.LLM_MAX_CONCURRENCY
+        self.poll_interval = poll_interval
+        self.profile_limits = {name: limit for name, limit in (profile_limits or {}).items() if limit}
+
+        self._in_flight = 0
+        self._profile_in_flight: Dict[str, int] = {}
+        # priority -> intern_id -> FIFO of tickets (OrderedDict gives round-robin order)
+        self._queues: Dict[Priority, "OrderedDict[str, Deque[_Ticket]]"] = {
+            priority: OrderedDict() for priority in Priority
+        }
+
+        self._stats = {
+            priority: {
+                "granted": 0,
+                "dropped_deadline": 0,
+                "dropped_disconnected": 0,
+                "cancelled": 0,
+                "total_wait_s": 0.0,
+                "max_wait_s": 0.0
+            }
+            for priority in Priority
+        }
+
+        logger.info(f"LLM scheduler initialized (max concurrency: {self.max_concurrency})")
+
+    @staticmethod
+    def default_queue_timeout(priority: Priority) -> float:
+        """Default time a request may wait in the queue for its class"""
+        return {
+            Priority.INTERACTIVE: Config.LLM_QUEUE_TIMEOUT_INTERACTIVE,
+            Priority.REPORT: Config.LLM_QUEUE_TIMEOUT_REPORT,
+            Priority.BACKGROUND: Config.LLM_QUEUE_TIMEOUT_BACKGROUND
+        }[priority]
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        priority: Priority = Priority.INTERACTIVE,
+        intern_id: str = "",
+        queue_timeout: float = None,
+        is_disconnected: Callable[[], Awaitable[bool]] = None,
+        profile: str = "default"
+    ):
+        """
+        Hold a generation slot for the duration of the block
+
+        Raises:
+            SchedulerDropped: if the queue deadline passed or the client went away
+        """
+        await self._acquire(priority, intern_id, queue_timeout, is_disconnected, profile)
+        try:
+            yield
+        finally:
+            self._release(profile)
+
+    async def run(
+        self,
+        func: Callable[[], Awaitable[Any]],
+        priority: Priority = Priority.INTERACTIVE,
+        intern_id: str = "",
+        queue_timeout: float = None,
+        is_disconnected: Callable[[], Awaitable[bool]] = None,
+        profile: str = "default"
+    ) -> Any:
+        """Run func() once a slot is granted"""
+        async with self.slot(priority, intern_id, queue_timeout, is_disconnected, profile):
+            return await func()
+
+    async def _acquire(
+        self,
+        priority: Priority,
+        intern_id: str,
+        queue_timeout: Optional[float],
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]],
+        profile: str
+    ) -> None:
+        if queue_timeout is None:
+            queue_timeout = self.default_queue_timeout(priority)
+        deadline = time.monotonic() + queue_timeout if queue_timeout > 0 else None
+
+        ticket = _Ticket(priority, intern_id or "anonymous", profile, deadline)
+
+        # Fast path: free slot and nobody waiting
+        if (
+            self._in_flight < self.max_concurrency 
+            and self.queue_depth == 0 
+            and self._profile_has_capacity(profile)
+        ):
+            self._grant(ticket)
+            return
+
+        self._queues[priority].setdefault(ticket.intern_id, deque()).append(ticket)
+        self._dispatch()
+
+        try:
+            await self._wait_for_grant(ticket, is_disconnected)
+        except BaseException:
+            if ticket.future.done() and not ticket.future.cancelled() and ticket.future.exception() is None:
+                # Slot was granted just as we were cancelled - hand it back
+                self._release(profile)
+            elif not ticket.future.done():
+                ticket.future.cancel()
+                self._stats[priority]["cancelled"] += 1
+            raise
+
+    async def _wait_for_grant(
+        self,
+        ticket: _Ticket,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]]
+    ) -> None:
+        """Wait for dispatch, dropping the ticket if its deadline passes or the client leaves"""
+        stats = self._stats[ticket.priority]
+
+        while True:
+            try:
+                await asyncio.wait_for(asyncio.shield(ticket.future), timeout=self.poll_interval)
+                return
+            except asyncio.TimeoutError:
+                pass
+
+            if ticket.deadline is not None and time.monotonic() >= ticket.deadline:
+                stats["dropped_deadline"] += 1
+                ticket.future.cancel()
+                raise SchedulerDropped("queue deadline exceeded")
+
+            if is_disconnected is not None and await is_disconnected():
+                stats["dropped_disconnected"] += 1
+                ticket.future.cancel()
+                raise SchedulerDropped("client disconnected")
+
+    def _profile_has_capacity(self, profile: str) -> bool:
+        limit = self.profile_limits.get(profile)
+        return limit is None or self._profile_in_flight.get(profile, 0) < limit
+
+    def _discard_dead_head(self, tickets: Deque[_Ticket], now: float) -> None:
+        """Drop cancelled or expired tickets from the front of an intern's queue"""
+        while tickets:
+            ticket = tickets[0]
+            if ticket.future.done():
+                tickets.popleft()  # Cancelled or dropped while queued
+            elif ticket.deadline is not None and now >= ticket.deadline:
+                tickets.popleft()
+                self._stats[ticket.priority]["dropped_deadline"] += 1
+                ticket.future.set_exception(SchedulerDropped("queue deadline exceeded"))
+                # Waiter may already be gone - don't leave the exception unretrieved
+                ticket.future.exception()
+            else:
+                return
+
+    def _next_ticket(self) -> Optional[_Ticket]:
+        """
+        Pop the next live ticket: highest priority, round-robin across interns,
+        skipping interns whose next request's profile is at its limit
+        """
+        now = time.monotonic()
+
+        for priority in Priority:
+            queue = self._queues[priority]
+            for intern_id in list(queue.keys()):
+                tickets = queue[intern_id]
+                self._discard_dead_head(tickets, now)
+
+                if not tickets:
+                    del queue[intern_id]
+                    continue
+                if not self._profile_has_capacity(tickets[0].profile):
+                    continue
+
+                ticket = tickets.popleft()
+                if tickets:
+                    queue.move_to_end(intern_id)
+                else:
+                    del queue[intern_id]
+                return ticket
+        return None
+
+    def _dispatch(self) -> None:
+        while self._in_flight < self.max_concurrency:
+            ticket = self._next_ticket()
+            if ticket is None:
+                return
+            self._grant(ticket)
+
+    def _grant(self, ticket: _Ticket) -> None:
+        self._in_flight += 1
+        self._profile_in_flight[ticket.profile] = self._profile_in_flight.get(ticket.profile, 0) + 1
+
+        waited = time.monotonic() - ticket.enqueued_at
+        stats = self._stats[ticket.priority]
+        stats["granted"] += 1
+        stats["total_wait_s"] += waited
+        stats["max_wait_s"] = max(stats["max_wait_s"], waited)
+
+        if not ticket.future.done():
+            ticket.future.set_result(None)
+
+    def _release(self, profile: str) -> None:
+        self._in_flight -= 1
+        self._profile_in_flight[profile] -= 1
+        self._dispatch()
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(
+            len(tickets)
+            for queue in self._queues.values()
+            for tickets in queue.values()
+        )
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Queue depth, in-flight count and wait-time metrics per priority class"""
+        classes = {}
+        for priority in Priority:
+            stats = self._stats[priority]
+            granted = stats["granted"]
+            classes[priority.name.lower()] = {
+                "queued": sum(len(t) for t in self._queues[priority].values()),
+                "waiting_interns": len(self._queues[priority]),
+                "granted": granted,
+                "dropped_deadline": stats["dropped_deadline"],
+                "dropped_disconnected": stats["dropped_disconnected"],
+                "cancelled": stats["cancelled"],
+                "avg_wait_ms": round(stats["total_wait_s"] / granted * 1000, 1) if granted else 0.0,
+                "max_wait_ms": round(stats["max_wait_s"] * 1000, 1)
+            }
+
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self._in_flight,
+            "queue_depth": self.queue_depth,
+            "classes": classes,
+            "profiles": {
+                profile: {
+                    "in_flight": self._profile_in_flight.get(profile, 0),
+                    "max_concurrency": limit
+                }
+                for profile, limit in self.profile_limits.items()
+            }
+        }
@@ -2,13 +2,15 @@ from dotenv import load_dotenv
 load_dotenv()
 
 import uuid
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from contextlib import asynccontextmanager
 import logging
 from datetime import datetime, timedelta
 from bson import ObjectId
 import asyncio
+import json
 from config import Config
 
 from database import (
@@ -16,13 +18,19 @@ from database import (
     create_temp_work_update, get_temp_work_update, delete_temp_work_update,
     cleanup_abandoned_temp_updates, get_database_stats, verify_ttl_index
 )
-from ai_service import AIFollowupService
-from quality_score import initialize_quality_scorer, get_quality_scorer
+from ai_service import (
+    AIFollowupService, initialize_ai_service, get_followup_service, close_ai_service,
+    whole_day_range
+)
+from quality_score import initialize_quality_scorer, get_quality_scorer, close_quality_scorer
+from nlp_resources import initialize_nlp_resources, get_nlp_resources
+from health_monitor import initialize_health_monitor, get_health_monitor
+from report_jobs import initialize_report_jobs, get_report_jobs, format_job
 from models import (
     GenerateQuestionsRequest, FollowupAnswersUpdate, TestAIResponse,
     WorkUpdateCreate, SessionStatus, WorkStatus,
-    QualityAnalysisRequest, QualityAnalysisResponse, 
-    WeeklyReportRequest, WeeklyReportResponse
+    QualityAnalysisRequest, QualityAnalysisResponse, QualityBatchRequest, QualityBatchResponse,
+    WeeklyReportRequest, WeeklyReportResponse, PeriodReportRequest, ReportJobRequest
 )
 
 logging.basicConfig(
@@ -32,6 +40,9 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 cleanup_task = None
+health_task = None
+report_batch_task = None
+nlp_warmup_task = None
 
 async def scheduled_cleanup_task():
     while True:
@@ -46,15 +57,45 @@ async def scheduled_cleanup_task():
             logger.error(f"Cleanup error: {e}")
         await asyncio.sleep(3600)
 
+async def scheduled_report_batch_task():
+    """Generate every active intern's weekly report off-peak, once a night"""
+    while True:
+        now = datetime.now()
+        next_run = now.replace(hour=Config.REPORT_BATCH_HOUR, minute=0, second=0, microsecond=0)
+        if next_run <= now:
+            next_run += timedelta(days=1)
+        await asyncio.sleep((next_run - now).total_seconds())
+        
+        try:
+            # Same range a supervisor's default /api/reports/weekly request resolves to
+            now = datetime.now()
+            start, end = whole_day_range(now - timedelta(days=Config.REPORT_BATCH_DAYS), now)
+            logger.info("Running nightly weekly report batch...")
+            await get_followup_service().generate_cohort_weekly_reports(start, end)
+        except Exception as e:
+            logger.error(f"Report batch error: {e}")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global cleanup_task
+    global cleanup_task, health_task, report_batch_task, nlp_warmup_task
     try:
         Config.validate_config_simplified()
         await connect_to_mongo()
+        nlp = initialize_nlp_resources()
         initialize_quality_scorer()
+        get_quality_scorer().executor.warm_up()
+        ai_service = initialize_ai_service()
+        monitor = initialize_health_monitor(ai_service.provider_manager)
+        report_jobs = initialize_report_jobs(ai_service)
         
         cleanup_task = asyncio.create_task(scheduled_cleanup_task())
+        health_task = asyncio.create_task(monitor.run())
+        await report_jobs.start()
+        if Config.REPORT_BATCH_ENABLED:
+            report_batch_task = asyncio.create_task(scheduled_report_batch_task())
+        if Config.NLP_WARMUP_ON_STARTUP:
+            # Load tokenizer/VADER off the event loop; requests arriving first load on demand
+            nlp_warmup_task = asyncio.create_task(asyncio.to_thread(nlp.warm_up))
         
         config_summary = Config.get_api_key_summary()
         logger.info(f"System: {config_summary['ai_provider']}")
@@ -68,6 +109,15 @@ async def lifespan(app: FastAPI):
     
     if cleanup_task:
         cleanup_task.cancel()
+    if health_task:
+        health_task.cancel()
+    if report_batch_task:
+        report_batch_task.cancel()
+    if nlp_warmup_task:
+        nlp_warmup_task.cancel()
+    await get_report_jobs().stop()
+    await close_ai_service()
+    close_quality_scorer()
     await close_mongo_connection()
 
 app = FastAPI(
@@ -87,9 +137,9 @@ app.add_middleware(
 
 async def get_ai_service() -> AIFollowupService:
     try:
-        return AIFollowupService()
+        return get_followup_service()
     except Exception as e:
-        logger.error(f"AI service init failed: {e}")
+        logger.error(f"AI service unavailable: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/")
@@ -106,20 +156,32 @@ async def root():
     }
 
 @app.get("/health")
-async def health_check():
+async def health_check(ai_service: AIFollowupService = Depends(get_ai_service)):
+    # Answered from the background prober's cache - no model call, no DB round trip
     try:
-        db = get_database()
-        await db.command("ping")
-        
-        ai_service = AIFollowupService()
-        lmstudio_test = await ai_service.test_ai_connection()
-        lmstudio_ok = lmstudio_test.get("summary", {}).get("lmstudio_working", False)
+        monitor = get_health_monitor()
+        snapshot = monitor.snapshot()
+        breaker = ai_service.provider_manager.breaker.snapshot()
+        
+        if not monitor.database_ok:
+            status = "unhealthy"
+        elif not monitor.lmstudio_ok or breaker["state"] != "closed":
+            status = "degraded"
+        else:
+            status = "healthy"
         
         return {
-            "status": "healthy" if lmstudio_ok else "degraded",
-            "database": "connected",
-            "lm_studio": "connected" if lmstudio_ok else "offline",
+            "status": status,
+            "database": snapshot["database"]["status"],
+            "lm_studio": snapshot["lm_studio"]["status"],
             "lm_studio_url": Config.LMSTUDIO_URL,
+            "lm_studio_backends": {
+                name: backend.get("status")
+                for name, backend in snapshot["lm_studio"].get("backends", {}).items()
+            },
+            "circuit_breaker": breaker["state"],
+            "fallback_active": breaker["state"] == "open",
+            "checked_at": snapshot["lm_studio"].get("checked_at"),
             "timestamp": datetime.now().isoformat()
         }
     except Exception as e:
@@ -151,7 +213,8 @@ async def create_work_update(
                 "task": work_update.task or "On Leave",
                 "progress": "On Leave",
                 "blockers": "On Leave",
-                "status": "leave"
+                "status": "leave",
+                "updatedAt": datetime.now()
             }
             
             if existing:
@@ -161,6 +224,8 @@ async def create_work_update(
                 result = await daily_records.insert_one(record)
                 record_id = str(result.inserted_id)
             
+            await ai_service.invalidate_stored_reports(intern_id, [today])
+            
             return {
                 "success": True,
                 "message": "Leave status saved",
@@ -171,8 +236,9 @@ async def create_work_update(
             }
         
         else:
+            # Score only - question generation runs in the background after the temp save
             quality_result = await ai_service.process_work_update_with_quality_check(
-                work_update.task, intern_id, today
+                work_update.task, intern_id, today, generate_questions=False
             )
             
             score = quality_result.get("quality_score", 0)
@@ -190,10 +256,17 @@ async def create_work_update(
                     "submittedAt": datetime.now(),
                     "followupCompleted": False,
                     "temp_status": "pending_followup",
-                    "qualityScore": score
+                    "qualityScore": score,
+                    "followupQuestions": None,
+                    "questionStatus": "queued",
+                    # Only this submission's generation may write questions to the record
+                    "questionGenerationId": uuid.uuid4().hex
                 }
                 
                 temp_id = await create_temp_work_update(temp_record)
+                ai_service.start_question_generation(
+                    temp_id, intern_id, work_update.task, temp_record["questionGenerationId"]
+                )
                 
                 return {
                     "success": True,
@@ -202,6 +275,7 @@ async def create_work_update(
                     "tempWorkUpdateId": temp_id,
                     "redirectToFollowup": True,
                     "qualityScore": score,
+                    "questionStatus": "queued",
                     "status": "pending_followup"
                 }
             else:
@@ -217,7 +291,8 @@ async def create_work_update(
                     "blockers": work_update.blockers,
                     "status": work_update.status,
                     "qualityScore": score,
-                    "followupSkipped": True
+                    "followupSkipped": True,
+                    "updatedAt": datetime.now()
                 }
                 
                 if existing:
@@ -227,6 +302,8 @@ async def create_work_update(
                     result = await daily_records.insert_one(record)
                     record_id = str(result.inserted_id)
                 
+                await ai_service.invalidate_stored_reports(intern_id, [today])
+                
                 return {
                     "success": True,
                     "message": f"High quality (Score: {score}/10) - No follow-up needed",
@@ -246,6 +323,7 @@ async def create_work_update(
 @app.post("/api/followups/start")
 async def start_followup(
     request: GenerateQuestionsRequest,
+    http_request: Request,
     ai_service: AIFollowupService = Depends(get_ai_service)
 ):
     try:
@@ -265,13 +343,10 @@ async def start_followup(
         today = datetime.now().strftime('%Y-%m-%d')
         session_id = f"{intern_id}_{uuid.uuid4().hex}"
         
-        quality_result = await ai_service.process_work_update_with_quality_check(
-            temp_update.get("task", ""), intern_id, today
+        questions = await ai_service.get_followup_questions_for_temp_update(
+            temp_update, is_disconnected=http_request.is_disconnected
         )
         
-        questions = quality_result.get("followup_data", {}).get("questions", 
-                                                                 ai_service._get_default_questions())
-        
         followup_collection = db[Config.FOLLOWUP_SESSIONS_COLLECTION]
         session = {
             "_id": session_id,
@@ -282,7 +357,8 @@ async def start_followup(
             "answers": [""] * len(questions),
             "status": SessionStatus.PENDING,
             "createdAt": datetime.now(),
-            "completedAt": None
+            "completedAt": None,
+            "updatedAt": datetime.now()
         }
         
         await followup_collection.replace_one({"_id": session_id}, session, upsert=True)
@@ -302,7 +378,11 @@ async def start_followup(
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.put("/api/followup/{session_id}/complete")
-async def complete_followup(session_id: str, answers_update: FollowupAnswersUpdate):
+async def complete_followup(
+    session_id: str,
+    answers_update: FollowupAnswersUpdate,
+    ai_service: AIFollowupService = Depends(get_ai_service)
+):
     try:
         intern_id = answers_update.user_id.strip()
         
@@ -328,7 +408,8 @@ async def complete_followup(session_id: str, answers_update: FollowupAnswersUpda
             {"$set": {
                 "answers": answers_update.answers,
                 "status": SessionStatus.COMPLETED,
-                "completedAt": datetime.now()
+                "completedAt": datetime.now(),
+                "updatedAt": datetime.now()
             }}
         )
         
@@ -343,7 +424,8 @@ async def complete_followup(session_id: str, answers_update: FollowupAnswersUpda
             "status": temp_update["status"],
             "qualityScore": temp_update.get("qualityScore", 0),
             "followupCompleted": True,
-            "followupAnswers": answers_update.answers
+            "followupAnswers": answers_update.answers,
+            "updatedAt": datetime.now()
         }
         
         existing = await daily_records.find_one({
@@ -360,6 +442,13 @@ async def complete_followup(session_id: str, answers_update: FollowupAnswersUpda
         
         await delete_temp_work_update(session["tempWorkUpdateId"])
         
+        # The record's day and the session's day can differ (follow-up finished after midnight)
+        created_at = session.get("createdAt")
+        await ai_service.invalidate_stored_reports(intern_id, [
+            temp_update["date"],
+            created_at.strftime('%Y-%m-%d') if isinstance(created_at, datetime) else None
+        ])
+        
         return {
             "success": True,
             "message": "Follow-up completed",
@@ -403,20 +492,45 @@ async def analyze_quality(request: QualityAnalysisRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/quality/analyze-batch", response_model=QualityBatchResponse)
+async def analyze_quality_batch(request: QualityBatchRequest):
+    try:
+        quality_scorer = get_quality_scorer()
+        batch = await quality_scorer.batch_scorer.score(
+            [(item.user_id, item.work_description) for item in request.items]
+        )
+        
+        return QualityBatchResponse(
+            count=len(batch["results"]),
+            results=batch["results"],
+            throughput=batch["throughput"],
+            threshold=Config.QUALITY_SCORE_THRESHOLD
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+def resolve_report_range(request: WeeklyReportRequest):
+    """Requested report range (whole days), defaulting to the last 7 days"""
+    if request.start_date and request.end_date:
+        start = datetime.strptime(request.start_date, '%Y-%m-%d')
+        end = datetime.strptime(request.end_date, '%Y-%m-%d')
+    else:
+        end = datetime.now()
+        start = end - timedelta(days=7)
+    return whole_day_range(start, end)
+
 @app.post("/api/reports/weekly", response_model=WeeklyReportResponse)
 async def weekly_report(
     request: WeeklyReportRequest,
+    http_request: Request,
     ai_service: AIFollowupService = Depends(get_ai_service)
 ):
     try:
-        if request.start_date and request.end_date:
-            start = datetime.strptime(request.start_date, '%Y-%m-%d')
-            end = datetime.strptime(request.end_date, '%Y-%m-%d')
-        else:
-            end = datetime.now()
-            start = end - timedelta(days=7)
+        start, end = resolve_report_range(request)
         
-        result = await ai_service.generate_weekly_report(request.user_id, start, end)
+        result = await ai_service.generate_weekly_report(
+            request.user_id, start, end, is_disconnected=http_request.is_disconnected
+        )
         
         if result.get("success"):
             return WeeklyReportResponse(
@@ -443,6 +557,128 @@ async def weekly_report(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def resolve_period_range(request: PeriodReportRequest):
+    """First and last day of the requested month or quarter, as whole days"""
+    first_month = request.number if request.period == "month" else 3 * (request.number - 1) + 1
+    last_month = request.number if request.period == "month" else first_month + 2
+    
+    start = datetime(request.year, first_month, 1)
+    if last_month == 12:
+        end = datetime(request.year, 12, 31)
+    else:
+        end = datetime(request.year, last_month + 1, 1) - timedelta(days=1)
+    return whole_day_range(start, end)
+
+@app.post("/api/reports/period", response_model=WeeklyReportResponse)
+async def period_report(
+    request: PeriodReportRequest,
+    http_request: Request,
+    ai_service: AIFollowupService = Depends(get_ai_service)
+):
+    """Monthly or quarterly report built from rolled-up week and month summaries"""
+    try:
+        start, end = resolve_period_range(request)
+        
+        result = await ai_service.generate_period_report(
+            request.user_id, start, end, is_disconnected=http_request.is_disconnected
+        )
+        
+        metadata = {
+            "user_id": request.user_id,
+            "period": request.period,
+            "date_range": {
+                "start": start.strftime('%Y-%m-%d'),
+                "end": end.strftime('%Y-%m-%d')
+            }
+        }
+        if result.get("success"):
+            return WeeklyReportResponse(
+                success=True,
+                user_id=request.user_id,
+                report=result["report"],
+                metadata={
+                    **metadata,
+                    "data_summary": result.get("data_summary", {}),
+                    "generated_at": datetime.now().isoformat()
+                }
+            )
+        else:
+            return WeeklyReportResponse(
+                success=False,
+                user_id=request.user_id,
+                message=result.get("message", "Failed"),
+                metadata=metadata
+            )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/reports/jobs", status_code=202)
+async def create_report_job(request: ReportJobRequest):
+    """Queue report generation and return a job ID right away"""
+    try:
+        if request.period:
+            start, end = resolve_period_range(PeriodReportRequest(
+                user_id=request.user_id,
+                period=request.period,
+                year=request.year,
+                number=request.number
+            ))
+        else:
+            start, end = resolve_report_range(request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        job = await get_report_jobs().enqueue(request.user_id, start, end)
+        return {
+            "success": True,
+            "job_id": job["_id"],
+            "status": job["status"],
+            "status_url": f"/api/reports/jobs/{job['_id']}"
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/reports/jobs/{job_id}")
+async def get_report_job(job_id: str):
+    """Status, progress and (once finished) the result of a report job"""
+    try:
+        job = await get_report_jobs().get(job_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Report job not found")
+    return format_job(job)
+
+@app.post("/api/reports/weekly/stream")
+async def weekly_report_stream(
+    request: WeeklyReportRequest,
+    http_request: Request,
+    ai_service: AIFollowupService = Depends(get_ai_service)
+):
+    """Server-Sent Events: metadata first, then report tokens, then done/error"""
+    try:
+        start, end = resolve_report_range(request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    async def event_stream():
+        async for event in ai_service.stream_weekly_report(
+            request.user_id, start, end, is_disconnected=http_request.is_disconnected
+        ):
+            event_type = event.pop("event")
+            yield f"event: {event_type}\ndata: {json.dumps(event)}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # Stop nginx from buffering the stream
+        }
+    )
+
 @app.post("/api/followup-sessions/list")
 async def list_sessions(request: GenerateQuestionsRequest, limit: int = 50):
     try:
@@ -470,9 +706,8 @@ async def list_sessions(request: GenerateQuestionsRequest, limit: int = 50):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/ai/test", response_model=TestAIResponse)
-async def test_ai():
+async def test_ai(ai_service: AIFollowupService = Depends(get_ai_service)):
     try:
-        ai_service = AIFollowupService()
         test_results = await ai_service.test_ai_connection()
         
         return TestAIResponse(
@@ -493,21 +728,34 @@ async def test_ai():
         )
 
 @app.get("/stats")
-async def get_stats():
+async def get_stats(ai_service: AIFollowupService = Depends(get_ai_service)):
     try:
         stats = await get_database_stats()
         
-        ai_service = AIFollowupService()
-        lmstudio_test = await ai_service.test_ai_connection()
-        lmstudio_ok = lmstudio_test.get("summary", {}).get("lmstudio_working", False)
+        lmstudio_status = get_health_monitor().snapshot()["lm_studio"]
         
         if stats:
             stats["ai_provider"] = {
                 "type": "local",
                 "name": "LM Studio",
-                "status": "connected" if lmstudio_ok else "offline",
+                "status": lmstudio_status["status"],
+                "checked_at": lmstudio_status.get("checked_at"),
+                "backends": lmstudio_status.get("backends", {}),
                 "cost_per_request": 0.0
             }
+            stats["llm"] = ai_service.provider_manager.get_metrics()
+            stats["llm"]["prompt_usage"] = ai_service.prompt_usage
+            stats["llm"]["day_summaries"] = ai_service.day_summarizer.get_metrics()
+            stats["llm"]["period_summaries"] = ai_service.report_engine.get_metrics()
+            stats["report_jobs"] = await get_report_jobs().get_metrics()
+            stats["report_batch"] = {
+                "enabled": Config.REPORT_BATCH_ENABLED,
+                "hour": Config.REPORT_BATCH_HOUR,
+                "concurrency": Config.REPORT_BATCH_CONCURRENCY,
+                "last_run": ai_service.last_report_batch
+            }
+            stats["nlp"] = get_nlp_resources().get_metrics()
+            stats["quality_scoring"] = get_quality_scorer().executor.get_metrics()
         
         return stats
     except Exception as e:
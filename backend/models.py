@@ -3,6 +3,8 @@ from typing import List, Optional, Any
 from datetime import datetime
 from enum import Enum
 
+from config import Config
+
 class SessionStatus(str, Enum):
     PENDING = "pending"
     COMPLETED = "completed"
@@ -145,6 +147,24 @@ class QualityAnalysisResponse(BaseModel):
     recommendation: str
     threshold: float
 
+class QualityBatchRequest(BaseModel):
+    items: List[QualityAnalysisRequest] = Field(..., description="Work updates to score")
+
+    @validator("items")
+    def check_batch_size(cls, v):
+        if not v:
+            raise ValueError("At least one item is required")
+        if len(v) > Config.QUALITY_BATCH_MAX_ITEMS:
+            raise ValueError(f"At most {Config.QUALITY_BATCH_MAX_ITEMS} items per batch")
+        return v
+
+class QualityBatchResponse(BaseModel):
+    success: bool = True
+    count: int
+    results: List[dict]
+    throughput: dict
+    threshold: float
+
 class WeeklyReportRequest(BaseModel):
     user_id: str = Field(..., description="User/Intern ID for report generation")
     start_date: Optional[str] = Field(None, description="Start date in YYYY-MM-DD format")
@@ -156,6 +176,36 @@ class WeeklyReportRequest(BaseModel):
             raise ValueError("user_id cannot be empty")
         return v.strip()
 
+class PeriodReportRequest(BaseModel):
+    user_id: str = Field(..., description="User/Intern ID for report generation")
+    period: str = Field(..., description="Report period: 'month' or 'quarter'")
+    year: int = Field(..., description="Calendar year, e.g. 2025")
+    number: int = Field(..., description="Month (1-12) or quarter (1-4) within the year")
+
+    @validator("user_id")
+    def check_user_id_non_empty(cls, v):
+        if not v or not v.strip():
+            raise ValueError("user_id cannot be empty")
+        return v.strip()
+
+    @validator("period")
+    def check_period(cls, v):
+        if v not in ("month", "quarter"):
+            raise ValueError("period must be 'month' or 'quarter'")
+        return v
+
+    @validator("number")
+    def check_number(cls, v, values):
+        limit = 12 if values.get("period") == "month" else 4
+        if not 1 <= v <= limit:
+            raise ValueError(f"number must be between 1 and {limit}")
+        return v
+
+class ReportJobRequest(WeeklyReportRequest):
+    period: Optional[str] = Field(None, description="'month' or 'quarter' - replaces start_date/end_date")
+    year: Optional[int] = Field(None, description="Calendar year when period is given")
+    number: Optional[int] = Field(None, description="Month (1-12) or quarter (1-4) when period is given")
+
 class WeeklyReportResponse(BaseModel):
     success: bool
     user_id: str
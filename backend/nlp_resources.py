@@ -0,0 +1,175 @@
+"""
+NLP Resources - Lazily loaded NLTK components for quality scoring
+Tokenizer and VADER data are read from a local directory (NLTK_DATA_DIR) on
+first use or during a background warm-up, so importing the app never touches
+the network and a worker that hasn't scored anything yet hasn't paid for VADER
+"""
+
+import logging
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# NLTK package name -> resource path checked with nltk.data.find
+NLTK_PACKAGES = {
+    "punkt": "tokenizers/punkt",
+    "punkt_tab": "tokenizers/punkt_tab",
+    "vader_lexicon": "sentiment/vader_lexicon.zip"
+}
+
+_WORD_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+class NLPResources:
+    """
+    Loads each NLTK component once, on demand, and remembers how long it took
+
+    A component whose data is missing is marked unavailable instead of
+    raising; callers fall back to their non-NLTK paths.
+    """
+
+    def __init__(self, data_dir: str = None, auto_download: bool = None):
+        self.data_dir = data_dir or Config.NLTK_DATA_DIR
+        self.auto_download = Config.NLTK_AUTO_DOWNLOAD if auto_download is None else auto_download
+
+        self._lock = threading.Lock()
+        self._nltk = None
+        self._components: Dict[str, Any] = {}
+        self._status: Dict[str, str] = {}
+        self.load_times: Dict[str, float] = {}
+
+    def _import_nltk(self):
+        if self._nltk is None:
+            import nltk
+            if self.data_dir not in nltk.data.path:
+                nltk.data.path.insert(0, self.data_dir)
+            self._nltk = nltk
+        return self._nltk
+
+    def _has_data(self, package: str) -> bool:
+        nltk = self._nltk
+        try:
+            nltk.data.find(NLTK_PACKAGES[package])
+            return True
+        except LookupError:
+            pass
+
+        if not self.auto_download:
+            return False
+
+        logger.info(f"Downloading NLTK '{package}' to {self.data_dir}")
+        try:
+            return bool(nltk.download(package, download_dir=self.data_dir, quiet=True))
+        except Exception as e:
+            logger.warning(f"NLTK download of '{package}' failed: {e}")
+            return False
+
+    def _load(self, name: str, loader: Callable[[], Any]) -> Optional[Any]:
+        """Run loader once (thread-safe) and cache the component, or None if unavailable"""
+        if name in self._status:
+            return self._components.get(name)
+
+        with self._lock:
+            if name in self._status:
+                return self._components.get(name)
+
+            started = time.perf_counter()
+            try:
+                component = loader()
+            except Exception as e:
+                logger.warning(f"NLP component '{name}' unavailable: {e}")
+                component = None
+
+            self.load_times[name] = round((time.perf_counter() - started) * 1000, 1)
+            self._components[name] = component
+            self._status[name] = "loaded" if component is not None else "unavailable"
+            logger.info(f"NLP component '{name}' {self._status[name]} in {self.load_times[name]}ms")
+            return component
+
+    def _load_stemmer(self):
+        self._import_nltk()
+        from nltk.stem import PorterStemmer
+        return PorterStemmer()
+
+    def _load_tokenizer(self):
+        self._import_nltk()
+        if not (self._has_data("punkt_tab") or self._has_data("punkt")):
+            raise LookupError(f"punkt tokenizer data not found in {self.data_dir}")
+
+        from nltk.tokenize import word_tokenize
+        word_tokenize("warm up")  # Loads the punkt model now rather than on the first request
+        return word_tokenize
+
+    def _load_sentiment(self):
+        self._import_nltk()
+        if not self._has_data("vader_lexicon"):
+            raise LookupError(f"vader_lexicon not found in {self.data_dir}")
+
+        from nltk.sentiment import SentimentIntensityAnalyzer
+        return SentimentIntensityAnalyzer()
+
+    def get_stemmer(self):
+        """Porter stemmer (needs no data), or None if NLTK is not installed"""
+        return self._load("stemmer", self._load_stemmer)
+
+    def get_sentiment_analyzer(self):
+        """VADER analyzer, or None if NLTK or the lexicon is unavailable"""
+        return self._load("sentiment", self._load_sentiment)
+
+    def tokenize(self, text: str) -> List[str]:
+        """Punkt word tokens, or a regex split when the tokenizer data is missing"""
+        word_tokenize = self._load("tokenizer", self._load_tokenizer)
+        if word_tokenize is None:
+            return _WORD_PATTERN.findall(text)
+        return word_tokenize(text)
+
+    def warm_up(self) -> Dict[str, float]:
+        """Load every component now (blocking; run it in a thread)"""
+        started = time.perf_counter()
+        self.get_stemmer()
+        self.tokenize("warm up")
+        self.get_sentiment_analyzer()
+        logger.info(f"NLP resources warmed up in {round((time.perf_counter() - started) * 1000, 1)}ms")
+        return dict(self.load_times)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "data_dir": self.data_dir,
+            "auto_download": self.auto_download,
+            "components": dict(self._status),
+            "load_times_ms": dict(self.load_times)
+        }
+
+# Global NLP resources instance
+nlp_resources: Optional[NLPResources] = None
+
+def initialize_nlp_resources() -> NLPResources:
+    """Initialize the global NLP resources (nothing is loaded until used or warmed up)"""
+    global nlp_resources
+
+    nlp_resources = NLPResources()
+    return nlp_resources
+
+def get_nlp_resources() -> NLPResources:
+    """Get the global NLP resources"""
+    if nlp_resources is None:
+        raise RuntimeError("NLP resources not initialized. Call initialize_nlp_resources() first")
+
+    return nlp_resources
+
+if __name__ == "__main__":
+    # Provision NLTK_DATA_DIR ahead of deployment (build step / container image)
+    import nltk
+
+    logging.basicConfig(level=logging.INFO)
+    failed = [
+        package for package in NLTK_PACKAGES
+        if not nltk.download(package, download_dir=Config.NLTK_DATA_DIR)
+    ]
+    if failed:
+        raise SystemExit(f"Failed to download NLTK data: {', '.join(failed)}")
+    logger.info(f"NLTK data provisioned in {Config.NLTK_DATA_DIR}")
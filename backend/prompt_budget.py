@@ -0,0 +1,223 @@
+"""
+Prompt Budget - Keeps follow-up and weekly report prompts within a token budget
+Approximate token counting, de-duplication of text repeated across days, and
+priority-ordered per-section truncation with a per-section usage report
+"""
+
+import logging
+import re
+from typing import Any, Dict, List, Optional
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Rough average for English text with BPE tokenizers
+CHARS_PER_TOKEN = 4
+TRUNCATION_MARKER = " ...[truncated]"
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count (no tokenizer needed)"""
+    if not text:
+        return 0
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to roughly max_tokens, preferring a word boundary"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    keep = max_tokens * CHARS_PER_TOKEN - len(TRUNCATION_MARKER)
+    if keep <= 0:
+        return ""
+
+    cut = text[:keep]
+    space = cut.rfind(" ")
+    if space > keep // 2:
+        cut = cut[:space]
+    return cut.rstrip() + TRUNCATION_MARKER
+
+def dedupe_repeats(values: List[str], labels: List[str], min_length: int = 40) -> List[str]:
+    """
+    Replace text already seen earlier in the list with a short back-reference
+
+    Interns often paste the same task description on several days; only the
+    first occurrence is kept. Short values ("None", "Done") are left alone.
+    """
+    first_seen: Dict[str, str] = {}
+    result = []
+
+    for value, label in zip(values, labels):
+        key = _WHITESPACE_RE.sub(" ", value or "").strip().lower()
+        if len(key) >= min_length:
+            if key in first_seen:
+                result.append(f"(same as {first_seen[key]})")
+                continue
+            first_seen[key] = label
+        result.append(value)
+
+    return result
+
+class PromptSection:
+    """
+    A variable-length part of a prompt made of entries (days, sessions, ...)
+
+    Entries are given in display order. When the section does not fit, long
+    entries are truncated first (each keeps an equal share of the budget)
+    and whole entries are dropped from `drop_from` ("start" or "end") only
+    once the share would fall below the minimum entry size.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        entries: List[str],
+        priority: int,
+        max_tokens: Optional[int] = None,
+        copies: int = 1,
+        separator: str = "\n",
+        drop_from: str = "end",
+        omitted_note: str = "({count} more entries omitted)"
+    ):
+        self.name = name
+        self.entries = [entry for entry in entries if entry]
+        self.priority = priority
+        self.max_tokens = max_tokens
+        self.copies = max(1, copies)  # Sections inserted more than once count each time
+        self.separator = separator
+        self.drop_from = drop_from
+        self.omitted_note = omitted_note
+
+        self.text = ""
+        self.budget = 0
+        self.included = 0
+        self.truncated = 0
+        self.omitted = 0
+
+    @property
+    def requested_tokens(self) -> int:
+        return estimate_tokens(self.separator.join(self.entries)) * self.copies
+
+    @property
+    def used_tokens(self) -> int:
+        return estimate_tokens(self.text) * self.copies
+
+    def fit(self, budget: int, min_entry_tokens: int) -> None:
+        """Render the section into at most `budget` tokens (per copy)"""
+        self.budget = budget
+        kept = list(self.entries)
+        separator_tokens = estimate_tokens(self.separator)
+        omitted = 0
+
+        while kept:
+            available = budget - separator_tokens * (len(kept) - 1)
+            if omitted:
+                available -= estimate_tokens(self.omitted_note.format(count=omitted)) + separator_tokens
+
+            sizes = [estimate_tokens(entry) for entry in kept]
+            if sum(sizes) <= available:
+                cap = max(sizes)
+                break
+
+            cap = self._water_level(sizes, available)
+            if cap >= min_entry_tokens:
+                break
+
+            kept.pop(0 if self.drop_from == "start" else -1)
+            omitted += 1
+
+        rendered = [truncate_to_tokens(entry, cap) for entry in kept] if kept else []
+        self.truncated = sum(1 for before, after in zip(kept, rendered) if before != after)
+        self.included = len(rendered)
+        self.omitted = omitted
+
+        if omitted:
+            note = self.omitted_note.format(count=omitted)
+            if self.drop_from == "start":
+                rendered.insert(0, note)
+            else:
+                rendered.append(note)
+
+        self.text = self.separator.join(rendered)
+
+    @staticmethod
+    def _water_level(sizes: List[int], available: int) -> int:
+        """Largest per-entry cap such that the capped sizes fit in `available`"""
+        remaining = available
+        ordered = sorted(sizes)
+        for i, size in enumerate(ordered):
+            share = remaining // (len(ordered) - i)
+            if size > share:
+                return share
+            remaining -= size
+        return ordered[-1]
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "priority": self.priority,
+            "requested_tokens": self.requested_tokens,
+            "used_tokens": self.used_tokens,
+            "budget_tokens": self.budget * self.copies,
+            "entries": len(self.entries),
+            "included": self.included,
+            "truncated": self.truncated,
+            "omitted": self.omitted
+        }
+
+class PromptBudget:
+    """
+    Splits a token budget across prompt sections by priority
+
+    The fixed template text is reserved up front. Sections are then filled
+    in priority order (lower value first); each takes at most its own
+    max_tokens and whatever it leaves unused rolls over to the next one.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_tokens: int,
+        template_tokens: int = 0,
+        min_entry_tokens: int = None
+    ):
+        self.name = name
+        self.max_tokens = max_tokens
+        self.template_tokens = template_tokens
+        self.min_entry_tokens = min_entry_tokens or Config.PROMPT_MIN_ENTRY_TOKENS
+        self.sections: Dict[str, PromptSection] = {}
+
+    def add_section(self, name: str, entries: List[str], priority: int, **options) -> None:
+        """Register a section; options are passed to PromptSection"""
+        self.sections[name] = PromptSection(name, entries, priority, **options)
+
+    def allocate(self) -> Dict[str, str]:
+        """Fit every section and return the rendered text by section name"""
+        remaining = max(0, self.max_tokens - self.template_tokens)
+
+        for section in sorted(self.sections.values(), key=lambda s: s.priority):
+            budget = remaining if section.max_tokens is None else min(section.max_tokens, remaining)
+            section.fit(budget // section.copies, self.min_entry_tokens)
+            remaining = max(0, remaining - section.used_tokens)
+
+        report = self.report()
+        if any(s["truncated"] or s["omitted"] for s in report["sections"].values()):
+            logger.info(
+                f"Prompt '{self.name}' trimmed to ~{report['used_tokens']} tokens "
+                f"(requested ~{report['requested_tokens']}, budget {self.max_tokens})"
+            )
+
+        return {name: section.text for name, section in self.sections.items()}
+
+    def report(self) -> Dict[str, Any]:
+        """Approximate token usage per section"""
+        sections = {name: section.report() for name, section in self.sections.items()}
+        return {
+            "prompt": self.name,
+            "budget_tokens": self.max_tokens,
+            "template_tokens": self.template_tokens,
+            "requested_tokens": self.template_tokens + sum(s["requested_tokens"] for s in sections.values()),
+            "used_tokens": self.template_tokens + sum(s["used_tokens"] for s in sections.values()),
+            "sections": sections
+        }
@@ -0,0 +1,178 @@
+"""
+Prompt Templates - Prompts laid out for inference-server prefix caching
+Static instructions and formatting rules come first so every request shares
+the same prefix (and the model's KV cache for it), per-intern history comes
+next, and today's data comes last
+"""
+
+from typing import Dict, List, Tuple
+
+class PromptTemplate:
+    """
+    Fixed instructions followed by labelled data slots
+
+    Slots are rendered in the order given, which should run from the most
+    stable (shared by many requests) to the most volatile.
+    """
+
+    def __init__(self, name: str, instructions: str, slots: List[Tuple[str, str]]):
+        self.name = name
+        self.instructions = instructions.strip()
+        self.slots = slots
+
+    @property
+    def prefix(self) -> str:
+        """Text shared by every prompt rendered from this template"""
+        return self.instructions + "\n\n"
+
+    def render(self, values: Dict[str, str]) -> str:
+        """Fill the slots; missing values render as empty"""
+        body = "\n\n".join(f"{label}\n{values.get(key, '')}".rstrip() for key, label in self.slots)
+        return self.prefix + body
+
+FOLLOWUP_INSTRUCTIONS = """You're helping a supervisor create simple, easy-to-answer follow-up questions for an intern's daily work update.
+
+You will be given the intern's recent work history, what they planned yesterday, today's work update and their current challenges.
+
+Generate exactly 3 simple questions that:
+1. Are easy to answer with 1-2 sentences
+2. Sound friendly and conversational to understand progress without being demanding
+3. Focus on today's work specifically
+4. When says they completed a task, ask them to describe the steps they followed in a general but specific-enough way, so we can understand how the work was approached and verify it was actually done
+5. If yesterday's plans are given, naturally verify that today's work matches them
+
+Avoid questions about:
+- Feelings or emotions
+- Complex technical details
+- Long explanations"""
+
+_WEEKLY_REPORT_TASK = """You are generating a comprehensive weekly report for an intern's progress and performance.
+
+Generate a professional weekly report that includes:
+
+1. **Executive Summary** - Overall performance and progress
+2. **Daily Work Breakdown** - What was accomplished each day
+3. **Key Achievements** - Major completions and successes
+4. **Challenges & Blockers** - Issues faced and how they were addressed
+5. **Areas for Improvement** - Constructive feedback
+6. **Plans for Next Week** - Recommendations
+7. **Manager Notes** - Concerns or praise
+
+Make the report professional, specific with examples, constructive, and actionable."""
+
+WEEKLY_REPORT_INSTRUCTIONS = _WEEKLY_REPORT_TASK + """
+
+The intern's data for the week follows."""
+
+WEEKLY_REDUCE_INSTRUCTIONS = _WEEKLY_REPORT_TASK + """
+
+The intern's week follows as one summary per day. Base the report only on these summaries."""
+
+DAY_SUMMARY_INSTRUCTIONS = """You are summarizing one day of an intern's work for a weekly report.
+
+Write 3-5 short bullet points covering:
+- Tasks worked on and what was completed
+- Progress made and how the work was approached
+- Challenges or blockers, and how they were handled
+- Anything notable from the follow-up answers
+
+Be factual and specific. Do not invent details that are not in the data. Respond with the bullet points only."""
+
+_ROLLUP_INSTRUCTIONS = """You are summarizing one {period} of an intern's work for a longer-term report.
+
+You will be given one summary per {part}. Write 4-6 short bullet points covering:
+- The main tasks and what was completed
+- How the work progressed across the {period}
+- Recurring or unresolved challenges
+- Notable strengths or concerns
+
+Be factual and specific. Do not invent details that are not in the summaries. Respond with the bullet points only."""
+
+WEEK_SUMMARY_INSTRUCTIONS = _ROLLUP_INSTRUCTIONS.format(period="week", part="day")
+
+MONTH_SUMMARY_INSTRUCTIONS = _ROLLUP_INSTRUCTIONS.format(period="month", part="week")
+
+PERIOD_REPORT_INSTRUCTIONS = """You are generating a comprehensive progress report for an intern covering several weeks or months.
+
+Generate a professional report that includes:
+
+1. **Executive Summary** - Overall performance and progress across the period
+2. **Progress Over Time** - What was accomplished in each week or month
+3. **Key Achievements** - Major completions and successes
+4. **Recurring Challenges** - Issues that came up repeatedly and how they were addressed
+5. **Growth & Areas for Improvement** - How the intern developed and constructive feedback
+6. **Recommendations** - Focus areas for the next period
+7. **Manager Notes** - Concerns or praise
+
+Make the report professional, specific with examples, constructive, and actionable.
+
+The intern's period follows as one summary per week or month. Base the report only on these summaries."""
+
+def build_followup_template(format_instructions: str) -> PromptTemplate:
+    """Follow-up question prompt; the output format rules are part of the static prefix"""
+    return PromptTemplate(
+        "followup",
+        f"{FOLLOWUP_INSTRUCTIONS}\n\n{format_instructions}",
+        [
+            ("history", "**Recent Work History:**"),
+            ("yesterday_plans", "**What They Planned (from yesterday):**"),
+            ("today_work", "**Today's Work:**"),
+            ("current_challenges", "**Current Challenges:**")
+        ]
+    )
+
+WEEKLY_REPORT_TEMPLATE = PromptTemplate(
+    "weekly_report",
+    WEEKLY_REPORT_INSTRUCTIONS,
+    [
+        ("period", "**Report Period:**"),
+        ("work_updates", "**WORK UPDATES THIS WEEK:**"),
+        ("followup_sessions", "**FOLLOW-UP SESSIONS THIS WEEK:**")
+    ]
+)
+
+WEEKLY_REDUCE_TEMPLATE = PromptTemplate(
+    "weekly_report_reduce",
+    WEEKLY_REDUCE_INSTRUCTIONS,
+    [
+        ("period", "**Report Period:**"),
+        ("daily_summaries", "**DAILY SUMMARIES:**")
+    ]
+)
+
+DAY_SUMMARY_TEMPLATE = PromptTemplate(
+    "day_summary",
+    DAY_SUMMARY_INSTRUCTIONS,
+    [
+        ("day", "**Day:**"),
+        ("work_updates", "**WORK UPDATE:**"),
+        ("followup_sessions", "**FOLLOW-UP Q&A:**")
+    ]
+)
+
+WEEK_SUMMARY_TEMPLATE = PromptTemplate(
+    "week_summary",
+    WEEK_SUMMARY_INSTRUCTIONS,
+    [
+        ("period", "**Week:**"),
+        ("summaries", "**DAILY SUMMARIES:**")
+    ]
+)
+
+MONTH_SUMMARY_TEMPLATE = PromptTemplate(
+    "month_summary",
+    MONTH_SUMMARY_INSTRUCTIONS,
+    [
+        ("period", "**Month:**"),
+        ("summaries", "**WEEKLY SUMMARIES:**")
+    ]
+)
+
+PERIOD_REPORT_TEMPLATE = PromptTemplate(
+    "period_report",
+    PERIOD_REPORT_INSTRUCTIONS,
+    [
+        ("period", "**Report Period:**"),
+        ("summaries", "**SUMMARIES:**")
+    ]
+)
@@ -1,37 +1,18 @@
+import asyncio
 import logging
-import re
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 import hashlib
 
-# NLTK imports for stemming and sentiment
-import nltk
-from nltk.stem import PorterStemmer
-from nltk.tokenize import word_tokenize
-from nltk.sentiment import SentimentIntensityAnalyzer
-
-# TextBlob as alternative for sentiment
-try:
-    from textblob import TextBlob
-    TEXTBLOB_AVAILABLE = True
-except ImportError:
-    TEXTBLOB_AVAILABLE = False
-
+from batch_scoring import BatchQualityScorer
 from config import Config
 from database import get_database
+from nlp_resources import get_nlp_resources
+from scoring_executor import ScoringExecutor
+from text_scoring import TextScorer
 
 logger = logging.getLogger(__name__)
 
-# Download required NLTK data
-try:
-    nltk.download('punkt', quiet=True)
-    nltk.download('punkt_tab', quiet=True) 
-    nltk.download('vader_lexicon', quiet=True)
-    NLTK_AVAILABLE = True
-except Exception as e:
-    logger.warning(f"NLTK download failed: {e}")
-    NLTK_AVAILABLE = False
-
 class QualityScorer:
     """
     Heuristic quality scoring system for work updates
@@ -42,26 +23,13 @@ class QualityScorer:
         self.config = Config()
         self.db = get_database()
         
-        # Initialize NLTK components
-        if NLTK_AVAILABLE:
-            self.stemmer = PorterStemmer()
-            self.sentiment_analyzer = SentimentIntensityAnalyzer()
-            
-            # Create keyword stems for faster comparison
-            self.keyword_stems = {
-                self.stemmer.stem(keyword.lower()) 
-                for keyword in self.config.QUALITY_KEYWORDS
-            }
-        else:
-            self.stemmer = None
-            self.sentiment_analyzer = None
-            self.keyword_stems = set()
+        # NLTK components load on first use (or during the startup warm-up);
+        # text-only components run in the scoring executor, off the event loop
+        self.text_scorer = TextScorer(get_nlp_resources())
+        self.executor = ScoringExecutor(self.text_scorer)
+        self.batch_scorer = BatchQualityScorer(self.db, self.text_scorer, self.executor)
             
         logger.info(f"Quality scorer initialized with {len(self.config.QUALITY_KEYWORDS)} keywords")
-        if NLTK_AVAILABLE:
-            logger.info(f"NLTK enabled - stemmed to {len(self.keyword_stems)} keyword stems")
-        else:
-            logger.warning("NLTK not available - using basic keyword matching")
     
     async def calculate_quality_score(
         self, 
@@ -91,20 +59,17 @@ class QualityScorer:
             
             content = work_description.strip()
             
-            # 1. Word Count Score (0-4 points)
-            word_count_score, word_count = self._calculate_word_count_score(content)
-            
-            # 2. Keyword Presence Score (0-2 points)
-            keyword_score, keyword_found = self._calculate_keyword_score(content)
-            
-            # 3. Sentiment Score (0-2 points)
-            sentiment_score, sentiment_polarity, sentiment_label = self._calculate_sentiment_score(content)
-            
-            # 4. Repetition Check (-2 penalty if repeated)
-            repetition_penalty, is_repetition = await self._check_repetition(content, intern_id, update_date)
-            
-            # 5. Structure Check (0-1 points)
-            structure_score, has_structure = self._check_structure(content)
+            # 1-3, 5. Word count (0-4), keywords (0-2), sentiment (0-2) and structure (0-1)
+            # run in the scoring executor while 4. the repetition check (-2 penalty) queries MongoDB
+            text_scores, (repetition_penalty, is_repetition) = await asyncio.gather(
+                self.executor.score(content),
+                self._check_repetition(content, intern_id, update_date)
+            )
+            word_count_score, word_count = text_scores["word_count_score"], text_scores["word_count"]
+            keyword_score, keyword_found = text_scores["keyword_score"], text_scores["keyword_found"]
+            sentiment_score = text_scores["sentiment_score"]
+            sentiment_polarity, sentiment_label = text_scores["sentiment_polarity"], text_scores["sentiment_label"]
+            structure_score, has_structure = text_scores["structure_score"], text_scores["has_structure"]
             
             # 6. Time-based behavior (future enhancement - placeholder for now)
             time_penalty = 0   
@@ -176,88 +141,6 @@ class QualityScorer:
                 "needs_followup": True
             })
     
-    def _calculate_word_count_score(self, content: str) -> Tuple[int, int]:
-        """
-        Calculate word count score (0-4 points)
-        """
-        word_count = len(content.split())
-        
-        if word_count >= self.config.WORD_COUNT_OK_THRESHOLD:   
-            return 4, word_count
-        elif word_count >= self.config.WORD_COUNT_WEAK_THRESHOLD:   
-            return 2, word_count
-        else:  
-            return 0, word_count
-    
-    def _calculate_keyword_score(self, content: str) -> Tuple[int, bool]:
-        """
-        Calculate keyword presence score using stemming (0-2 points)
-        """
-        if not NLTK_AVAILABLE or not self.keyword_stems:
-            # Fallback to basic keyword matching
-            content_lower = content.lower()
-            for keyword in self.config.QUALITY_KEYWORDS:
-                if keyword.lower() in content_lower:
-                    return 2, True
-            return 0, False
-        
-        try:
-            # Tokenize and stem the content
-            tokens = word_tokenize(content.lower())
-            content_stems = {self.stemmer.stem(token) for token in tokens if token.isalnum()}
-            
-            # Check for intersection with keyword stems
-            if content_stems & self.keyword_stems:
-                return 2, True
-            else:
-                return 0, False
-                
-        except Exception as e:
-            logger.warning(f"Keyword scoring failed, using fallback: {e}")
-          
-            content_lower = content.lower()
-            for keyword in self.config.QUALITY_KEYWORDS:
-                if keyword.lower() in content_lower:
-                    return 2, True
-            return 0, False
-    
-    def _calculate_sentiment_score(self, content: str) -> Tuple[int, float, str]:
-        """
-        Calculate sentiment score (0-2 points)
-        Returns: (score, polarity, label)
-        """
-        polarity = 0.0
-        label = "neutral"
-        
-        if NLTK_AVAILABLE and self.sentiment_analyzer:
-            try:
-                # Use VADER sentiment analyzer
-                scores = self.sentiment_analyzer.polarity_scores(content)
-                polarity = scores['compound']  
-            except Exception as e:
-                logger.warning(f"VADER sentiment analysis failed: {e}")
-        
-        elif TEXTBLOB_AVAILABLE:
-            try:
-                # Use TextBlob as fallback
-                blob = TextBlob(content)
-                polarity = blob.sentiment.polarity  # Range -1 to 1
-            except Exception as e:
-                logger.warning(f"TextBlob sentiment analysis failed: {e}")
-        
-        # Determine sentiment label and score
-        if polarity < self.config.NEGATIVE_SENTIMENT_THRESHOLD:  # < -0.3
-            label = "very_negative"
-            score = 0
-        elif polarity < self.config.POSITIVE_SENTIMENT_THRESHOLD:  # -0.3 to 0.2
-            label = "neutral"
-            score = 1
-        else:  # > 0.2
-            label = "positive"
-            score = 2
-        
-        return score, polarity, label
-    
     async def _check_repetition(self, content: str, intern_id: str, update_date: str = None) -> Tuple[int, bool]:
         """
         Check for repetitive content (-2 penalty if repeated)
@@ -305,36 +188,6 @@ class QualityScorer:
             logger.warning(f"Repetition check failed: {e}")
             return 0, False
     
-    def _check_structure(self, content: str) -> Tuple[int, bool]:
-        """
-        Check for structured content (0-1 points)
-        Looks for sections like "What I did", "Next", "Blockers", etc.
-        """
-        structure_keywords = [
-            "what i did", "what i worked on", "completed", "tasks",
-            "next", "tomorrow", "plans", "planning",
-            "blockers", "challenges", "issues", "problems",
-            "progress", "status", "update"
-        ]
-        
-        content_lower = content.lower()
-        
-        # Check for presence of structure keywords
-        found_structure_words = 0
-        for keyword in structure_keywords:
-            if keyword in content_lower:
-                found_structure_words += 1
-        
-        # Also check for bullet points, numbers, or section separators
-        has_bullets = bool(re.search(r'[•\-\*\d+\.]', content))
-        has_line_breaks = content.count('\n') >= 2
-        
-        # Score based on structure indicators
-        if found_structure_words >= 2 or has_bullets or has_line_breaks:
-            return 1, True
-        else:
-            return 0, False
-    
     def _create_score_result(self, score: float, details: Dict) -> Dict:
         """Create standardized score result"""
         return {
@@ -370,6 +223,11 @@ def initialize_quality_scorer():
     quality_scorer = QualityScorer()
     logger.info("Global quality scorer initialized")
 
+def close_quality_scorer():
+    """Shut down the scoring executor"""
+    if quality_scorer is not None:
+        quality_scorer.executor.shutdown()
+
 def get_quality_scorer() -> QualityScorer:
     """Get the global quality scorer instance"""
     if quality_scorer is None:
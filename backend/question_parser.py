@@ -0,0 +1,116 @@
+"""
+Incremental follow-up question parser
+Consumes streamed model output chunk by chunk and reports as soon as three
+complete questions have arrived, for both the JSON ({"questions": [...]})
+and the numbered-list output formats
+"""
+
+import json
+import re
+from typing import List
+
+_NUMBERED_RE = re.compile(r'^\d+[.\)]\s*')
+_BOLD_LABEL_RE = re.compile(r'\*\*.*?\*\*:\s*')
+_JSON_STRING_RE = re.compile(r'"((?:[^"\\]|\\.)*)"')
+
+MIN_QUESTION_LENGTH = 10
+
+class QuestionStreamParser:
+    """
+    Feed streamed text with feed(); complete becomes True once `target`
+    well-formed questions are available in `questions`
+    """
+
+    def __init__(self, target: int = 3):
+        self.target = target
+        self.questions: List[str] = []
+        self._buffer = ""
+        self._json_mode = None  # Decided from the first non-blank character
+        self._json_scan_pos = 0
+        self._line_scan_pos = 0
+
+    @property
+    def complete(self) -> bool:
+        return len(self.questions) >= self.target
+
+    def feed(self, chunk: str) -> bool:
+        """Add a chunk of output; returns True once enough questions are parsed"""
+        if self.complete or not chunk:
+            return self.complete
+
+        self._buffer += chunk
+
+        if self._json_mode is None:
+            stripped = self._buffer.lstrip().lstrip("`").lstrip()
+            if not stripped:
+                return False
+            if stripped.lower().startswith("json"):
+                stripped = stripped[4:].lstrip()
+                if not stripped:
+                    return False
+            self._json_mode = stripped[0] in "{["
+
+        if self._json_mode:
+            self._scan_json()
+        else:
+            self._scan_lines(final=False)
+        return self.complete
+
+    def finish(self) -> List[str]:
+        """Flush a trailing unterminated line at end of stream"""
+        if not self.complete and self._json_mode is False:
+            self._scan_lines(final=True)
+        return self.questions[:self.target]
+
+    @classmethod
+    def parse(cls, text: str, target: int = 3) -> List[str]:
+        """Parse complete (or truncated) output in one go"""
+        parser = cls(target)
+        parser.feed(text)
+        return parser.finish()
+
+    def _scan_json(self) -> None:
+        """Collect closed string literals inside the questions array"""
+        array_start = self._buffer.find("[")
+        if array_start == -1:
+            return
+        if self._json_scan_pos <= array_start:
+            self._json_scan_pos = array_start + 1
+
+        for match in _JSON_STRING_RE.finditer(self._buffer, self._json_scan_pos):
+            self._json_scan_pos = match.end()
+            try:
+                question = json.loads(f'"{match.group(1)}"').strip()
+            except ValueError:
+                continue
+            self._add(question)
+            if self.complete:
+                return
+
+    def _scan_lines(self, final: bool) -> None:
+        """Collect numbered questions from newline-terminated lines"""
+        while not self.complete:
+            newline = self._buffer.find("\n", self._line_scan_pos)
+            if newline == -1:
+                if not final:
+                    return
+                line = self._buffer[self._line_scan_pos:]
+                self._line_scan_pos = len(self._buffer)
+                self._add_numbered_line(line)
+                return
+
+            line = self._buffer[self._line_scan_pos:newline]
+            self._line_scan_pos = newline + 1
+            self._add_numbered_line(line)
+
+    def _add_numbered_line(self, line: str) -> None:
+        trimmed = line.strip()
+        if not _NUMBERED_RE.match(trimmed):
+            return
+        question = _NUMBERED_RE.sub('', trimmed).strip()
+        question = _BOLD_LABEL_RE.sub('', question).strip()
+        self._add(question)
+
+    def _add(self, question: str) -> None:
+        if len(question) > MIN_QUESTION_LENGTH:
+            self.questions.append(question)
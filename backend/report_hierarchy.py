@@ -0,0 +1,277 @@
+"""
+Report Hierarchy - Monthly and quarterly reports from rolled-up summaries
+Day summaries roll up into week summaries and week summaries into month
+summaries; every level is persisted under a content hash and reused. Data is
+loaded one week at a time, so a long range never sits in memory (or in a
+prompt) all at once.
+"""
+
+import asyncio
+import calendar
+import logging
+from datetime import date, datetime, time, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from config import Config
+from generation_profiles import SUMMARY_PROFILE
+from llm_cache import make_cache_key
+from llm_scheduler import Priority
+from prompt_budget import PromptBudget, estimate_tokens, truncate_to_tokens
+from prompt_templates import MONTH_SUMMARY_TEMPLATE, PERIOD_REPORT_TEMPLATE, WEEK_SUMMARY_TEMPLATE, PromptTemplate
+from report_summaries import DaySummarizer
+
+logger = logging.getLogger(__name__)
+
+def month_segments(start: date, end: date) -> List[Tuple[date, date]]:
+    """Calendar months overlapping [start, end], clipped to the range"""
+    segments = []
+    current = start
+    while current <= end:
+        last_day = date(current.year, current.month, calendar.monthrange(current.year, current.month)[1])
+        segments.append((current, min(last_day, end)))
+        current = last_day + timedelta(days=1)
+    return segments
+
+def week_segments(start: date, end: date) -> List[Tuple[date, date]]:
+    """Monday-Sunday weeks overlapping [start, end], clipped to the range"""
+    segments = []
+    current = start
+    while current <= end:
+        sunday = current + timedelta(days=6 - current.weekday())
+        segments.append((current, min(sunday, end)))
+        current = sunday + timedelta(days=1)
+    return segments
+
+def _label(start: date, end: date) -> str:
+    return f"{start.isoformat()} to {end.isoformat()}"
+
+class HierarchicalReportEngine:
+    """
+    Builds report prompts for long ranges from week and month summaries
+
+    fetch_data(intern_id, start, end) must return the same shape as
+    AIFollowupService._fetch_weekly_data (work_updates, followup_sessions).
+    """
+
+    def __init__(
+        self,
+        db,
+        provider_manager,
+        day_summarizer: DaySummarizer,
+        fetch_data: Callable[[str, datetime, datetime], Awaitable[Dict[str, Any]]]
+    ):
+        self.collection = db[Config.PERIOD_SUMMARIES_COLLECTION]
+        self.provider_manager = provider_manager
+        self.day_summarizer = day_summarizer
+        self.fetch_data = fetch_data
+        self._stats = {"stored_hits": 0, "generated": 0, "failed": 0}
+        self.last_prompt_usage: Dict[str, Any] = {}
+
+    async def build_report_prompt(
+        self,
+        intern_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        priority: Priority = Priority.REPORT,
+        is_disconnected: Callable[[], Awaitable[bool]] = None,
+        on_progress: Callable[[str, float], Awaitable[None]] = None
+    ) -> Tuple[Optional[str], Dict[str, Any]]:
+        """
+        Report prompt for [start_date, end_date] plus a summary of its inputs
+
+        Months are processed one after another; the weeks of a month run
+        concurrently (LLM calls are still bounded by the scheduler). Months
+        are only rolled up when more than one has data - a single month is
+        reported from its weeks. on_progress(stage, fraction) is awaited
+        after each week.
+
+        Returns:
+            (prompt, data_summary); prompt is None when the range has no work updates
+        """
+        start, end = start_date.date(), end_date.date()
+        totals = {"work_updates": 0, "followup_sessions": 0}
+        month_weeks = []
+        all_week_summaries = []
+
+        months = [(month, week_segments(*month)) for month in month_segments(start, end)]
+        total_weeks = sum(len(weeks) for _, weeks in months)
+        weeks_done = 0
+
+        async def summarize_and_report(week_start: date, week_end: date) -> Optional[Dict[str, Any]]:
+            nonlocal weeks_done
+            week = await self.summarize_week(intern_id, week_start, week_end, totals, priority, is_disconnected)
+            weeks_done += 1
+            if on_progress:
+                await on_progress("summarizing", 0.8 * weeks_done / total_weeks)
+            return week
+
+        for (month_start, month_end), segments in months:
+            weeks = await asyncio.gather(*(
+                summarize_and_report(week_start, week_end) for week_start, week_end in segments
+            ))
+            weeks = [week for week in weeks if week is not None]
+            if not weeks:
+                continue
+            all_week_summaries.extend(weeks)
+            month_weeks.append((month_start, month_end, weeks))
+
+        data_summary = {
+            "work_updates_count": totals["work_updates"],
+            "followup_sessions_count": totals["followup_sessions"],
+            "date_range": _label(start, end),
+            "provider_used": "LMStudio_Local",
+            "mode": "hierarchical",
+            "weeks": len(all_week_summaries),
+            "months": len(month_weeks)
+        }
+
+        if not totals["work_updates"]:
+            return None, data_summary
+
+        # A single month reads better from its weeks than from one month summary
+        if len(month_weeks) == 1:
+            parts = all_week_summaries
+        else:
+            parts = []
+            for month_start, month_end, weeks in month_weeks:
+                parts.append(await self._rollup(
+                    intern_id, "month", month_start, month_end, weeks, MONTH_SUMMARY_TEMPLATE,
+                    priority, is_disconnected
+                ))
+        return self._build_period_prompt(intern_id, start, end, parts), data_summary
+
+    async def summarize_week(
+        self,
+        intern_id: str,
+        week_start: date,
+        week_end: date,
+        totals: Dict[str, int],
+        priority: Priority = Priority.REPORT,
+        is_disconnected: Callable[[], Awaitable[bool]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Week summary from that week's day summaries; None if the week has no data"""
+        weekly_data = await self.fetch_data(
+            intern_id,
+            datetime.combine(week_start, time.min),
+            datetime.combine(week_end, time.max)
+        )
+        work_updates = weekly_data["work_updates"]
+        followup_sessions = weekly_data["followup_sessions"]
+        if not work_updates and not followup_sessions:
+            return None
+
+        totals["work_updates"] += len(work_updates)
+        totals["followup_sessions"] += len(followup_sessions)
+
+        days = await self.day_summarizer.summarize_days(
+            intern_id, work_updates, followup_sessions, priority, is_disconnected
+        )
+        children = [{"label": day["date"], "summary": day["summary"]} for day in days]
+        return await self._rollup(
+            intern_id, "week", week_start, week_end, children, WEEK_SUMMARY_TEMPLATE,
+            priority, is_disconnected
+        )
+
+    async def _rollup(
+        self,
+        intern_id: str,
+        level: str,
+        start: date,
+        end: date,
+        children: List[Dict[str, Any]],
+        template: PromptTemplate,
+        priority: Priority,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]]
+    ) -> Dict[str, Any]:
+        """Summarize child summaries into one summary for [start, end], reusing a stored one"""
+        label = _label(start, end)
+        prompt = template.render({
+            "period": label,
+            "summaries": "\n\n".join(f"{child['label']}:\n{child['summary']}" for child in children)
+        })
+        key = make_cache_key(prompt, {"kind": f"{level}_summary", **self._summary_params()})
+
+        stored = await self._get_stored(key)
+        if stored:
+            self._stats["stored_hits"] += 1
+            return {"label": label, "summary": stored}
+
+        summary = await self.provider_manager.generate_content(
+            prompt,
+            priority=priority,
+            intern_id=intern_id,
+            is_disconnected=is_disconnected,
+            profile=SUMMARY_PROFILE
+        )
+
+        if not summary or not summary.strip():
+            # Keep the report going with the (trimmed) children instead
+            self._stats["failed"] += 1
+            logger.warning(f"{level.capitalize()} summary for intern {intern_id} ({label}) failed - using child summaries")
+            fallback = truncate_to_tokens(
+                "\n".join(child["summary"] for child in children),
+                Config.SUMMARY_MAX_TOKENS * 2
+            )
+            return {"label": label, "summary": fallback}
+
+        summary = summary.strip()
+        self._stats["generated"] += 1
+        try:
+            await self.collection.replace_one(
+                {"_id": key},
+                {
+                    "_id": key,
+                    "internId": intern_id,
+                    "level": level,
+                    "periodStart": start.isoformat(),
+                    "periodEnd": end.isoformat(),
+                    "summary": summary,
+                    "childCount": len(children),
+                    "createdAt": datetime.now()
+                },
+                upsert=True
+            )
+        except Exception as e:
+            logger.warning(f"Failed to store {level} summary for intern {intern_id} ({label}): {e}")
+
+        return {"label": label, "summary": summary}
+
+    def _summary_params(self) -> Dict[str, Any]:
+        profile = self.provider_manager.profiles[SUMMARY_PROFILE]
+        return {"model": profile.model, "temperature": profile.temperature, "max_tokens": profile.max_tokens}
+
+    async def _get_stored(self, key: str) -> Optional[str]:
+        try:
+            doc = await self.collection.find_one({"_id": key}, {"summary": 1})
+        except Exception as e:
+            logger.warning(f"Period summary lookup failed: {e}")
+            return None
+        return doc["summary"] if doc else None
+
+    def _build_period_prompt(
+        self,
+        intern_id: str,
+        start: date,
+        end: date,
+        parts: List[Dict[str, Any]]
+    ) -> str:
+        period = f"Intern ID: {intern_id}\nPeriod: {_label(start, end)}"
+
+        budget = PromptBudget(
+            "period_report",
+            Config.PROMPT_BUDGET_WEEKLY_REPORT,
+            template_tokens=estimate_tokens(PERIOD_REPORT_TEMPLATE.render({"period": period}))
+        )
+        budget.add_section(
+            "summaries",
+            [f"{part['label']}:\n{part['summary']}" for part in parts],
+            priority=0, separator="\n\n", drop_from="start",
+            omitted_note="({count} earlier periods omitted)"
+        )
+        sections = budget.allocate()
+        self.last_prompt_usage = budget.report()
+
+        return PERIOD_REPORT_TEMPLATE.render({"period": period, "summaries": sections["summaries"]})
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return dict(self._stats)
@@ -0,0 +1,358 @@
+"""
+Report Jobs - Durable background queue for report generation
+Jobs live in MongoDB so queued work survives a restart; a bounded pool of
+workers claims them atomically, heartbeats while running and hands back
+claims that were abandoned by a crashed or stopped process
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+from pymongo import ReturnDocument
+
+from config import Config
+from llm_scheduler import Priority
+
+logger = logging.getLogger(__name__)
+
+# generate_weekly_report's answer for an empty range - retrying won't change it
+NO_DATA_MESSAGE = "No work updates found"
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class ReportJobQueue:
+    """
+    MongoDB-backed report job queue with an in-process worker pool
+
+    Claiming is a single find_one_and_update, so several workers (or several
+    service instances) never run the same job twice.
+    """
+
+    def __init__(self, db, ai_service, workers: int = None):
+        self.collection = db[Config.REPORT_JOBS_COLLECTION]
+        self.ai_service = ai_service
+        self.workers = workers or Config.REPORT_JOB_WORKERS
+        self.poll_interval = Config.REPORT_JOB_POLL_INTERVAL
+        self.instance_id = uuid.uuid4().hex[:12]
+
+        self._tasks: List[asyncio.Task] = []
+        self._running: Dict[str, str] = {}  # job_id -> worker name
+        self._wakeup = asyncio.Event()
+        self._last_recovery = 0.0
+        self._stats = {"enqueued": 0, "completed": 0, "failed": 0, "retried": 0, "recovered": 0}
+
+    async def enqueue(self, intern_id: str, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+        """Store a queued job and wake an idle worker"""
+        now = datetime.now()
+        job = {
+            "_id": str(uuid.uuid4()),
+            "internId": intern_id,
+            "startDate": start_date.strftime('%Y-%m-%d'),
+            "endDate": end_date.strftime('%Y-%m-%d'),
+            "status": JobStatus.QUEUED.value,
+            "progress": {"stage": "queued", "percent": 0},
+            "attempts": 0,
+            "createdAt": now,
+            "updatedAt": now
+        }
+        await self.collection.insert_one(job)
+        self._stats["enqueued"] += 1
+        self._wakeup.set()
+
+        logger.info(f"Report job {job['_id']} queued for intern {intern_id} ({job['startDate']} to {job['endDate']})")
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self.collection.find_one({"_id": job_id})
+
+    async def start(self) -> None:
+        """Requeue abandoned claims and start the worker pool"""
+        await self.recover_stale()
+        self._tasks = [
+            asyncio.create_task(self._worker(f"{self.instance_id}-{i}"))
+            for i in range(self.workers)
+        ]
+        logger.info(f"Report job queue started with {self.workers} worker(s)")
+
+    async def stop(self) -> None:
+        """Stop the workers; jobs they were running go back to the queue"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker(self, worker_name: str) -> None:
+        while True:
+            try:
+                job = await self._claim(worker_name)
+                if job is None:
+                    # Clear only when idle: the event is shared, and clearing before
+                    # the claim could swallow a wakeup meant for another worker.
+                    # Re-check once in case a job was enqueued during the claim.
+                    self._wakeup.clear()
+                    job = await self._claim(worker_name)
+                if job is None:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                    except asyncio.TimeoutError:
+                        await self._maybe_recover()
+                    continue
+
+                await self._run(job, worker_name)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Report job worker {worker_name} error: {e}")
+                await asyncio.sleep(self.poll_interval)
+
+    async def _claim(self, worker_name: str) -> Optional[Dict[str, Any]]:
+        """Atomically take the oldest queued job"""
+        now = datetime.now()
+        return await self.collection.find_one_and_update(
+            {
+                "status": JobStatus.QUEUED.value,
+                # Requeued failures wait out their retry delay
+                "$or": [{"retryAt": None}, {"retryAt": {"$lte": now}}]
+            },
+            {
+                "$set": {
+                    "status": JobStatus.RUNNING.value,
+                    "workerId": worker_name,
+                    "startedAt": now,
+                    "heartbeatAt": now,
+                    "updatedAt": now,
+                    "progress": {"stage": "starting", "percent": 0}
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("createdAt", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def _run(self, job: Dict[str, Any], worker_name: str) -> None:
+        job_id = job["_id"]
+        self._running[job_id] = worker_name
+        heartbeat = asyncio.create_task(self._heartbeat(job_id, worker_name))
+
+        async def on_progress(stage: str, fraction: float) -> None:
+            try:
+                await self.collection.update_one(
+                    {"_id": job_id, "workerId": worker_name},
+                    {"$set": {
+                        "progress": {"stage": stage, "percent": round(fraction * 100)},
+                        "updatedAt": datetime.now()
+                    }}
+                )
+            except Exception as e:
+                logger.warning(f"Report job {job_id} progress update failed: {e}")
+
+        try:
+            logger.info(f"Report job {job_id} started on {worker_name} (attempt {job['attempts']})")
+            result = await self.ai_service.generate_weekly_report(
+                job["internId"],
+                datetime.strptime(job["startDate"], '%Y-%m-%d'),
+                datetime.strptime(job["endDate"], '%Y-%m-%d'),
+                priority=Priority.REPORT,
+                on_progress=on_progress
+            )
+        except asyncio.CancelledError:
+            # Shutting down - let the next start pick the job up again
+            await self._release(job_id, worker_name, JobStatus.QUEUED, error="Interrupted by shutdown")
+            raise
+        except Exception as e:
+            await self._retry_or_fail(job, worker_name, str(e))
+            return
+        finally:
+            heartbeat.cancel()
+            self._running.pop(job_id, None)
+
+        if result.get("success"):
+            self._stats["completed"] += 1
+            await self._finish(job_id, worker_name, JobStatus.COMPLETED, result={
+                "report": result["report"],
+                "data_summary": result.get("data_summary", {})
+            })
+            logger.info(f"Report job {job_id} completed")
+        else:
+            # LM Studio errors, an open breaker or a scheduler deadline come back as success=False
+            message = result.get("message", "Failed")
+            await self._retry_or_fail(job, worker_name, message, retryable=not message.startswith(NO_DATA_MESSAGE))
+
+    async def _retry_or_fail(self, job: Dict[str, Any], worker_name: str, error: str, retryable: bool = True) -> None:
+        """Requeue the job after a growing delay while attempts remain, else mark it failed"""
+        job_id = job["_id"]
+        if retryable and job["attempts"] < Config.REPORT_JOB_MAX_ATTEMPTS:
+            self._stats["retried"] += 1
+            delay = Config.REPORT_JOB_RETRY_DELAY * job["attempts"]
+            logger.warning(f"Report job {job_id} failed (attempt {job['attempts']}), retrying in {delay:.0f}s: {error}")
+            await self._release(
+                job_id, worker_name, JobStatus.QUEUED, error=error,
+                retry_at=datetime.now() + timedelta(seconds=delay)
+            )
+        else:
+            self._stats["failed"] += 1
+            logger.error(f"Report job {job_id} failed after {job['attempts']} attempt(s): {error}")
+            await self._finish(job_id, worker_name, JobStatus.FAILED, error=error)
+
+    async def _heartbeat(self, job_id: str, worker_name: str) -> None:
+        """Keep the claim fresh so recovery doesn't hand the job to someone else"""
+        while True:
+            await asyncio.sleep(Config.REPORT_JOB_HEARTBEAT_SECONDS)
+            try:
+                await self.collection.update_one(
+                    {"_id": job_id, "workerId": worker_name},
+                    {"$set": {"heartbeatAt": datetime.now()}}
+                )
+            except Exception as e:
+                logger.warning(f"Report job {job_id} heartbeat failed: {e}")
+
+    async def _finish(
+        self,
+        job_id: str,
+        worker_name: str,
+        status: JobStatus,
+        result: Dict[str, Any] = None,
+        error: str = None
+    ) -> None:
+        now = datetime.now()
+        await self.collection.update_one(
+            {"_id": job_id, "workerId": worker_name},
+            {"$set": {
+                "status": status.value,
+                "progress": {"stage": status.value, "percent": 100},
+                "result": result,
+                "error": error,
+                "finishedAt": now,
+                "updatedAt": now
+            }}
+        )
+
+    async def _release(
+        self,
+        job_id: str,
+        worker_name: str,
+        status: JobStatus,
+        error: str = None,
+        retry_at: datetime = None
+    ) -> None:
+        try:
+            await self.collection.update_one(
+                {"_id": job_id, "workerId": worker_name},
+                {
+                    "$set": {
+                        "status": status.value,
+                        "progress": {"stage": "queued", "percent": 0},
+                        "error": error,
+                        "retryAt": retry_at,
+                        "updatedAt": datetime.now()
+                    },
+                    "$unset": {"workerId": "", "heartbeatAt": ""}
+                }
+            )
+        except Exception as e:
+            logger.warning(f"Failed to release report job {job_id}: {e}")
+
+    async def recover_stale(self) -> int:
+        """Requeue (or fail, once out of attempts) running jobs whose heartbeat stopped"""
+        now = datetime.now()
+        stale = {
+            "status": JobStatus.RUNNING.value,
+            "heartbeatAt": {"$lt": now - timedelta(seconds=Config.REPORT_JOB_STALE_SECONDS)}
+        }
+        try:
+            requeued = await self.collection.update_many(
+                {**stale, "attempts": {"$lt": Config.REPORT_JOB_MAX_ATTEMPTS}},
+                {
+                    "$set": {
+                        "status": JobStatus.QUEUED.value,
+                        "progress": {"stage": "queued", "percent": 0},
+                        "updatedAt": now
+                    },
+                    "$unset": {"workerId": "", "heartbeatAt": ""}
+                }
+            )
+            failed = await self.collection.update_many(
+                stale,
+                {"$set": {
+                    "status": JobStatus.FAILED.value,
+                    "error": "Worker stopped responding too many times",
+                    "finishedAt": now,
+                    "updatedAt": now
+                }}
+            )
+        except Exception as e:
+            logger.warning(f"Report job recovery failed: {e}")
+            return 0
+
+        recovered = requeued.modified_count + failed.modified_count
+        if recovered:
+            self._stats["recovered"] += recovered
+            logger.warning(
+                f"Recovered {requeued.modified_count} abandoned report job(s), "
+                f"failed {failed.modified_count} out of attempts"
+            )
+            self._wakeup.set()
+        return recovered
+
+    async def _maybe_recover(self) -> None:
+        now = asyncio.get_running_loop().time()
+        if now - self._last_recovery >= Config.REPORT_JOB_STALE_SECONDS / 2:
+            self._last_recovery = now
+            await self.recover_stale()
+
+    async def get_metrics(self) -> Dict[str, Any]:
+        """Queue depth and worker activity"""
+        try:
+            queued = await self.collection.count_documents({"status": JobStatus.QUEUED.value})
+        except Exception:
+            queued = None
+        return {
+            "workers": self.workers,
+            "running": len(self._running),
+            "queued": queued,
+            **self._stats
+        }
+
+def format_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """API view of a job document"""
+    def iso(value: Optional[datetime]) -> Optional[str]:
+        return value.isoformat() if value else None
+
+    return {
+        "job_id": job["_id"],
+        "user_id": job["internId"],
+        "status": job["status"],
+        "progress": job.get("progress", {}),
+        "date_range": {"start": job["startDate"], "end": job["endDate"]},
+        "attempts": job.get("attempts", 0),
+        "created_at": iso(job.get("createdAt")),
+        "started_at": iso(job.get("startedAt")),
+        "finished_at": iso(job.get("finishedAt")),
+        "result": job.get("result"),
+        "error": job.get("error")
+    }
+
+# Global report job queue instance
+report_jobs: Optional[ReportJobQueue] = None
+
+def initialize_report_jobs(ai_service) -> ReportJobQueue:
+    """Initialize the global report job queue (call start() to run workers)"""
+    global report_jobs
+
+    report_jobs = ReportJobQueue(ai_service.db, ai_service)
+    return report_jobs
+
+def get_report_jobs() -> ReportJobQueue:
+    """Get the global report job queue"""
+    if report_jobs is None:
+        raise RuntimeError("Report job queue not initialized. Call initialize_report_jobs() first")
+
+    return report_jobs
@@ -0,0 +1,196 @@
+"""
+Report Summaries - Map stage of map-reduce weekly reports
+Summarizes each day's work update and follow-up Q&A concurrently (bounded by
+the LLM scheduler) and stores the summaries keyed by content hash, so
+overlapping date ranges and longer reports reuse work already done
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from config import Config
+from generation_profiles import SUMMARY_PROFILE
+from llm_cache import make_cache_key
+from llm_scheduler import Priority
+from prompt_templates import DAY_SUMMARY_TEMPLATE
+
+logger = logging.getLogger(__name__)
+
+def format_work_update(update: Dict[str, Any], label: str, task: str = None) -> str:
+    """One daily record as used in report prompts"""
+    date = update.get("date") or update.get("update_date", "Unknown")
+    task = task or update.get("task") or update.get("description", "No description")
+    progress = update.get("progress", "")
+    blockers = update.get("blockers", "")
+    status = update.get("status", "unknown")
+
+    return f"""
+{label} ({date}):
+- Status: {status}
+- Tasks: {task}
+- Progress: {progress if progress else 'Not specified'}
+- Challenges: {blockers if blockers else 'None mentioned'}
+"""
+
+def format_followup_session(session: Dict[str, Any], label: str) -> str:
+    """One follow-up session's Q&A as used in report prompts"""
+    questions = session.get("questions", [])
+    answers = session.get("answers", [])
+    status = session.get("status", "unknown")
+    created_date = session.get("createdAt", datetime.now()).strftime('%Y-%m-%d')
+
+    qa_pairs = []
+    for q, a in zip(questions, answers):
+        qa_pairs.append(f"Q: {q}\nA: {a if a else 'Not answered'}")
+
+    return f"""
+{label} ({created_date}) - Status: {status}
+{chr(10).join(qa_pairs)}
+"""
+
+def group_by_day(
+    work_updates: List[Dict[str, Any]],
+    followup_sessions: List[Dict[str, Any]]
+) -> "OrderedDict[str, Dict[str, List[Dict[str, Any]]]]":
+    """Work updates and follow-up sessions grouped by YYYY-MM-DD, in date order"""
+    days: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+
+    for update in work_updates:
+        date = str(update.get("date") or update.get("update_date", "Unknown"))[:10]
+        days.setdefault(date, {"work_updates": [], "followup_sessions": []})["work_updates"].append(update)
+
+    for session in followup_sessions:
+        created_at = session.get("createdAt")
+        date = created_at.strftime('%Y-%m-%d') if isinstance(created_at, datetime) else "Unknown"
+        days.setdefault(date, {"work_updates": [], "followup_sessions": []})["followup_sessions"].append(session)
+
+    return OrderedDict(sorted(days.items()))
+
+class DaySummarizer:
+    """
+    Produces one short summary per day of an intern's data
+
+    Summaries are stored in MongoDB under a hash of the day prompt and the
+    summary profile's settings; an unchanged day is never summarized twice.
+    """
+
+    def __init__(self, db, provider_manager):
+        self.collection = db[Config.DAY_SUMMARIES_COLLECTION]
+        self.provider_manager = provider_manager
+        self._stats = {"stored_hits": 0, "generated": 0, "failed": 0}
+
+    def build_day_prompt(self, date: str, day: Dict[str, List[Dict[str, Any]]]) -> str:
+        """Day summary prompt; depends only on the day's own data"""
+        return DAY_SUMMARY_TEMPLATE.render({
+            "day": date,
+            "work_updates": "".join(
+                format_work_update(update, "Update") for update in day["work_updates"]
+            ).strip() or "No work update submitted",
+            "followup_sessions": "".join(
+                format_followup_session(session, "Follow-up Session") for session in day["followup_sessions"]
+            ).strip() or "No follow-up session"
+        })
+
+    def _summary_key(self, prompt: str) -> str:
+        profile = self.provider_manager.profiles[SUMMARY_PROFILE]
+        return make_cache_key(prompt, {
+            "kind": "day_summary",
+            "model": profile.model,
+            "temperature": profile.temperature,
+            "max_tokens": profile.max_tokens
+        })
+
+    async def get_stored(self, key: str) -> Optional[str]:
+        try:
+            doc = await self.collection.find_one({"_id": key}, {"summary": 1})
+        except Exception as e:
+            logger.warning(f"Day summary lookup failed: {e}")
+            return None
+        return doc["summary"] if doc else None
+
+    async def summarize_day(
+        self,
+        intern_id: str,
+        date: str,
+        day: Dict[str, List[Dict[str, Any]]],
+        priority: Priority = Priority.REPORT,
+        is_disconnected: Callable[[], Awaitable[bool]] = None
+    ) -> Dict[str, Any]:
+        """
+        Summary of one day
+
+        Returns:
+            {"date", "summary", "source"} where source is "stored", "generated"
+            or "raw" (generation failed; summary is the day's formatted data)
+        """
+        prompt = self.build_day_prompt(date, day)
+        key = self._summary_key(prompt)
+
+        stored = await self.get_stored(key)
+        if stored:
+            self._stats["stored_hits"] += 1
+            return {"date": date, "summary": stored, "source": "stored"}
+
+        summary = await self.provider_manager.generate_content(
+            prompt,
+            priority=priority,
+            intern_id=intern_id,
+            is_disconnected=is_disconnected,
+            profile=SUMMARY_PROFILE
+        )
+
+        if not summary or not summary.strip():
+            self._stats["failed"] += 1
+            logger.warning(f"Day summary for intern {intern_id} on {date} failed - using raw data")
+            raw = prompt[len(DAY_SUMMARY_TEMPLATE.prefix):]
+            return {"date": date, "summary": raw, "source": "raw"}
+
+        summary = summary.strip()
+        self._stats["generated"] += 1
+        try:
+            await self.collection.replace_one(
+                {"_id": key},
+                {
+                    "_id": key,
+                    "internId": intern_id,
+                    "date": date,
+                    "summary": summary,
+                    "workUpdatesCount": len(day["work_updates"]),
+                    "followupSessionsCount": len(day["followup_sessions"]),
+                    "createdAt": datetime.now()
+                },
+                upsert=True
+            )
+        except Exception as e:
+            logger.warning(f"Failed to store day summary for intern {intern_id} on {date}: {e}")
+
+        return {"date": date, "summary": summary, "source": "generated"}
+
+    async def summarize_days(
+        self,
+        intern_id: str,
+        work_updates: List[Dict[str, Any]],
+        followup_sessions: List[Dict[str, Any]],
+        priority: Priority = Priority.REPORT,
+        is_disconnected: Callable[[], Awaitable[bool]] = None
+    ) -> List[Dict[str, Any]]:
+        """Summarize every day concurrently; the scheduler bounds how many run at once"""
+        days = group_by_day(work_updates, followup_sessions)
+
+        summaries = await asyncio.gather(*(
+            self.summarize_day(intern_id, date, day, priority, is_disconnected)
+            for date, day in days.items()
+        ))
+
+        sources = [s["source"] for s in summaries]
+        logger.info(
+            f"Day summaries for intern {intern_id}: {sources.count('stored')} stored, "
+            f"{sources.count('generated')} generated, {sources.count('raw')} raw"
+        )
+        return list(summaries)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return dict(self._stats)
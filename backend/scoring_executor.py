@@ -0,0 +1,140 @@
+"""
+Scoring Executor - Runs CPU-bound text scoring off the event loop
+Tokenizing, stemming and VADER on a long update can take long enough to stall
+every other request, so TextScorer.score runs in a thread pool or in a process
+pool whose workers each keep their own warm NLTK components
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import Config
+from nlp_resources import NLPResources
+from text_scoring import TextScorer
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_MODES = ("thread", "process", "inline")
+
+# Per-process scorer, built by the pool initializer in process mode
+_worker_scorer: Optional[TextScorer] = None
+
+def _init_worker(data_dir: str) -> None:
+    """Process pool initializer: load NLTK once per worker, not per update"""
+    global _worker_scorer
+
+    nlp = NLPResources(data_dir, auto_download=False)
+    nlp.warm_up()
+    _worker_scorer = TextScorer(nlp)
+
+def _call_in_worker(method: str, arg: Any) -> Tuple[float, Any]:
+    return time.time(), getattr(_worker_scorer, method)(arg)
+
+def _call_in_thread(text_scorer: TextScorer, method: str, arg: Any) -> Tuple[float, Any]:
+    return time.time(), getattr(text_scorer, method)(arg)
+
+class ScoringExecutor:
+    """
+    Submits TextScorer.score calls to a bounded pool and tracks queue depth
+
+    "thread" shares the app's NLP resources (NLTK releases little of the GIL,
+    but the loop stays responsive); "process" gives true parallelism at the
+    cost of pickling each text; "inline" scores on the loop as before.
+    """
+
+    def __init__(self, text_scorer: TextScorer, mode: str = None, workers: int = None):
+        self.text_scorer = text_scorer
+        self.mode = (mode or Config.QUALITY_SCORING_EXECUTOR).lower()
+        self.workers = workers or Config.QUALITY_SCORING_WORKERS
+
+        if self.mode not in EXECUTOR_MODES:
+            logger.warning(f"Unknown scoring executor mode '{self.mode}' - using thread")
+            self.mode = "thread"
+
+        self._executor: Optional[Executor] = None
+        if self.mode == "thread":
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="quality-scoring")
+        elif self.mode == "process":
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(text_scorer.nlp.data_dir,)
+            )
+
+        self._in_flight = 0
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0, "max_queue_depth": 0}
+        self._total_wait = 0.0
+        self._total_run = 0.0
+
+        logger.info(f"Quality scoring executor: {self.mode} ({self.workers} worker(s))")
+
+    async def score(self, content: str) -> Dict[str, Any]:
+        """Text-only score components for content, computed in the pool"""
+        return await self._call("score", content)
+
+    async def polarities(self, texts: List[str], chunk_size: int = None) -> List[float]:
+        """Sentiment polarity of many texts, in chunks spread over the pool"""
+        chunk_size = chunk_size or Config.QUALITY_BATCH_SENTIMENT_CHUNK
+        chunks = await asyncio.gather(*(
+            self._call("polarities", texts[i:i + chunk_size])
+            for i in range(0, len(texts), chunk_size)
+        ))
+        return [polarity for chunk in chunks for polarity in chunk]
+
+    async def _call(self, method: str, arg: Any) -> Any:
+        if self._executor is None:
+            return getattr(self.text_scorer, method)(arg)
+
+        loop = asyncio.get_running_loop()
+        self._in_flight += 1
+        self._stats["submitted"] += 1
+        self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], self.queue_depth)
+        # Wall-clock time so the worker's start stamp is comparable across processes
+        submitted = time.time()
+
+        try:
+            if self.mode == "process":
+                started, result = await loop.run_in_executor(self._executor, _call_in_worker, method, arg)
+            else:
+                started, result = await loop.run_in_executor(
+                    self._executor, _call_in_thread, self.text_scorer, method, arg
+                )
+            self._stats["completed"] += 1
+            self._total_wait += max(0.0, started - submitted)
+            self._total_run += time.time() - started
+            return result
+        except Exception:
+            self._stats["failed"] += 1
+            raise
+        finally:
+            self._in_flight -= 1
+
+    @property
+    def queue_depth(self) -> int:
+        """Submitted tasks waiting for a free worker"""
+        return max(0, self._in_flight - self.workers)
+
+    def warm_up(self) -> None:
+        """Start process workers now (they load NLTK in their initializer)"""
+        if self.mode == "process":
+            for _ in range(self.workers):
+                self._executor.submit(time.sleep, 0)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        completed = self._stats["completed"] or 1
+        return {
+            "mode": self.mode,
+            "workers": self.workers,
+            "in_flight": self._in_flight,
+            "queue_depth": self.queue_depth,
+            **self._stats,
+            "avg_wait_ms": round(self._total_wait / completed * 1000, 2),
+            "avg_run_ms": round(self._total_run / completed * 1000, 2)
+        }
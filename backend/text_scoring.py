@@ -0,0 +1,229 @@
+"""
+Text Scoring - CPU-bound quality score components
+Word count, keyword, sentiment and structure scoring depend only on the text,
+so they can run off the event loop (see scoring_executor); the repetition
+check, which needs MongoDB, stays in QualityScorer
+"""
+
+import logging
+import re
+from typing import Any, Dict, List, Tuple
+
+# TextBlob as alternative for sentiment
+try:
+    from textblob import TextBlob
+    TEXTBLOB_AVAILABLE = True
+except ImportError:
+    TEXTBLOB_AVAILABLE = False
+
+from config import Config
+from nlp_resources import NLPResources
+
+logger = logging.getLogger(__name__)
+
+# Section words that make an update read as structured ("What I did", "Next", ...)
+STRUCTURE_KEYWORDS = [
+    "what i did", "what i worked on", "completed", "tasks",
+    "next", "tomorrow", "plans", "planning",
+    "blockers", "challenges", "issues", "problems",
+    "progress", "status", "update"
+]
+
+# Zero-width alternation: one scan finds every keyword, overlapping ones included
+STRUCTURE_PATTERN = re.compile("(?=(" + "|".join(re.escape(k) for k in STRUCTURE_KEYWORDS) + "))")
+_BULLET_PATTERN = re.compile(r'[•\-\*\d+\.]')
+
+_STEM_CACHE_MAX = 50000
+
+class TextFeatures:
+    """
+    One description normalized and tokenized once; every scoring component
+    reads from this instead of re-processing the raw text
+    """
+    
+    __slots__ = ("text", "lower", "word_count", "tokens", "structure_words", "has_bullets", "line_breaks")
+    
+    def __init__(self, text: str, tokens: List[str]):
+        self.text = text
+        self.lower = text.lower()
+        self.word_count = len(text.split())
+        self.tokens = tokens  # Lowercased alphanumeric tokens
+        self.structure_words = {match.group(1) for match in STRUCTURE_PATTERN.finditer(self.lower)}
+        self.has_bullets = _BULLET_PATTERN.search(text) is not None
+        self.line_breaks = text.count('\n')
+
+class TextScorer:
+    """
+    Text-only part of the quality score
+
+    Holds no database handle, so it can be rebuilt inside a worker process.
+    """
+    
+    def __init__(self, nlp: NLPResources):
+        self.config = Config()
+        self.nlp = nlp
+        self._keyword_stems = None
+        self._stem_cache: Dict[str, str] = {}
+        
+        keywords = sorted({keyword.lower() for keyword in self.config.QUALITY_KEYWORDS}, key=len, reverse=True)
+        self.keyword_pattern = re.compile("|".join(re.escape(keyword) for keyword in keywords))
+    
+    @property
+    def keyword_stems(self) -> set:
+        """Stemmed quality keywords; empty when NLTK is not available"""
+        if self._keyword_stems is None:
+            stemmer = self.nlp.get_stemmer()
+            if stemmer:
+                self._keyword_stems = {
+                    stemmer.stem(keyword.lower()) 
+                    for keyword in self.config.QUALITY_KEYWORDS
+                }
+                logger.info(f"NLTK enabled - stemmed to {len(self._keyword_stems)} keyword stems")
+            else:
+                self._keyword_stems = set()
+                logger.warning("NLTK not available - using basic keyword matching")
+        return self._keyword_stems
+    
+    def extract_features(self, content: str) -> TextFeatures:
+        """Normalize and tokenize once (tokens only when stemmed keyword matching is on)"""
+        tokens = []
+        if self.keyword_stems:
+            tokens = [token for token in self.nlp.tokenize(content.lower()) if token.isalnum()]
+        return TextFeatures(content, tokens)
+    
+    def score(self, content: str) -> Dict[str, Any]:
+        """All text-only components for one (non-empty, stripped) description"""
+        features = self.extract_features(content)
+        
+        word_count_score, word_count = self._calculate_word_count_score(features)
+        keyword_score, keyword_found = self._calculate_keyword_score(features)
+        sentiment_score, sentiment_polarity, sentiment_label = self._calculate_sentiment_score(features)
+        structure_score, has_structure = self._check_structure(features)
+        
+        return {
+            "word_count": word_count,
+            "word_count_score": word_count_score,
+            "keyword_found": keyword_found,
+            "keyword_score": keyword_score,
+            "sentiment_polarity": sentiment_polarity,
+            "sentiment_label": sentiment_label,
+            "sentiment_score": sentiment_score,
+            "has_structure": has_structure,
+            "structure_score": structure_score
+        }
+    
+    def _calculate_word_count_score(self, features: TextFeatures) -> Tuple[int, int]:
+        """
+        Calculate word count score (0-4 points)
+        """
+        word_count = features.word_count
+        
+        if word_count >= self.config.WORD_COUNT_OK_THRESHOLD:   
+            return 4, word_count
+        elif word_count >= self.config.WORD_COUNT_WEAK_THRESHOLD:   
+            return 2, word_count
+        else:  
+            return 0, word_count
+    
+    def stem(self, token: str) -> str:
+        """Porter stem, memoized - update vocabularies repeat heavily"""
+        stem = self._stem_cache.get(token)
+        if stem is None:
+            if len(self._stem_cache) >= _STEM_CACHE_MAX:
+                self._stem_cache.clear()
+            stem = self._stem_cache[token] = self.nlp.get_stemmer().stem(token)
+        return stem
+    
+    def _calculate_keyword_score(self, features: TextFeatures) -> Tuple[int, bool]:
+        """
+        Calculate keyword presence score using stemming (0-2 points)
+        """
+        if not self.keyword_stems:
+            # Fallback to basic keyword matching
+            if self.keyword_pattern.search(features.lower):
+                return 2, True
+            return 0, False
+        
+        try:
+            # Check the content stems for intersection with keyword stems
+            if any(self.stem(token) in self.keyword_stems for token in features.tokens):
+                return 2, True
+            else:
+                return 0, False
+                
+        except Exception as e:
+            logger.warning(f"Keyword scoring failed, using fallback: {e}")
+            
+            if self.keyword_pattern.search(features.lower):
+                return 2, True
+            return 0, False
+    
+    def _calculate_sentiment_score(self, features: TextFeatures) -> Tuple[int, float, str]:
+        """
+        Calculate sentiment score (0-2 points)
+        Returns: (score, polarity, label)
+        """
+        return self.sentiment_result(self.polarity(features.text))
+    
+    @property
+    def has_sentiment(self) -> bool:
+        """Whether polarity() can return anything but 0.0"""
+        return self.nlp.get_sentiment_analyzer() is not None or TEXTBLOB_AVAILABLE
+    
+    def polarity(self, text: str) -> float:
+        """
+        Sentiment polarity in [-1, 1]; 0.0 when no analyzer is available
+        
+        VADER and TextBlob take the original text: capitalisation and
+        punctuation carry sentiment.
+        """
+        polarity = 0.0
+        sentiment_analyzer = self.nlp.get_sentiment_analyzer()
+        
+        if sentiment_analyzer:
+            try:
+                # Use VADER sentiment analyzer
+                scores = sentiment_analyzer.polarity_scores(text)
+                polarity = scores['compound']  
+            except Exception as e:
+                logger.warning(f"VADER sentiment analysis failed: {e}")
+        
+        elif TEXTBLOB_AVAILABLE:
+            try:
+                # Use TextBlob as fallback
+                blob = TextBlob(text)
+                polarity = blob.sentiment.polarity  # Range -1 to 1
+            except Exception as e:
+                logger.warning(f"TextBlob sentiment analysis failed: {e}")
+        
+        return polarity
+    
+    def polarities(self, texts: List[str]) -> List[float]:
+        return [self.polarity(text) for text in texts]
+    
+    def sentiment_result(self, polarity: float) -> Tuple[int, float, str]:
+        """Sentiment score and label for a polarity in [-1, 1]"""
+        # Determine sentiment label and score
+        if polarity < self.config.NEGATIVE_SENTIMENT_THRESHOLD:  # < -0.3
+            label = "very_negative"
+            score = 0
+        elif polarity < self.config.POSITIVE_SENTIMENT_THRESHOLD:  # -0.3 to 0.2
+            label = "neutral"
+            score = 1
+        else:  # > 0.2
+            label = "positive"
+            score = 2
+        
+        return score, polarity, label
+    
+    def _check_structure(self, features: TextFeatures) -> Tuple[int, bool]:
+        """
+        Check for structured content (0-1 points)
+        Looks for sections like "What I did", "Next", "Blockers", etc.,
+        bullet points, numbers, or section separators
+        """
+        # Score based on structure indicators
+        if len(features.structure_words) >= 2 or features.has_bullets or features.line_breaks >= 2:
+            return 1, True
+        else:
+            return 0, False